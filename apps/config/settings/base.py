@@ -58,6 +58,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.profiling.ProfilingMiddleware",
+    "core.metrics.PrometheusMetricsMiddleware",
+    "core.timing.RequestTimingMiddleware",
+    "core.nplusone.NPlusOneMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -99,6 +103,85 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    # 매장 버전 (stores.versions), 매장마다 1개를 timeout 없이 유지합니다
+    # MAX_ENTRIES를 넘으면 set마다 1/3을 지우고(cull), 버전이 지워진 매장의 캐시는 모두 무효화됩니다
+    # 그러므로 매장 수보다 크게 둡니다
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 1000000},
+    },
+    # 매장별 목록 응답 캐시
+    # worker마다 MAX_ENTRIES * RESPONSE_CACHE_MAX_BYTES(500 * 64KB = 32MB)를 넘지 않습니다
+    "responses": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "responses",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 500},
+    },
+}
+
+# 목록 응답 캐시의 CACHES alias와 캐시할 응답의 최대 크기(bytes)
+# 최대 페이지(상품 100개)의 응답은 설명이 짧으면 약 25KB 입니다
+RESPONSE_CACHE_ALIAS = "responses"
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024
+
+# worker마다 메모리에 유지할 매장 자동완성 색인 수
+AUTOCOMPLETE_CACHE_SIZE = 64
+
+# worker마다 바코드 캐시를 유지할 매장 수와 매장별 바코드 수
+BARCODE_CACHE_STORE_SIZE = 64
+BARCODE_CACHE_SIZE = 10000
+
+# worker마다 메모리에 유지할 매장 owner 수와 유지 시간(초)
+STORE_OWNER_CACHE_SIZE = 10000
+STORE_OWNER_CACHE_TTL = 60
+
+# 매장 owner의 2차 캐시로 사용할 CACHES alias (None이면 사용하지 않음)
+STORE_OWNER_SHARED_CACHE = None
+
+# 상품 import시 한번에 검증, 생성할 row 수
+PRODUCT_IMPORT_BATCH_SIZE = 1000
+
+# 상품 export시 한번에 조회할 row 수
+PRODUCT_EXPORT_CHUNK_SIZE = 2000
+
+# 동기화 watermark를 조회 시작 시간보다 이전으로 두어, 늦게 commit된 row도 다음 동기화에 포함되도록 합니다
+SYNC_WATERMARK_LAG_SECONDS = 10
+
+# 삭제 기록(tombstone) 보관 기간, 이보다 오래된 since는 전체 동기화가 필요합니다
+SYNC_DELETION_LOG_RETENTION_DAYS = 30
+
+
+# 요청 계측(core.timing)을 할 요청의 비율 (0이면 계측하지 않음, 1이면 모든 요청)
+# 계측한 요청은 core.timing logger에 INFO로 기록합니다
+REQUEST_TIMING_SAMPLE_RATE = 1.0
+
+# 계측한 요청에 Server-Timing header를 추가할지
+REQUEST_TIMING_HEADER = True
+
+
+# 요청 profiling(core.profiling), 둘 다 설정하지 않으면 사용하지 않습니다
+# cProfile로 profiling할 요청의 비율 (0 ~ 1)
+PROFILING_SAMPLE_RATE = 0
+
+# 이 시간(초)보다 오래 걸린 요청의 sampling한 stack을 저장합니다 (None이면 sampling하지 않음)
+PROFILING_SLOW_SECONDS = None
+
+# stack sampling 간격(초)과 profile 파일을 저장할 디렉토리
+PROFILING_STACK_INTERVAL = 0.005
+PROFILING_DIR = BASE_DIR / ".profiles"
+
+
+# N+1 쿼리 감지(core.nplusone), 요청에서 구조가 같은 쿼리가 NPLUSONE_THRESHOLD번 이상 실행되면
+# None: 사용하지 않음, "log": WARNING 로그, "raise": NPlusOneError (테스트)
+NPLUSONE_ACTION = "log"
+NPLUSONE_THRESHOLD = 3
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -149,9 +232,24 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# 발급 후 이 시간(초)이 지난 token은 유저의 is_active를 다시 확인합니다 (None이면 확인하지 않음)
+JWT_USER_ACTIVE_TTL = 60
+
+# worker마다 메모리에 유지할 유저 is_active 수
+JWT_USER_CACHE_SIZE = 10000
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.StatelessJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
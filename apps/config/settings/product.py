@@ -7,3 +7,37 @@ ALLOWED_HOSTS = PRODUCT_SECRET["ALLOWED_HOSTS"]
 WSGI_APPLICATION = "config.wsgi.product.application"
 
 DATABASES = {"default": PRODUCT_SECRET["DATABASES"]}
+
+# gunicorn worker들이 매장 버전을 공유하도록 파일 캐시를 사용합니다
+# 매장 버전은 cull되지 않도록 MAX_ENTRIES를 매장 수보다 크게 둡니다 (base.py 참고)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".cache",
+        "OPTIONS": {"MAX_ENTRIES": 1000000},
+    },
+    # worker들이 공유하며 디스크에서 500 * RESPONSE_CACHE_MAX_BYTES(32MB)를 넘지 않습니다
+    # FileBasedCache는 set마다 디렉토리의 파일 목록을 조회(cull)하므로 MAX_ENTRIES를 작게 둡니다
+    "responses": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / ".response_cache",
+        "TIMEOUT": 300,
+        "OPTIONS": {"MAX_ENTRIES": 500},
+    },
+}
+
+# 일부 요청만 계측하여 gunicorn 로그로 남깁니다
+REQUEST_TIMING_SAMPLE_RATE = 0.05
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.timing": {"handlers": ["console"], "level": "INFO"},
+        "core.nplusone": {"handlers": ["console"], "level": "WARNING"},
+        "core.profiling": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
@@ -13,6 +13,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from core.metrics import metrics_view
 from django.contrib import admin
 from django.urls import include, path
 from drf_yasg import openapi
@@ -24,6 +25,7 @@ urlpatterns = [
     path("users/", include("users.urls")),
     path("users/self/stores/", include("stores.urls.my_store")),
     path("stores/", include("stores.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 schema_view = get_schema_view(
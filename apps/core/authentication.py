@@ -0,0 +1,54 @@
+from time import time
+
+from core.caches import LRUCache
+from core.metrics import register_cache_stats
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+"""
+user id -> is_active
+"""
+_active_users = LRUCache(
+    maxsize=settings.JWT_USER_CACHE_SIZE, ttl=settings.JWT_USER_ACTIVE_TTL
+)
+register_cache_stats("active_user", _active_users.get_stats)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    유저를 조회하지 않고 token의 claim으로 TokenUser를 만듭니다
+    request.user는 id 외의 field(phone 등)를 가지지 않습니다
+
+    token은 활성 유저에게만 발급되므로 (refresh한 access token도 iat는 최초 발급 시간)
+    발급 후 JWT_USER_ACTIVE_TTL초가 지난 token만 is_active를 다시 확인합니다
+    확인한 결과는 worker 메모리에 JWT_USER_ACTIVE_TTL초 동안 유지합니다
+    JWT_USER_ACTIVE_TTL이 None이면 다시 확인하지 않습니다
+
+    비활성화된 유저는 최대 JWT_USER_ACTIVE_TTL초 동안 인증될 수 있습니다
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        ttl = settings.JWT_USER_ACTIVE_TTL
+        issued_at = validated_token.get("iat", 0)
+        if ttl is not None and time() - issued_at > ttl:
+            if not is_active_user(user.id):
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+def is_active_user(user_id) -> bool:
+    is_active = _active_users.get(user_id)
+    if is_active is None:
+        is_active = (
+            get_user_model()
+            .objects.filter(**{api_settings.USER_ID_FIELD: user_id}, is_active=True)
+            .exists()
+        )
+        _active_users.set(user_id, is_active)
+    return is_active
@@ -0,0 +1,157 @@
+"""
+API 벤치마크 (benchmark_api command)
+
+scenario마다 같은 요청을 반복하여 latency(p50, p99, 평균)와 처리량을 측정합니다
+요청은 django test client로 process 안에서 보내므로 네트워크, gunicorn 비용은 포함하지 않습니다
+
+결과는 json으로 저장하고, 기준(baseline) 결과와 비교하여
+p50, p99가 tolerance보다 느려지거나 처리량이 줄어든 scenario를 반환합니다
+"""
+
+import json
+import math
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+
+class Request:
+    """
+    client의 method(path, data, **extra)로 보낼 요청
+    data가 dict이고 multipart가 아니면 json으로 보냅니다
+    """
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        data=None,
+        multipart: bool = False,
+        **extra,
+    ):
+        self.method = method
+        self.path = path
+        self.data = data
+        self.multipart = multipart
+        self.extra = extra
+
+    def send(self, client):
+        kwargs = dict(self.extra)
+        if self.method != "get" and not self.multipart:
+            kwargs["content_type"] = "application/json"
+        send = getattr(client, self.method)
+        if self.data is None:
+            return send(self.path, **kwargs)
+        return send(self.path, self.data, **kwargs)
+
+
+class Scenario:
+    """
+    make(i)는 i번째 요청(Request)을 반환하며, 측정 시간에 포함되지 않습니다
+    (삭제할 object 생성 등 준비 작업을 할 수 있습니다)
+    requests가 주어지면 command의 요청 수보다 적게 반복합니다 (비밀번호 hash 등 느린 API)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        make: Callable[[int], Request],
+        status: int = 200,
+        requests: Optional[int] = None,
+    ):
+        self.name = name
+        self.make = make
+        self.status = status
+        self.requests = requests
+
+
+class UnexpectedStatus(Exception):
+    pass
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    nearest-rank, values는 정렬되어 있어야 합니다
+    """
+    index = max(math.ceil(p / 100 * len(values)) - 1, 0)
+    return values[index]
+
+
+def _send(client, scenario: Scenario, i: int) -> float:
+    request = scenario.make(i)
+    started_at = perf_counter()
+    response = request.send(client)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    seconds = perf_counter() - started_at
+
+    if response.status_code != scenario.status:
+        raise UnexpectedStatus(
+            "%s: %s %s -> %d (expected %d)"
+            % (
+                scenario.name,
+                request.method.upper(),
+                request.path,
+                response.status_code,
+                scenario.status,
+            )
+        )
+    return seconds
+
+
+def run_scenario(client, scenario: Scenario, requests: int, warmup: int) -> dict:
+    """
+    시간은 ms 입니다
+    """
+    if scenario.requests is not None:
+        requests = min(requests, scenario.requests)
+        warmup = min(warmup, scenario.requests)
+
+    for i in range(warmup):
+        _send(client, scenario, i)
+    latencies = sorted(
+        _send(client, scenario, i) for i in range(warmup, warmup + requests)
+    )
+
+    total = sum(latencies)
+    return {
+        "requests": requests,
+        "throughput": round(requests / total, 1),
+        "mean": round(total / requests * 1000, 3),
+        "p50": round(percentile(latencies, 50) * 1000, 3),
+        "p99": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float):
+    """
+    baseline에 있는 scenario만 비교합니다
+    ex) tolerance=0.25이면 p50, p99가 25% 넘게 느려지거나 처리량이 25% 넘게 줄면 regression
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ("p50", "p99"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    "%s %s: %.3fms -> %.3fms"
+                    % (name, metric, base[metric], result[metric])
+                )
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                "%s throughput: %.1f/s -> %.1f/s"
+                % (name, base["throughput"], result["throughput"])
+            )
+    return regressions
+
+
+def load_results(path) -> Dict[str, dict]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def save_results(path, meta: dict, results: Dict[str, dict]):
+    Path(path).write_text(
+        json.dumps({"meta": meta, "results": results}, indent=2, ensure_ascii=False)
+    )
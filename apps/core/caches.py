@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+
+class LRUCache:
+    """
+    프로세스(worker) 내 메모리 캐시
+    maxsize개를 넘으면 가장 오래 사용되지 않은 값부터 제거합니다
+    ttl(초)이 주어지면 저장 후 ttl이 지난 값은 없는 것으로 봅니다
+    hits, misses로 적중률을 확인할 수 있습니다
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at is not None and expires_at <= monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,22 @@
+"""
+jamo 패키지를 이용한 이전 초성, 자모 변환 구현
+core.utils의 변환과 결과(테스트), 속도(benchmark_hangul command)를 비교하는 기준으로 사용합니다
+"""
+
+from core.utils import COMPOUND_JAMO
+from jamo import hangul_to_jamo, jamo_to_hcj
+
+
+def jamo_convert_to_chosung(s: str):
+    result = ""
+    for c in s:
+        result += next(jamo_to_hcj(hangul_to_jamo(c)))
+    return result
+
+
+def jamo_convert_to_jamo(s: str):
+    result = ""
+    for c in s:
+        for jamo in jamo_to_hcj(hangul_to_jamo(c)):
+            result += COMPOUND_JAMO.get(jamo, jamo)
+    return result
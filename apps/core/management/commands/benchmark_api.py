@@ -0,0 +1,568 @@
+import json
+import logging
+import random
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from core.benchmark import (
+    Request,
+    Scenario,
+    UnexpectedStatus,
+    compare,
+    load_results,
+    run_scenario,
+    save_results,
+)
+from core.utils import convert_to_chosung_batch, convert_to_jamo_batch
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+from stores.models import Category, Product, Store
+from stores.search import bulk_create_products
+from users.models import User
+
+PASSWORD = "password!2"
+
+"""
+요청 계측(core.timing, core.nplusone, core.profiling)이 측정에 포함되지 않도록 끕니다
+프로덕션은 일부 요청만 계측하므로 매 요청을 계측하는 개발 설정과 비용이 다릅니다
+"""
+BENCHMARK_SETTINGS = {
+    "REQUEST_TIMING_SAMPLE_RATE": 0,
+    "NPLUSONE_ACTION": None,
+    "PROFILING_SAMPLE_RATE": 0,
+    "PROFILING_SLOW_SECONDS": None,
+}
+
+WORDS = [
+    "아이스",
+    "핫",
+    "아메리카노",
+    "카페",
+    "라떼",
+    "바닐라",
+    "헤이즐넛",
+    "초코",
+    "딸기",
+    "치즈",
+    "케이크",
+    "샌드위치",
+    "쿠키",
+    "녹차",
+    "밀크티",
+    "레몬",
+    "에이드",
+    "스무디",
+    "베이글",
+    "크림",
+    "콜드브루",
+    "마카롱",
+    "슈크림",
+    "자몽",
+]
+
+
+def product_names(count: int, seed=0):
+    """
+    1~3개의 단어와 번호로 된 매장 내 unique한 이름
+    ex) 아이스 바닐라 라떼 123
+    """
+    rand = random.Random(seed)
+    return [
+        "%s %d" % (" ".join(rand.sample(WORDS, rand.randint(1, 3))), i)
+        for i in range(count)
+    ]
+
+
+def create_products(store, categories, count, chunk_size=2000, seed=0):
+    """
+    chosung, jamo, 검색 토큰까지 상품 생성 API와 같은 데이터를 만듭니다
+    """
+    rand = random.Random(seed)
+    names = product_names(count, seed)
+    for start in range(0, count, chunk_size):
+        chunk = names[start : start + chunk_size]
+        bulk_create_products(
+            store.id,
+            [
+                Product(
+                    store=store,
+                    category=rand.choice(categories),
+                    price=rand.randrange(1000, 10000, 100),
+                    cost=rand.randrange(500, 5000, 100),
+                    name=name,
+                    chosung=chosung,
+                    jamo=jamo,
+                    description="맛있는 %s" % name,
+                    barcode="880%010d" % (start + i),
+                    sell_by_days=rand.randint(1, 30),
+                    size=rand.choice(["small", "large"]),
+                )
+                for i, (name, chosung, jamo) in enumerate(
+                    zip(
+                        chunk,
+                        convert_to_chosung_batch(chunk),
+                        convert_to_jamo_batch(chunk),
+                    )
+                )
+            ],
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "대량의 데이터를 만든 test DB에서 모든 API의 latency(p50, p99)와 처리량을 측정합니다\n"
+        "--baseline의 결과보다 --tolerance 넘게 느려지면 실패합니다"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000, help="유저(매장) 수")
+        parser.add_argument("--products", type=int, default=50000, help="측정할 매장의 상품 수")
+        parser.add_argument(
+            "--store-products", type=int, default=10, help="다른 매장들의 상품 수"
+        )
+        parser.add_argument("--requests", type=int, default=200, help="scenario별 요청 수")
+        parser.add_argument(
+            "--warmup", type=int, default=10, help="scenario별 warmup 요청 수"
+        )
+        parser.add_argument(
+            "--deep-page", type=int, default=100, help="깊은 cursor 페이지 번호"
+        )
+        parser.add_argument(
+            "--scenario", action="append", help="이름에 포함된 scenario만 측정 (여러번 가능)"
+        )
+        parser.add_argument("--output", help="결과를 저장할 json 파일")
+        parser.add_argument("--baseline", help="비교할 이전 결과 json 파일")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25, help="허용하는 성능 저하 비율"
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true", help="test DB와 데이터를 다음 실행에 재사용"
+        )
+
+    def handle(self, *args, **options):
+        baseline = load_results(options["baseline"]) if options["baseline"] else None
+
+        setup_test_environment()
+        runner = DiscoverRunner(keepdb=options["keepdb"], verbosity=0)
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(**BENCHMARK_SETTINGS):
+                self.seed(options)
+                results = self.run_scenarios(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if options["output"]:
+            meta = {
+                "created_at": timezone.now().isoformat(),
+                **{
+                    key: options[key]
+                    for key in ("users", "products", "store_products", "requests")
+                },
+            }
+            save_results(options["output"], meta, results)
+            self.stdout.write("saved: %s" % options["output"])
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "%d regressions\n%s" % (len(regressions), "\n".join(regressions))
+                )
+            self.stdout.write(self.style.SUCCESS("no regressions"))
+
+    def seed(self, options):
+        """
+        --keepdb로 이전에 만든 데이터가 있으면 다시 만들지 않습니다
+        bulk_create가 pk를 반환하지 않는 db(mysql)를 위해 생성한 row를 다시 조회합니다
+        """
+        if User.objects.exists():
+            self.stdout.write("reuse data: %d products" % Product.objects.count())
+            return
+
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            User(phone="010%08d" % i, password=password)
+            for i in range(options["users"])
+        )
+        users = list(User.objects.order_by("phone"))
+        Store.objects.bulk_create(
+            Store(owner=user, name="매장 %d" % i) for i, user in enumerate(users)
+        )
+        stores = list(Store.objects.order_by("owner__phone"))
+
+        Category.objects.bulk_create(
+            Category(store=stores[0], name="카테고리 %d" % i) for i in range(50)
+        )
+        categories = list(stores[0].categories.order_by("id"))
+        create_products(stores[0], categories, options["products"])
+
+        Category.objects.bulk_create(
+            Category(store=store, name="카테고리") for store in stores[1:]
+        )
+        other_categories = {
+            category.store_id: category
+            for category in Category.objects.exclude(store=stores[0])
+        }
+        for i, store in enumerate(stores[1:]):
+            create_products(
+                store,
+                [other_categories[store.id]],
+                options["store_products"],
+                seed=i + 1,
+            )
+
+        self.stdout.write(
+            "seeded: %d users, %d products" % (len(users), Product.objects.count())
+        )
+
+    def run_scenarios(self, options):
+        client = Client()
+        scenarios = self.get_scenarios(client, options)
+        if options["scenario"]:
+            scenarios = [
+                scenario
+                for scenario in scenarios
+                if any(name in scenario.name for name in options["scenario"])
+            ]
+
+        self.stdout.write(
+            "%-28s %8s %10s %10s %10s %10s"
+            % ("scenario", "requests", "req/s", "mean(ms)", "p50(ms)", "p99(ms)")
+        )
+        # 4xx를 기대하는 scenario의 경고 로그를 출력하지 않습니다
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            return {
+                scenario.name: self.run_scenario(client, scenario, options)
+                for scenario in scenarios
+            }
+        finally:
+            request_logger.setLevel(level)
+
+    def run_scenario(self, client, scenario, options):
+        try:
+            result = run_scenario(
+                client, scenario, options["requests"], options["warmup"]
+            )
+        except UnexpectedStatus as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            "%-28s %8d %10.1f %10.3f %10.3f %10.3f"
+            % (
+                scenario.name,
+                result["requests"],
+                result["throughput"],
+                result["mean"],
+                result["p50"],
+                result["p99"],
+            )
+        )
+        return result
+
+    def get_scenarios(self, client, options):
+        """
+        모든 API를 측정 대상 매장(상품이 가장 많은 매장)의 owner로 요청합니다
+        scenario마다 unique한 값은 run과 요청 번호로 만듭니다
+        """
+        run = uuid4().hex[:6]
+        phone_base = random.randrange(10**7)
+        owner = User.objects.get(phone="01000000000")
+        store = Store.objects.get(owner=owner)
+        category = store.categories.order_by("id").first()
+        product = store.products.order_by("id").first()
+
+        refresh = RefreshToken.for_user(owner)
+        auth = {"HTTP_AUTHORIZATION": "Bearer %s" % refresh.access_token}
+        store_id = store.id
+
+        def url(name, *args):
+            return reverse(name, args=[store_id, *args])
+
+        def get(path, **data):
+            return lambda i: Request("get", path, data or None, **auth)
+
+        def new_category(i):
+            return Category.objects.create(store=store, name="삭제 %s %d" % (run, i))
+
+        def new_product(i):
+            return Product.objects.create(
+                store=store,
+                category=category,
+                price=1000,
+                cost=500,
+                name="삭제 %s %d" % (run, i),
+                chosung="ㅅㅈ",
+                jamo="ㅅㅏㄱㅈㅔ",
+                description="",
+                barcode="",
+                sell_by_days=1,
+                size="small",
+            )
+
+        def product_data(name):
+            return {
+                "category": category.id,
+                "price": 4500,
+                "cost": 2000,
+                "name": name,
+                "description": "벤치마크 %s" % name,
+                "barcode": "8800000000000",
+                "sell_by_days": 3,
+                "size": "small",
+            }
+
+        def import_file(i):
+            rows = [
+                dict(product_data("가져오기 %s %d %d" % (run, i, j))) for j in range(100)
+            ]
+            content = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows)
+            return SimpleUploadedFile("products.ndjson", content.encode())
+
+        def clear_responses():
+            caches[settings.RESPONSE_CACHE_ALIAS].clear()
+
+        def uncached(path):
+            def make(i):
+                clear_responses()
+                return Request("get", path, **auth)
+
+            return make
+
+        products_path = url("stores:list_product")
+        deep_path = products_path + "?page_size=100"
+        for _ in range(options["deep_page"]):
+            next_url = client.get(deep_path, **auth).json()["data"]["next"] or deep_path
+            deep_path = next_url.replace("http://testserver", "")
+
+        # 데이터를 만든 후의 변경(다른 scenario의 수정)만 조회합니다
+        since = timezone.now().isoformat()
+        barcodes = list(store.products.values_list("barcode", flat=True)[:100])
+        batch_ids = list(
+            store.products.order_by("-id").values_list("id", flat=True)[:50]
+        )
+
+        return [
+            Scenario(
+                "users.create",
+                lambda i: Request(
+                    "post",
+                    reverse("users:create"),
+                    {
+                        "phone": "011%08d" % (phone_base + i),
+                        "password": PASSWORD,
+                        "password2": PASSWORD,
+                    },
+                ),
+                status=201,
+                requests=20,
+            ),
+            Scenario(
+                "auth.token",
+                lambda i: Request(
+                    "post",
+                    reverse("auth:create_token"),
+                    {"phone": owner.phone, "password": PASSWORD},
+                ),
+                requests=20,
+            ),
+            Scenario(
+                "auth.refresh",
+                lambda i: Request(
+                    "post", reverse("auth:refresh_token"), {"refresh": str(refresh)}
+                ),
+            ),
+            Scenario(
+                "auth.blacklist",
+                lambda i: Request(
+                    "post",
+                    reverse("auth:blacklist_token"),
+                    {"refresh": str(RefreshToken.for_user(owner))},
+                ),
+            ),
+            Scenario("my_stores.list", get(reverse("my_stores:list"))),
+            Scenario(
+                "my_stores.create",
+                lambda i: Request(
+                    "post",
+                    reverse("my_stores:list"),
+                    {"name": "매장 %s %d" % (run, i)},
+                    **auth,
+                ),
+                status=201,
+            ),
+            Scenario("store.detail", get(url("stores:detail"))),
+            Scenario(
+                "store.update",
+                lambda i: Request(
+                    "patch", url("stores:detail"), {"name": "매장 %d" % (i % 2)}, **auth
+                ),
+            ),
+            Scenario(
+                "store.delete",
+                lambda i: Request(
+                    "delete",
+                    reverse(
+                        "stores:detail",
+                        args=[Store.objects.create(owner=owner, name="삭제 매장").id],
+                    ),
+                    **auth,
+                ),
+                status=204,
+            ),
+            Scenario("store.changes.full", get(url("stores:changes")), requests=5),
+            Scenario("store.changes.since", get(url("stores:changes"), since=since)),
+            Scenario("categories.list", get(url("stores:list_category"))),
+            Scenario(
+                "categories.create",
+                lambda i: Request(
+                    "post",
+                    url("stores:list_category"),
+                    {"name": "분류 %s %d" % (run, i)},
+                    **auth,
+                ),
+                status=201,
+            ),
+            Scenario(
+                "category.detail", get(url("stores:detail_category", category.id))
+            ),
+            Scenario(
+                "category.update",
+                lambda i: Request(
+                    "patch",
+                    url("stores:detail_category", category.id),
+                    {"name": "카테고리 0" if i % 2 else "카테고리 영"},
+                    **auth,
+                ),
+            ),
+            Scenario(
+                "category.delete",
+                lambda i: Request(
+                    "delete",
+                    url("stores:detail_category", new_category(i).id),
+                    **auth,
+                ),
+                status=204,
+            ),
+            Scenario("products.list", get(products_path)),
+            Scenario("products.list.uncached", uncached(products_path)),
+            Scenario("products.list.deep", uncached(deep_path)),
+            Scenario("products.search.chosung", get(products_path, search="ㅇㅇㅅ")),
+            Scenario("products.search.name", get(products_path, search="바닐라 라떼")),
+            Scenario(
+                "products.search.uncached",
+                uncached("%s?%s" % (products_path, urlencode({"search": "아메"}))),
+            ),
+            Scenario(
+                "products.create",
+                lambda i: Request(
+                    "post",
+                    products_path,
+                    product_data("생성 %s %d" % (run, i)),
+                    **auth,
+                ),
+                status=201,
+            ),
+            Scenario(
+                "products.create.invalid",
+                lambda i: Request(
+                    "post",
+                    products_path,
+                    {**product_data(product.name), "price": -1},
+                    **auth,
+                ),
+                status=400,
+            ),
+            Scenario("product.detail", get(url("stores:detail_product", product.id))),
+            Scenario(
+                "product.update",
+                lambda i: Request(
+                    "patch",
+                    url("stores:detail_product", product.id),
+                    {"price": 1000 + i},
+                    **auth,
+                ),
+            ),
+            Scenario(
+                "product.delete",
+                lambda i: Request(
+                    "delete",
+                    url("stores:detail_product", new_product(i).id),
+                    **auth,
+                ),
+                status=204,
+            ),
+            Scenario(
+                "products.autocomplete",
+                get(url("stores:autocomplete_product"), q="아이스 바"),
+            ),
+            Scenario(
+                "products.barcode",
+                get(url("stores:barcode_product", barcodes[0])),
+            ),
+            Scenario(
+                "products.barcodes",
+                lambda i: Request(
+                    "post",
+                    url("stores:barcodes_product"),
+                    {"barcodes": barcodes},
+                    **auth,
+                ),
+            ),
+            Scenario(
+                "products.batch",
+                lambda i: Request(
+                    "post",
+                    url("stores:batch_product"),
+                    {
+                        "operations": [
+                            {"op": "update", "id": id, "data": {"price": 1000 + i}}
+                            for id in batch_ids
+                        ]
+                    },
+                    **auth,
+                ),
+            ),
+            Scenario(
+                "products.adjust_price",
+                lambda i: Request(
+                    "post",
+                    url("stores:adjust_price_product"),
+                    {"amount": 1 if i % 2 else -1, "category": category.id},
+                    **auth,
+                ),
+            ),
+            Scenario(
+                "products.import",
+                lambda i: Request(
+                    "post",
+                    url("stores:import_product"),
+                    {"file": import_file(i)},
+                    multipart=True,
+                    **auth,
+                ),
+                requests=20,
+            ),
+            Scenario(
+                "products.export",
+                get(url("stores:export_product"), file_format="ndjson"),
+                requests=5,
+            ),
+        ]
@@ -0,0 +1,53 @@
+import random
+from timeit import Timer
+
+from core.hangul_reference import jamo_convert_to_chosung, jamo_convert_to_jamo
+from core.utils import (
+    HANGUL_FIRST,
+    HANGUL_LAST,
+    convert_to_chosung,
+    convert_to_chosung_batch,
+    convert_to_jamo,
+    convert_to_jamo_batch,
+)
+from django.core.management.base import BaseCommand
+
+
+def random_names(count, seed=0):
+    """
+    상품 이름과 비슷한 한글, 영문, 숫자, 공백이 섞인 이름
+    """
+    rand = random.Random(seed)
+    chars = [chr(rand.randint(HANGUL_FIRST, HANGUL_LAST)) for _ in range(2000)]
+    chars += list("abcdefghijklmnopqrstuvwxyz0123456789") + [" "] * 200
+    return ["".join(rand.choices(chars, k=rand.randint(4, 32))) for _ in range(count)]
+
+
+class Command(BaseCommand):
+    help = "초성, 자모 변환 속도를 이전 구현(jamo 패키지)과 비교합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10000, help="이름 수")
+        parser.add_argument("--repeat", type=int, default=5, help="반복 측정 수")
+
+    def handle(self, *args, **options):
+        names = random_names(options["count"])
+        cases = [
+            (
+                "chosung (jamo package)",
+                lambda: [jamo_convert_to_chosung(n) for n in names],
+            ),
+            ("chosung", lambda: [convert_to_chosung(n) for n in names]),
+            ("chosung batch", lambda: convert_to_chosung_batch(names)),
+            ("jamo (jamo package)", lambda: [jamo_convert_to_jamo(n) for n in names]),
+            ("jamo", lambda: [convert_to_jamo(n) for n in names]),
+            ("jamo batch", lambda: convert_to_jamo_batch(names)),
+        ]
+
+        self.stdout.write("%d names, best of %d" % (len(names), options["repeat"]))
+        for name, func in cases:
+            best = min(Timer(func).repeat(repeat=options["repeat"], number=1))
+            self.stdout.write(
+                "%-24s %10.2f ms %12.0f names/s"
+                % (name, best * 1000, len(names) / best)
+            )
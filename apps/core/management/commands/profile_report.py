@@ -0,0 +1,106 @@
+import pstats
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def read_collapsed(paths) -> Counter:
+    stacks = Counter()
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                stacks[stack] += int(count)
+    return stacks
+
+
+def hot_functions(stacks: Counter):
+    """
+    함수별 (self, total) sample 수
+    self는 stack의 마지막(실행 중인) 함수, total은 stack에 포함된 함수 입니다
+    """
+    self_counts, total_counts = Counter(), Counter()
+    for stack, count in stacks.items():
+        functions = stack.split(";")
+        self_counts[functions[-1]] += count
+        for function in set(functions):
+            total_counts[function] += count
+    return self_counts, total_counts
+
+
+class Command(BaseCommand):
+    help = "ProfilingMiddleware(core.profiling)가 저장한 파일을 합쳐 오래 걸린 함수를 출력합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir", default=settings.PROFILING_DIR, help="profile 디렉토리"
+        )
+        parser.add_argument("--view", help="view 이름 (없으면 모든 view)")
+        parser.add_argument("--top", type=int, default=20, help="출력할 함수 수")
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "tottime"],
+            default="cumulative",
+            help="pstats 정렬 기준",
+        )
+        parser.add_argument(
+            "--collapsed-output",
+            help="합친 collapsed stack을 저장할 파일 (flamegraph.pl 입력)",
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options["dir"])
+        if options["view"]:
+            directory = directory / options["view"]
+        if not directory.is_dir():
+            raise CommandError("%s 디렉토리가 없습니다" % directory)
+
+        profiles = sorted(directory.rglob("*.prof"))
+        collapsed = sorted(directory.rglob("*.collapsed"))
+        if not profiles and not collapsed:
+            raise CommandError("%s에 profile 파일이 없습니다" % directory)
+
+        if profiles:
+            self.stdout.write("# cProfile: %d requests" % len(profiles))
+            # OutputWrapper는 write마다 줄을 바꾸므로 모아서 출력합니다
+            stream = StringIO()
+            stats = pstats.Stats(*map(str, profiles), stream=stream)
+            stats.strip_dirs().sort_stats(options["sort"]).print_stats(options["top"])
+            self.stdout.write(stream.getvalue(), ending="")
+
+        if collapsed:
+            self.write_samples(collapsed, options["top"], options["collapsed_output"])
+
+    def write_samples(self, paths, top, output):
+        stacks = read_collapsed(paths)
+        total = sum(stacks.values())
+        self_counts, total_counts = hot_functions(stacks)
+
+        self.stdout.write(
+            "# slow requests: %d requests, %d samples" % (len(paths), total)
+        )
+        self.stdout.write("%8s %8s  %s" % ("self%", "total%", "function"))
+        # total이 같으면(같은 stack의 바깥 함수들) self가 큰 함수를 먼저 출력합니다
+        functions = sorted(
+            total_counts,
+            key=lambda function: (total_counts[function], self_counts[function]),
+            reverse=True,
+        )
+        for function in functions[:top]:
+            self.stdout.write(
+                "%8.1f %8.1f  %s"
+                % (
+                    self_counts[function] * 100 / total,
+                    total_counts[function] * 100 / total,
+                    function,
+                )
+            )
+
+        if output:
+            with open(output, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write("%s %d\n" % (stack, count))
+            self.stdout.write("collapsed stacks: %s" % output)
@@ -0,0 +1,140 @@
+"""
+Prometheus metrics
+
+view별 응답 시간(histogram), 상태 코드별 요청 수, 쿼리 수, 처리 중인 요청 수와 캐시 적중 수를 /metrics로 노출합니다
+
+gunicorn worker(process)마다 값을 가지므로, PROMETHEUS_MULTIPROC_DIR 환경 변수가 있으면
+prometheus_client의 multiprocess mode로 각 worker가 디렉토리에 기록한 값을 합쳐서 응답합니다
+(gunicorn.conf.py의 child_exit에서 종료된 worker를 정리합니다)
+
+view label은 url에 연결된 view 이름이며, url이 없는 요청은 하나의 label로 모아 cardinality를 제한합니다
+method label도 HTTP 표준 method 외에는 하나(other)로 모읍니다
+쿼리 수는 core.timing과 같은 execute_wrapper(count_queries)로 셉니다
+"""
+
+import os
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict
+
+from core.timing import count_queries
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UNRESOLVED_VIEW = "<unresolved>"
+OTHER_METHOD = "other"
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE"}
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "view별 응답 시간",
+    ["view", "method"],
+)
+REQUESTS = Counter(
+    "http_requests",
+    "view, 상태 코드별 요청 수",
+    ["view", "method", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "처리 중인 요청 수",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter("db_queries", "view별 쿼리 수", ["view"])
+DB_QUERY_SECONDS = Counter("db_query_seconds", "view별 쿼리 실행 시간", ["view"])
+CACHE_HITS = Counter("cache_hits", "캐시 적중 수", ["cache"])
+CACHE_MISSES = Counter("cache_misses", "캐시 미적중 수", ["cache"])
+
+"""
+cache name -> hits, misses를 가진 dict를 반환하는 함수
+"""
+_cache_stats: Dict[str, Callable[[], dict]] = {}
+_cache_seen = {}
+_cache_lock = Lock()
+
+
+def register_cache_stats(name: str, get_stats: Callable[[], dict]):
+    """
+    worker 메모리 캐시의 적중 수를 요청마다 metrics에 반영합니다
+    ex) register_cache_stats("store_owner", _owners.get_stats)
+    """
+    _cache_stats[name] = get_stats
+
+
+def collect_cache_stats():
+    """
+    이전에 반영한 값과의 차이만큼 증가시킵니다
+    캐시를 비워 값이 줄었으면 비운 후의 값만큼 증가시킵니다
+    """
+    with _cache_lock:
+        for name, get_stats in _cache_stats.items():
+            stats = get_stats()
+            for counter, key in ((CACHE_HITS, "hits"), (CACHE_MISSES, "misses")):
+                value = stats[key]
+                seen = _cache_seen.get((name, key), 0)
+                delta = value - seen if value >= seen else value
+                if delta:
+                    counter.labels(name).inc(delta)
+                _cache_seen[name, key] = value
+
+
+def get_view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED_VIEW
+    view = getattr(match.func, "view_class", match.func)
+    return view.__name__
+
+
+def get_method_label(request) -> str:
+    return request.method if request.method in METHODS else OTHER_METHOD
+
+
+class PrometheusMetricsMiddleware:
+    """
+    MIDDLEWARE의 처음에 두어야 다른 middleware의 시간까지 포함합니다
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started_at = perf_counter()
+        with REQUESTS_IN_PROGRESS.track_inprogress(), count_queries() as counter:
+            started_queries, started_db = counter.queries, counter.seconds
+            response = self.get_response(request)
+            queries = counter.queries - started_queries
+            db = counter.seconds - started_db
+        duration = perf_counter() - started_at
+
+        view = get_view_name(request)
+        method = get_method_label(request)
+        REQUEST_LATENCY.labels(view, method).observe(duration)
+        REQUESTS.labels(view, method, response.status_code).inc()
+        if queries:
+            DB_QUERIES.labels(view).inc(queries)
+            DB_QUERY_SECONDS.labels(view).inc(db)
+        collect_cache_stats()
+        return response
+
+
+def metrics_view(request):
+    """
+    인증하지 않으므로 외부에서 접근할 수 없도록 nginx에서 막아야 합니다
+    """
+    collect_cache_stats()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,143 @@
+"""
+N+1 쿼리 감지
+
+요청 안에서 구조가 같은 쿼리(fingerprint)가 NPLUSONE_THRESHOLD번 이상 실행되면 감지합니다
+ex) select_related 없이 ProductSerializer.get_category_name에서 상품마다 category를 조회
+
+fingerprint는 parameter(%s)로 전달되지 않은 숫자, 문자열 값과 IN, VALUES의 길이를 지운 SQL 입니다
+savepoint는 transaction 처리이므로 세지 않습니다
+
+NPLUSONE_ACTION
+    None: 사용하지 않음
+    "log": core.nplusone logger에 WARNING으로 기록
+    "raise": NPlusOneError 발생 (테스트)
+batch 단위 처리처럼 반복이 의도된 view는 allow_repeated_queries = True로 제외합니다
+"""
+
+import logging
+import re
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_SAVEPOINT_RE = re.compile(r"^(?:SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT) ")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_RE = re.compile(r"IN \((?:(?:%s|\?), )*(?:%s|\?)\)")
+_VALUES_RE = re.compile(r"VALUES (\([^()]*\))(?:, \([^()]*\))*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def fingerprint(sql: str) -> Optional[str]:
+    """
+    ex) SELECT ... WHERE "id" IN (%s, %s, %s) -> SELECT ... WHERE "id" IN (...)
+    savepoint는 None
+    """
+    if _SAVEPOINT_RE.match(sql):
+        return None
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub(r"VALUES \1, ...", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+def get_location() -> str:
+    """
+    쿼리를 실행한 프로젝트 코드의 위치
+    안쪽부터 django.db를 지난 후 처음 만나는 프로젝트 파일 입니다 (다른 execute_wrapper 제외)
+    """
+    base_dir = str(settings.BASE_DIR)
+    in_db = False
+    for frame in reversed(traceback.extract_stack()):
+        if "/django/db/" in frame.filename:
+            in_db = True
+        elif in_db and frame.filename.startswith(base_dir):
+            return "%s:%d %s" % (
+                frame.filename[len(base_dir) + 1 :],
+                frame.lineno,
+                frame.name,
+            )
+    return "unknown"
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper로 fingerprint별 실행 수를 셉니다
+    threshold번째 실행에서 위치를 기록합니다
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.locations = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        if key is not None:
+            self.counts[key] += 1
+            if self.counts[key] == self.threshold:
+                self.locations[key] = get_location()
+        return execute(sql, params, many, context)
+
+    def get_repeated(self) -> List[Tuple[str, int, str]]:
+        """
+        (fingerprint, count, location) 목록
+        """
+        return [
+            (key, self.counts[key], location)
+            for key, location in self.locations.items()
+        ]
+
+
+def format_repeated(label: str, repeated: List[Tuple[str, int, str]]) -> str:
+    return "N+1 queries in %s\n%s" % (
+        label,
+        "\n".join(
+            "  %d times at %s: %s" % (count, location, sql)
+            for sql, count, location in repeated
+        ),
+    )
+
+
+def report(label: str, repeated: List[Tuple[str, int, str]]):
+    message = format_repeated(label, repeated)
+    if settings.NPLUSONE_ACTION == "raise":
+        raise NPlusOneError(message)
+    logger.warning(message, extra={"view": label, "repeated": repeated})
+
+
+def is_allowed(request) -> bool:
+    match = getattr(request, "resolver_match", None)
+    view = getattr(match.func, "view_class", None) if match else None
+    return getattr(view, "allow_repeated_queries", False)
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        if settings.NPLUSONE_ACTION is None:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder(settings.NPLUSONE_THRESHOLD)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        repeated = recorder.get_repeated()
+        if repeated and not is_allowed(request):
+            report("%s %s" % (request.method, request.path), repeated)
+        return response
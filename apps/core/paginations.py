@@ -1,6 +1,127 @@
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+
+class KeysetCursorPagination(pagination.CursorPagination):
+    """
+    ordering의 모든 필드 값을 cursor position으로 사용합니다
+    ex) ordering이 ("-created_at", "-id")라면
+        position = (created_at, id)
+        다음 페이지 = created_at < x or (created_at = x and id < y)
+
+    ordering이 unique하므로 created_at이 같은 상품들(bulk 생성)이 있어도
+    건너뛰거나 중복되지 않고, offset 없이 index 범위 조회만으로 다음 페이지를 가져옵니다
+    (drf의 CursorPagination은 첫번째 필드만 비교하고, 같은 값은 offset으로 건너뜁니다)
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*pagination._reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(current_position, reverse)
+            )
+
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_filter(self, position: str, reverse: bool) -> Q:
+        """
+        position 다음(reverse면 이전)의 row들
+        첫번째 필드의 범위 조건을 따로 두어 index 범위 조회가 되도록 합니다
+        """
+        try:
+            values = json.loads(position)
+            assert isinstance(values, list) and len(values) == len(self.ordering)
+        except (ValueError, AssertionError):
+            raise NotFound(self.invalid_cursor_message)
+
+        lookups = []
+        for order in self.ordering:
+            is_reversed = order.startswith("-")
+            lookups.append(
+                (order.lstrip("-"), "lt" if reverse != is_reversed else "gt")
+            )
+
+        first_field, first_lookup = lookups[0]
+        q = Q(**{"%s__%se" % (first_field, first_lookup): values[0]})
+
+        conditions = []
+        for i, (field, lookup) in enumerate(lookups):
+            equals = {f: v for (f, _), v in zip(lookups[:i], values[:i])}
+            conditions.append(Q(**equals, **{"%s__%s" % (field, lookup): values[i]}))
+        return q & reduce(or_, conditions)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            if isinstance(instance, dict):
+                attr = instance[field_name]
+            else:
+                attr = getattr(instance, field_name)
+            values.append(str(attr))
+        return json.dumps(values)
+
 
+class DefaultCursorPagination(KeysetCursorPagination):
+    """
+    page_size로 페이지 크기를 정할 수 있으며 max_page_size를 넘지 않습니다
+    """
 
-class DefaultCursorPagination(pagination.CursorPagination):
     page_size = 10
-    ordering = "-created_at"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,18 @@
+import orjson
+from core.renderers import ORJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    request body를 orjson으로 읽습니다 (utf-8만 지원)
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
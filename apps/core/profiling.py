@@ -0,0 +1,184 @@
+"""
+느린 요청 profiling (opt-in)
+
+PROFILING_SAMPLE_RATE 비율의 요청은 cProfile로 profiling하여 pstats 파일(.prof)로 저장합니다
+PROFILING_SLOW_SECONDS가 주어지면 모든 요청의 stack을 PROFILING_STACK_INTERVAL초마다 sampling하고,
+그보다 오래 걸린 요청만 collapsed stack 파일(.collapsed, flamegraph.pl 입력)로 저장합니다
+
+cProfile은 요청을 크게 느리게 하므로 sample에만 사용하고,
+느린 요청은 끝나기 전에 알 수 없으므로 비용이 적은 sampling으로 기록합니다
+
+파일은 PROFILING_DIR/<view 이름>/<시간>-<request id>.(prof|collapsed)에 저장되며,
+profile_report command로 합쳐서 오래 걸린 함수를 확인할 수 있습니다
+request id는 X-Request-Id header가 [A-Za-z0-9_-]{1,64}일 때만 사용합니다
+파일 저장에 실패해도 응답은 그대로 반환하고 core.profiling logger에 기록합니다
+둘 다 설정하지 않으면 middleware를 사용하지 않습니다
+"""
+
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from time import perf_counter, sleep, strftime
+from uuid import uuid4
+
+from core.metrics import get_view_name
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+_REQUEST_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def format_frame(frame) -> str:
+    code = frame.f_code
+    return "%s:%s" % (os.path.basename(code.co_filename), code.co_name)
+
+
+def collapse_stack(frame) -> str:
+    """
+    바깥 함수부터 ;로 연결합니다
+    ex) handler.py:__call__;views.py:get;serializers.py:data
+    """
+    names = []
+    while frame is not None:
+        names.append(format_frame(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    등록된 thread(처리 중인 요청)의 stack을 interval초마다 기록하는 daemon thread
+    process마다 하나만 실행합니다
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stacks = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id: int):
+        with self._lock:
+            self._stacks[thread_id] = Counter()
+            self._active.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="stack-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, thread_id: int) -> Counter:
+        with self._lock:
+            stacks = self._stacks.pop(thread_id, Counter())
+            if not self._stacks:
+                self._active.clear()
+            return stacks
+
+    def sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, stacks in self._stacks.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[collapse_stack(frame)] += 1
+
+    def _run(self):
+        """
+        처리 중인 요청이 없으면 기다립니다
+        """
+        while True:
+            self._active.wait()
+            sleep(self.interval)
+            self.sample()
+
+
+_sampler = None
+
+
+def get_sampler() -> StackSampler:
+    global _sampler
+    if _sampler is None:
+        _sampler = StackSampler(settings.PROFILING_STACK_INTERVAL)
+    return _sampler
+
+
+def get_request_id(request) -> str:
+    """
+    파일 이름에 사용하므로 형식이 맞지 않는 header는 무시합니다 (ex. ../, 너무 긴 값)
+    """
+    request_id = request.headers.get("X-Request-Id", "")
+    if _REQUEST_ID_RE.fullmatch(request_id):
+        return request_id
+    return uuid4().hex[:12]
+
+
+def get_profile_path(request, suffix: str) -> Path:
+    request_id = get_request_id(request)
+    directory = Path(settings.PROFILING_DIR) / get_view_name(request)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / ("%s-%s.%s" % (strftime("%Y%m%d%H%M%S"), request_id, suffix))
+
+
+def write_collapsed(path: Path, stacks: Counter):
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write("%s %d\n" % (stack, count))
+
+
+class ProfilingMiddleware:
+    """
+    MIDDLEWARE의 처음에 두어야 다른 middleware까지 포함합니다
+    """
+
+    def __init__(self, get_response):
+        if (
+            not settings.PROFILING_SAMPLE_RATE
+            and settings.PROFILING_SLOW_SECONDS is None
+        ):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return self.profile(request)
+        if settings.PROFILING_SLOW_SECONDS is not None:
+            return self.sample_if_slow(request)
+        return self.get_response(request)
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        try:
+            profiler.dump_stats(get_profile_path(request, "prof"))
+        except Exception:
+            logger.exception("failed to save profile")
+        return response
+
+    def sample_if_slow(self, request):
+        sampler = get_sampler()
+        thread_id = threading.get_ident()
+        started_at = perf_counter()
+        sampler.start(thread_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            stacks = sampler.stop(thread_id)
+        if perf_counter() - started_at >= settings.PROFILING_SLOW_SECONDS and stacks:
+            try:
+                write_collapsed(get_profile_path(request, "collapsed"), stacks)
+            except Exception:
+                logger.exception("failed to save stacks")
+        return response
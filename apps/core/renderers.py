@@ -0,0 +1,36 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+"""
+orjson이 직렬화하지 못하는 값(Decimal, lazy 문자열 등)은 drf의 JSONEncoder로 변환합니다
+datetime은 drf와 같이 UTC를 Z로 표시합니다
+"""
+_default = JSONEncoder().default
+_options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_default, option=_options)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    drf의 JSONRenderer(compact, unicode)와 같은 결과를 orjson으로 만듭니다
+    indent가 요청된 경우(browsable api 등)는 drf의 JSONRenderer를 사용합니다
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data)
+        # drf와 같이 javascript에서 줄바꿈으로 해석되는 문자를 escape 합니다
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
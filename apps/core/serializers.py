@@ -13,3 +13,61 @@ class UpdateSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return self.representation_serializer_class(instance=instance).data
+
+
+class ValuesSerializer:
+    """
+    read 전용 목록의 빠른 경로
+    representation_serializer_class와 같은 응답을 model instance 없이 queryset.values()의 dict로 만듭니다
+
+    필드별 변환 함수를 클래스 생성 시 한번만 만들고, row마다 변환 함수만 호출합니다
+    DB에서 응답과 같은 타입으로 조회되는 필드(int, str)는 변환하지 않습니다
+
+    model field가 아닌 필드(SerializerMethodField 등)는 value_fields로 values()의 lookup을 지정합니다
+    ex) value_fields = {"category_name": "category__name"}
+    """
+
+    representation_serializer_class = None
+    value_fields = {}
+
+    # DB의 값을 그대로 응답하는 필드
+    identity_field_classes = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.PrimaryKeyRelatedField,
+        serializers.SerializerMethodField,
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.converters = tuple(
+            (
+                name,
+                cls.value_fields.get(name, field.source),
+                None
+                if isinstance(field, cls.identity_field_classes)
+                else field.to_representation,
+            )
+            for name, field in cls.representation_serializer_class().fields.items()
+        )
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def get_values_queryset(cls, queryset, *extra_fields):
+        """
+        응답에 필요한 필드와 extra_fields(pagination의 ordering 등)만 조회합니다
+        """
+        return queryset.values(*(key for _, key, _ in cls.converters), *extra_fields)
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            name: row[key] if convert is None or row[key] is None else convert(row[key])
+            for name, key, convert in self.converters
+        }
+
+    @property
+    def data(self) -> list:
+        to_representation = self.to_representation
+        return [to_representation(row) for row in self.rows]
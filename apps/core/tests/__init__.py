@@ -1,10 +1,13 @@
 import os
 from typing import Optional
 
+from core.authentication import _active_users
+from django.core.cache import caches
 from django.db import connection, reset_queries
 from django.test import TestCase, override_settings
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from schema import Schema
+from stores.owners import _owners
 from users.models import User
 
 
@@ -23,9 +26,38 @@ def assert_query_count(count):
     return decorator
 
 
-class BaseTestCase(TestCase):
+class NPlusOneTestMixin:
+    """
+    테스트의 모든 요청에서 N+1 쿼리가 감지되면 NPlusOneError가 발생합니다 (core.nplusone)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        nplusone = override_settings(NPLUSONE_ACTION="raise")
+        nplusone.enable()
+        cls.addClassCleanup(nplusone.disable)
+        super().setUpClass()
+
+
+class BaseTestCase(NPlusOneTestMixin, TestCase):
     user_password = "password!2"
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        setUpTestData에서 생성한 매장은 signal로 owner 캐시에 저장되며, 클래스의 테스트 동안 유지합니다
+        """
+        _owners.clear()
+        super().setUpClass()
+
+    def setUp(self):
+        """
+        테스트마다 DB가 rollback되어 id가 재사용되므로, 이전 테스트의 캐시를 비웁니다
+        """
+        for cache in caches.all():
+            cache.clear()
+        _active_users.clear()
+
     def generic_test(
         self,
         path: str,
@@ -34,6 +66,7 @@ class BaseTestCase(TestCase):
         expected_schema: Schema,
         expected_query_count: Optional[int] = None,
         auth_user: Optional[User] = None,
+        content_type: str = "application/json",
         **data,
     ) -> dict:
         """
@@ -49,6 +82,8 @@ class BaseTestCase(TestCase):
             예상되는 쿼리 수, 값이 주어지고 같지 않을 시 assert
         - auth_user
             인증 유저, 주어지면 access token을 header에 추가
+        - content_type
+            request body의 content type (파일 업로드는 MULTIPART_CONTENT)
 
 
         return: response json data
@@ -56,15 +91,17 @@ class BaseTestCase(TestCase):
 
         request = getattr(self.client, method)
 
-        if expected_query_count:
+        if expected_query_count is not None:
             request = assert_query_count(expected_query_count)(request)
 
-        res = request(
-            path,
-            data=data,
-            content_type="application/json",
-            **self.get_auth_header(auth_user),
-        )
+        # 테스트는 transaction 안에서 실행되므로, commit 후 실행될 callback을 직접 실행합니다
+        with self.captureOnCommitCallbacks(execute=True):
+            res = request(
+                path,
+                data=data,
+                content_type=content_type,
+                **self.get_auth_header(auth_user),
+            )
         self.assertEqual(expected_status_code, res.status_code)
 
         if expected_status_code == 204:
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from core.authentication import StatelessJWTAuthentication, _active_users
+from core.tests import BaseTestCase
+from django.conf import settings
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+
+class StatelessJWTAuthenticationTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+
+    def authenticate(self, header):
+        request = APIRequestFactory().get("/", **header)
+        user, _ = StatelessJWTAuthentication().authenticate(request)
+        return user
+
+    def deactivate(self):
+        self.user.is_active = False
+        self.user.save()
+
+    def test_no_query(self):
+        """
+        발급 후 ttl이 지나지 않은 token은 유저를 조회하지 않음
+        """
+        header = self.get_auth_header(self.user)
+        with self.assertNumQueries(0):
+            user = self.authenticate(header)
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(self.user.id, user.id)
+        self.assertTrue(user.is_authenticated)
+
+    def test_revalidate_after_ttl(self):
+        """
+        ttl이 지난 token은 is_active를 확인하고, 결과를 ttl동안 유지
+        """
+        issued_at = timezone.now()
+        with freeze_time(issued_at):
+            header = self.get_auth_header(self.user)
+
+        ttl = timedelta(seconds=settings.JWT_USER_ACTIVE_TTL + 1)
+        with freeze_time(issued_at + ttl):
+            with self.assertNumQueries(1):
+                self.authenticate(header)
+            with self.assertNumQueries(0):
+                self.authenticate(header)
+
+    def test_inactive_user(self):
+        issued_at = timezone.now()
+        with freeze_time(issued_at):
+            header = self.get_auth_header(self.user)
+        self.deactivate()
+
+        # ttl 전에는 확인하지 않음
+        self.authenticate(header)
+
+        ttl = timedelta(seconds=settings.JWT_USER_ACTIVE_TTL + 1)
+        with freeze_time(issued_at + ttl):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(header)
+
+    def test_deleted_user(self):
+        issued_at = timezone.now()
+        with freeze_time(issued_at):
+            header = self.get_auth_header(self.user)
+        user_id = self.user.id
+        self.user.delete()
+
+        ttl = timedelta(seconds=settings.JWT_USER_ACTIVE_TTL + 1)
+        with freeze_time(issued_at + ttl):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(header)
+        self.assertFalse(_active_users.get(user_id, True))
@@ -0,0 +1,68 @@
+from core.benchmark import (
+    Request,
+    Scenario,
+    UnexpectedStatus,
+    compare,
+    percentile,
+    run_scenario,
+)
+from core.tests import BaseTestCase
+from django.test import SimpleTestCase
+from django.urls import reverse
+from stores.models import Store
+
+
+class PercentileTestCase(SimpleTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, percentile(values, 50))
+        self.assertEqual(99, percentile(values, 99))
+        self.assertEqual(100, percentile(values, 100))
+        self.assertEqual(7, percentile([7], 99))
+
+
+class CompareTestCase(SimpleTestCase):
+    baseline = {"a": {"p50": 10.0, "p99": 20.0, "throughput": 100.0}}
+
+    def test_no_regression(self):
+        results = {
+            "a": {"p50": 12.0, "p99": 24.0, "throughput": 80.0},
+            "new": {"p50": 1000.0, "p99": 1000.0, "throughput": 1.0},
+        }
+        self.assertEqual([], compare(results, self.baseline, 0.25))
+
+    def test_regression(self):
+        results = {"a": {"p50": 13.0, "p99": 20.0, "throughput": 70.0}}
+        self.assertEqual(
+            ["a p50: 10.000ms -> 13.000ms", "a throughput: 100.0/s -> 70.0/s"],
+            compare(results, self.baseline, 0.25),
+        )
+
+
+class RunScenarioTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.path = reverse("stores:detail", args=[cls.store.id])
+
+    def test_run(self):
+        auth = self.get_auth_header(self.user)
+        scenario = Scenario("store.detail", lambda i: Request("get", self.path, **auth))
+        result = run_scenario(self.client, scenario, requests=5, warmup=1)
+
+        self.assertEqual(5, result["requests"])
+        self.assertLessEqual(result["p50"], result["p99"])
+        self.assertGreater(result["throughput"], 0)
+
+    def test_requests_limit(self):
+        auth = self.get_auth_header(self.user)
+        scenario = Scenario(
+            "store.detail", lambda i: Request("get", self.path, **auth), requests=2
+        )
+        self.assertEqual(2, run_scenario(self.client, scenario, 5, 1)["requests"])
+
+    def test_unexpected_status(self):
+        scenario = Scenario("store.detail", lambda i: Request("get", self.path))
+        with self.assertRaises(UnexpectedStatus):
+            run_scenario(self.client, scenario, requests=1, warmup=0)
@@ -0,0 +1,44 @@
+from core.caches import LRUCache
+from django.test import SimpleTestCase
+from freezegun import freeze_time
+
+
+class LRUCacheTestCase(SimpleTestCase):
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1)
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evict_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+
+    def test_delete_clear(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("a")
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual((0, 0), (cache.hits, cache.misses))
+
+    def test_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=10)
+        with freeze_time("2023-01-01 00:00:00") as frozen:
+            cache.set("a", 1)
+            frozen.tick(9)
+            self.assertEqual(1, cache.get("a"))
+            frozen.tick(1)
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(0, len(cache))
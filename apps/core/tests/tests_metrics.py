@@ -0,0 +1,103 @@
+from core.metrics import OTHER_METHOD, UNRESOLVED_VIEW
+from core.tests import BaseTestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from stores.models import Category, Store
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class PrometheusMetricsTestCase(BaseTestCase):
+    view = "CategoryListCreateAPIView"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        Category.objects.create(store=cls.store, name="커피")
+        cls.path = reverse("stores:list_category", args=[cls.store.id])
+
+    def get(self):
+        return self.client.get(self.path, **self.get_auth_header(self.user))
+
+    def test_url(self):
+        self.assertEqual("/metrics", reverse("metrics"))
+
+    def test_request(self):
+        """
+        view, 상태 코드별 요청 수, 응답 시간, 쿼리 수
+        두번째 요청은 응답 캐시에 적중하여 쿼리가 없음
+        """
+        labels = {"view": self.view, "method": "GET"}
+        requests = sample("http_requests_total", status="200", **labels)
+        unauthorized = sample("http_requests_total", status="401", **labels)
+        latency = sample("http_request_duration_seconds_count", **labels)
+        queries = sample("db_queries_total", view=self.view)
+
+        self.get()
+        self.get()
+        self.client.get(self.path)
+
+        self.assertEqual(
+            requests + 2, sample("http_requests_total", status="200", **labels)
+        )
+        self.assertEqual(
+            unauthorized + 1, sample("http_requests_total", status="401", **labels)
+        )
+        self.assertEqual(
+            latency + 3, sample("http_request_duration_seconds_count", **labels)
+        )
+        self.assertEqual(queries + 2, sample("db_queries_total", view=self.view))
+        self.assertEqual(0, sample("http_requests_in_progress"))
+
+    def test_unresolved(self):
+        requests = sample(
+            "http_requests_total", view=UNRESOLVED_VIEW, method="GET", status="404"
+        )
+        self.client.get("/not-found/")
+        self.assertEqual(
+            requests + 1,
+            sample(
+                "http_requests_total",
+                view=UNRESOLVED_VIEW,
+                method="GET",
+                status="404",
+            ),
+        )
+
+    def test_unknown_method(self):
+        """
+        표준이 아닌 method는 하나의 label로 모음
+        """
+        labels = {"view": self.view, "method": OTHER_METHOD, "status": "405"}
+        requests = sample("http_requests_total", **labels)
+        for method in ("FOO", "BAR"):
+            self.client.generic(method, self.path, **self.get_auth_header(self.user))
+        self.assertEqual(requests + 2, sample("http_requests_total", **labels))
+        self.assertEqual(
+            0, sample("http_requests_total", view=self.view, method="FOO", status="405")
+        )
+
+    def test_cache(self):
+        """
+        두번째 요청은 응답 캐시에 적중
+        """
+        hits = sample("cache_hits_total", cache="response")
+        misses = sample("cache_misses_total", cache="response")
+
+        self.get()
+        self.get()
+
+        self.assertEqual(hits + 1, sample("cache_hits_total", cache="response"))
+        self.assertEqual(misses + 1, sample("cache_misses_total", cache="response"))
+
+    def test_metrics(self):
+        self.get()
+        res = self.client.get(reverse("metrics"))
+        self.assertEqual(200, res.status_code)
+        self.assertIn(
+            'http_requests_total{method="GET",status="200",view="%s"}' % self.view,
+            res.content.decode(),
+        )
@@ -0,0 +1,99 @@
+from core.nplusone import NPlusOneError, NPlusOneMiddleware, fingerprint
+from core.tests import BaseTestCase
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from stores.models import Category, Product, Store
+
+
+class FingerprintTestCase(SimpleTestCase):
+    def test_in(self):
+        self.assertEqual(
+            fingerprint('SELECT "id" FROM "product" WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT "id" FROM "product" WHERE "id" IN (%s)'),
+        )
+
+    def test_values(self):
+        self.assertEqual(
+            'INSERT INTO "token" ("token") VALUES (%s), ...',
+            fingerprint('INSERT INTO "token" ("token") VALUES (%s), (%s), (%s)'),
+        )
+
+    def test_literals(self):
+        self.assertEqual(
+            'SELECT * FROM "product" WHERE "id" = ? AND "name" = ? LIMIT ?',
+            fingerprint(
+                'SELECT * FROM "product" WHERE "id" = 1 AND "name" = \'it\'\'s\'  LIMIT 21'
+            ),
+        )
+
+    def test_savepoint(self):
+        self.assertIsNone(fingerprint('SAVEPOINT "s1_x1"'))
+        self.assertIsNone(fingerprint('RELEASE SAVEPOINT "s1_x1"'))
+
+
+def category_names(request):
+    """
+    select_related 없이 상품마다 category를 조회
+    """
+    names = [product.category.name for product in Product.objects.all()]
+    return HttpResponse(",".join(names))
+
+
+def category_names_select_related(request):
+    products = Product.objects.select_related("category")
+    return HttpResponse(",".join(product.category.name for product in products))
+
+
+class NPlusOneMiddlewareTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        store = Store.objects.create(owner=cls.user, name="store")
+        for i in range(settings.NPLUSONE_THRESHOLD):
+            category = Category.objects.create(store=store, name="category%d" % i)
+            Product.objects.create(
+                store=store,
+                category=category,
+                price=1000,
+                cost=500,
+                name="product%d" % i,
+                chosung="",
+                jamo="",
+                description="",
+                barcode="",
+                sell_by_days=3,
+                size="small",
+            )
+
+    def request(self, view):
+        return NPlusOneMiddleware(view)(RequestFactory().get("/products/"))
+
+    def test_enabled_in_tests(self):
+        """
+        BaseTestCase의 모든 요청에 적용됨
+        """
+        self.assertEqual("raise", settings.NPLUSONE_ACTION)
+
+    def test_raise(self):
+        with self.assertRaises(NPlusOneError) as cm:
+            self.request(category_names)
+
+        message = str(cm.exception)
+        self.assertIn("N+1 queries in GET /products/", message)
+        self.assertIn(
+            "%d times at core/tests/tests_nplusone.py" % settings.NPLUSONE_THRESHOLD,
+            message,
+        )
+        self.assertIn('FROM "stores_category"', message)
+
+    @override_settings(NPLUSONE_ACTION="log")
+    def test_log(self):
+        with self.assertLogs("core.nplusone", "WARNING") as logs:
+            res = self.request(category_names)
+        self.assertEqual(200, res.status_code)
+        self.assertEqual("GET /products/", logs.records[0].view)
+
+    def test_select_related(self):
+        res = self.request(category_names_select_related)
+        self.assertEqual(200, res.status_code)
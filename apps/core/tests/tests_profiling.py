@@ -0,0 +1,131 @@
+import threading
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import sleep
+
+from core.profiling import ProfilingMiddleware, StackSampler
+from core.tests import BaseTestCase
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+from stores.models import Store
+
+
+def slow_view(request):
+    sleep(0.05)
+    return HttpResponse()
+
+
+class StackSamplerTestCase(SimpleTestCase):
+    def test_sample(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start(threading.get_ident())
+        slow_view(None)
+        stacks = sampler.stop(threading.get_ident())
+
+        self.assertGreater(sum(stacks.values()), 0)
+        self.assertTrue(
+            any(
+                stack.endswith(
+                    "tests_profiling.py:test_sample;tests_profiling.py:slow_view"
+                )
+                for stack in stacks
+            )
+        )
+
+
+class ProfilingMiddlewareTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.path = reverse("stores:list_category", args=[cls.store.id])
+
+    def setUp(self):
+        super().setUp()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = Path(directory.name)
+
+    def report(self, **options):
+        out = StringIO()
+        call_command("profile_report", dir=self.dir, stdout=out, **options)
+        return out.getvalue()
+
+    def test_not_used(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(slow_view)
+
+    def test_sampled(self):
+        """
+        sample된 요청은 view 이름, request id로 pstats 파일을 저장함
+        """
+        with self.settings(PROFILING_SAMPLE_RATE=1, PROFILING_DIR=self.dir):
+            self.client.get(
+                self.path, HTTP_X_REQUEST_ID="abc", **self.get_auth_header(self.user)
+            )
+
+        [path] = self.dir.glob("CategoryListCreateAPIView/*.prof")
+        self.assertTrue(path.name.endswith("-abc.prof"))
+        out = self.report(sort="tottime", top=5)
+        self.assertIn("# cProfile: 1 requests", out)
+
+    def test_invalid_request_id(self):
+        """
+        형식이 맞지 않는 request id는 파일 이름에 사용하지 않음
+        """
+        headers = self.get_auth_header(self.user)
+        with self.settings(PROFILING_SAMPLE_RATE=1, PROFILING_DIR=self.dir):
+            for request_id in ("../../abc", "a" * 65, "a b"):
+                res = self.client.get(
+                    self.path, HTTP_X_REQUEST_ID=request_id, **headers
+                )
+                self.assertEqual(200, res.status_code)
+
+        paths = list(self.dir.rglob("*.prof"))
+        self.assertEqual(3, len(paths))
+        for path in paths:
+            self.assertEqual(self.dir / "CategoryListCreateAPIView", path.parent)
+            self.assertRegex(path.name, r"^\d{14}-[0-9a-f]{12}\.prof$")
+
+    def test_save_error(self):
+        """
+        파일 저장에 실패해도 응답은 성공
+        """
+        path = self.dir / "file"
+        path.touch()
+        with self.settings(PROFILING_SAMPLE_RATE=1, PROFILING_DIR=path):
+            with self.assertLogs("core.profiling", "ERROR"):
+                res = self.client.get(self.path, **self.get_auth_header(self.user))
+        self.assertEqual(200, res.status_code)
+
+    def test_slow(self):
+        """
+        PROFILING_SLOW_SECONDS보다 오래 걸린 요청만 sampling한 stack을 저장함
+        """
+        request = RequestFactory().get("/")
+        with self.settings(
+            PROFILING_SLOW_SECONDS=0.03,
+            PROFILING_STACK_INTERVAL=0.001,
+            PROFILING_DIR=self.dir,
+        ):
+            ProfilingMiddleware(lambda request: HttpResponse())(request)
+            self.assertEqual([], list(self.dir.rglob("*.collapsed")))
+
+            ProfilingMiddleware(slow_view)(request)
+            self.assertEqual(1, len(list(self.dir.rglob("*.collapsed"))))
+
+        output = self.dir / "merged.collapsed"
+        out = self.report(collapsed_output=output)
+        self.assertIn("# slow requests: 1 requests", out)
+        self.assertIn("tests_profiling.py:slow_view", out)
+        self.assertIn("tests_profiling.py:slow_view", output.read_text())
+
+    def test_report_no_files(self):
+        with self.assertRaises(CommandError):
+            self.report()
+        with self.assertRaises(CommandError):
+            self.report(view="CategoryListCreateAPIView")
@@ -0,0 +1,43 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def assertSameAsJSONRenderer(self, data):
+        self.assertEqual(JSONRenderer().render(data), ORJSONRenderer().render(data))
+
+    def test_same_as_json_renderer(self):
+        self.assertSameAsJSONRenderer(
+            {
+                "name": "슈크림 라떼\u2028",
+                "errors": {"name": [ErrorDetail("중복", code="unique")]},
+                "lazy": gettext_lazy("lazy"),
+                "price": Decimal("1.5"),
+                "created_at": datetime(2023, 1, 1, 1, 2, 3, 4, tzinfo=timezone.utc),
+                1: None,
+            }
+        )
+
+    def test_none(self):
+        self.assertEqual(b"", ORJSONRenderer().render(None))
+
+
+class ORJSONParserTestCase(SimpleTestCase):
+    def parse(self, body: bytes):
+        return ORJSONParser().parse(io.BytesIO(body))
+
+    def test_parse(self):
+        self.assertEqual({"name": "슈크림"}, self.parse('{"name": "슈크림"}'.encode()))
+
+    def test_invalid(self):
+        for body in (b"{", b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(body)
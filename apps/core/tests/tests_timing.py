@@ -0,0 +1,75 @@
+from core.tests import BaseTestCase
+from core.timing import count_queries, format_server_timing
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from stores.models import Category, Store
+
+
+class FormatServerTimingTestCase(SimpleTestCase):
+    def test_format(self):
+        self.assertEqual(
+            'db;dur=1.2;desc="2 queries", auth;dur=0.3, total;dur=3.1',
+            format_server_timing({"queries": 2, "db": 1.2, "auth": 0.3, "total": 3.1}),
+        )
+
+
+class CountQueriesTestCase(TestCase):
+    def test_shared(self):
+        """
+        안쪽에서는 바깥의 counter를 함께 사용하여 execute_wrapper는 하나만 설치됨
+        """
+        wrappers = len(connection.execute_wrappers)
+        with count_queries() as outer:
+            Store.objects.exists()
+            with count_queries() as inner:
+                self.assertIs(outer, inner)
+                self.assertEqual(wrappers + 1, len(connection.execute_wrappers))
+                Store.objects.exists()
+        self.assertEqual(2, outer.queries)
+        self.assertEqual(wrappers, len(connection.execute_wrappers))
+
+
+class RequestTimingMiddlewareTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        Category.objects.create(store=cls.store, name="커피")
+        cls.path = reverse("stores:list_category", args=[cls.store.id])
+
+    def get(self):
+        return self.client.get(self.path, **self.get_auth_header(self.user))
+
+    def test_server_timing(self):
+        """
+        DEBUG 없이 쿼리 수를 기록함
+
+        queries 2개:
+            1. get etag (MAX(updated_at), COUNT)
+            2. get categories
+        """
+        with self.assertLogs("core.timing", "INFO") as logs:
+            res = self.get()
+
+        metrics = [metric.split(";")[0] for metric in res["Server-Timing"].split(", ")]
+        self.assertEqual(["db", "auth", "view", "render", "total"], metrics)
+        self.assertIn('desc="2 queries"', res["Server-Timing"])
+
+        [log] = logs.records
+        self.assertEqual(("GET", self.path, 200), (log.method, log.path, log.status))
+        self.assertEqual(2, log.timing["queries"])
+        self.assertLessEqual(log.timing["db"], log.timing["total"])
+
+    @override_settings(REQUEST_TIMING_HEADER=False)
+    def test_no_header(self):
+        with self.assertLogs("core.timing", "INFO"):
+            res = self.get()
+        self.assertFalse(res.has_header("Server-Timing"))
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        with self.assertNoLogs("core.timing", "INFO"):
+            res = self.get()
+        self.assertEqual(200, res.status_code)
+        self.assertFalse(res.has_header("Server-Timing"))
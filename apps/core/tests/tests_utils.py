@@ -0,0 +1,97 @@
+from core.hangul_reference import jamo_convert_to_chosung, jamo_convert_to_jamo
+from core.utils import (
+    convert_to_chosung,
+    convert_to_chosung_batch,
+    convert_to_jamo,
+    convert_to_jamo_batch,
+)
+from django.test import SimpleTestCase
+
+
+def bmp_chars():
+    """
+    jamo 패키지가 처리하지 못하는(InvalidJamoError) 확장 자모를 제외한 BMP 문자
+    """
+    extended_jamo = [range(0xA960, 0xA980), range(0xD7B0, 0xD800)]
+    for code in range(0x10000):
+        if not any(code in r for r in extended_jamo):
+            yield chr(code)
+
+
+class ConvertToChosungTestCase(SimpleTestCase):
+    def test_convert(self):
+        chosungs = {
+            "슈크림 라떼": "ㅅㅋㄹ ㄹㄸ",
+            "슈크림 라떼2": "ㅅㅋㄹ ㄹㄸ2",
+            "Iced 아메리카노": "Iced ㅇㅁㄹㅋㄴ",
+            "": "",
+        }
+        for s, chosung in chosungs.items():
+            self.assertEqual(chosung, convert_to_chosung(s))
+
+    def test_same_as_jamo_package(self):
+        """
+        모든 문자에 대해 이전 구현과 결과가 같아야함
+        """
+        for c in bmp_chars():
+            self.assertEqual(jamo_convert_to_chosung(c), convert_to_chosung(c))
+
+    def test_extended_jamo(self):
+        """
+        확장 자모는 그대로 유지 (이전 구현은 InvalidJamoError)
+        """
+        self.assertEqual("\ua960\ud7b0", convert_to_chosung("\ua960\ud7b0"))
+
+    def test_batch(self):
+        names = ["슈크림 라떼", "", "Iced 아메리카노", "줄바꿈\n이름"]
+        self.assertEqual(
+            [convert_to_chosung(name) for name in names],
+            convert_to_chosung_batch(names),
+        )
+        self.assertEqual([], convert_to_chosung_batch([]))
+
+
+class ConvertToJamoTestCase(SimpleTestCase):
+    def test_convert(self):
+        jamos = {
+            "슈크림 라떼": "ㅅㅠㅋㅡㄹㅣㅁ ㄹㅏㄸㅔ",
+            "Iced 라떼2": "Iced ㄹㅏㄸㅔ2",
+            "": "",
+        }
+        for s, jamo in jamos.items():
+            self.assertEqual(jamo, convert_to_jamo(s))
+
+    def test_compound(self):
+        """
+        겹자음, 이중모음은 입력 순서대로 분리
+        """
+        jamos = {
+            "닭": "ㄷㅏㄹㄱ",
+            "뷁": "ㅂㅜㅔㄹㄱ",
+            "의자": "ㅇㅡㅣㅈㅏ",
+            "ㅘ": "ㅗㅏ",
+        }
+        for s, jamo in jamos.items():
+            self.assertEqual(jamo, convert_to_jamo(s))
+
+    def test_partial_syllable(self):
+        """
+        입력 중인 글자는 완성된 글자의 자모에 포함되어야함
+        """
+        self.assertIn(convert_to_jamo("슈ㅋ"), convert_to_jamo("슈크림"))
+        self.assertIn(convert_to_jamo("슠"), convert_to_jamo("슈크림"))
+        self.assertIn(convert_to_jamo("라ㄸ"), convert_to_jamo("슈크림 라떼"))
+
+    def test_same_as_jamo_package(self):
+        """
+        모든 문자에 대해 이전 구현과 결과가 같아야함
+        """
+        for c in bmp_chars():
+            self.assertEqual(jamo_convert_to_jamo(c), convert_to_jamo(c))
+
+    def test_batch(self):
+        names = ["슈크림 라떼", "", "닭갈비", "줄바꿈\n이름"]
+        self.assertEqual(
+            [convert_to_jamo(name) for name in names],
+            convert_to_jamo_batch(names),
+        )
@@ -0,0 +1,55 @@
+import json
+
+from core.renderers import ORJSONRenderer
+from core.views import WrappedResponseDataMixin
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+
+class DataView(WrappedResponseDataMixin, APIView):
+    authentication_classes = []
+    permission_classes = []
+    data = {"results": [{"id": 1, "name": "슈크림 라떼"}], "next": None}
+
+    def get(self, request):
+        return Response(self.data, status=int(request.GET.get("status", 200)))
+
+
+class WrappedResponseDataMixinTestCase(SimpleTestCase):
+    factory = APIRequestFactory()
+
+    def get(self, view_class=DataView, **params):
+        response = view_class.as_view()(self.factory.get("/", params))
+        return response.render()
+
+    def test_prerendered_envelope(self):
+        """
+        미리 인코딩한 envelope를 사용해도 wrapping 후 렌더링한 결과와 같아야 함
+        """
+        for code in (200, 201):
+            response = self.get(status=code)
+            self.assertEqual("application/json", response["Content-Type"])
+            self.assertEqual(
+                ORJSONRenderer().render(
+                    {"meta": {"code": code, "message": "ok"}, "data": DataView.data}
+                ),
+                response.content,
+            )
+
+    def test_disabled(self):
+        class NotPrerenderedView(DataView):
+            prerender_envelope = False
+
+        self.assertEqual(
+            self.get().content, self.get(view_class=NotPrerenderedView).content
+        )
+
+    def test_client_error(self):
+        """
+        에러 응답은 이전과 같이 data를 문자열로 message에 담음
+        """
+        res = json.loads(self.get(status=400).content)
+        self.assertEqual(None, res["data"])
+        self.assertEqual(DataView.data, json.loads(res["meta"]["message"]))
@@ -0,0 +1,200 @@
+"""
+요청별 성능 계측
+
+DEBUG 없이 요청마다 쿼리 수, DB 시간과 단계별 시간을 기록하여
+Server-Timing header와 로그(core.timing logger)로 남깁니다
+
+    db: 모든 쿼리의 실행 시간 (connection.execute_wrapper), desc는 쿼리 수
+    auth: 인증, permission 확인 (view의 initial)
+    view: handler에서 DB를 제외한 시간 (serializer 검증, 변환)
+    render: 응답 렌더링
+    total: middleware 안에서의 전체 시간
+
+REQUEST_TIMING_SAMPLE_RATE 비율의 요청만 계측하며, 계측하지 않는 요청은 비용이 없습니다
+쿼리는 요청마다 하나의 execute_wrapper(QueryCounter)로 세며, core.metrics와 함께 사용합니다
+StreamingHttpResponse는 middleware를 지난 후 쿼리가 실행되므로 포함되지 않습니다
+"""
+
+import logging
+import random
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_timing", default=None)
+_query_counter = ContextVar("query_counter", default=None)
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper로 쿼리 수와 실행 시간을 셉니다
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += perf_counter() - started_at
+            self.queries += 1
+
+
+@contextmanager
+def count_queries():
+    """
+    바깥(먼저 실행된 middleware)에서 이미 세고 있으면 그 counter를 반환합니다
+    counter는 공유되므로 사용하는 쪽에서 시작 시점의 값을 빼야 합니다
+    """
+    counter = _query_counter.get()
+    if counter is not None:
+        yield counter
+        return
+
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+class RequestTiming:
+    def __init__(self, counter: QueryCounter):
+        self.started_at = perf_counter()
+        self.counter = counter
+        self.started_queries = counter.queries
+        self.started_db = counter.seconds
+        self.spans = {}
+
+    @property
+    def queries(self) -> int:
+        return self.counter.queries - self.started_queries
+
+    @property
+    def db(self) -> float:
+        return self.counter.seconds - self.started_db
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        """
+        시간은 ms 입니다
+        """
+        total = perf_counter() - self.started_at
+        return {
+            "queries": self.queries,
+            "db": round(self.db * 1000, 2),
+            **{name: round(seconds * 1000, 2) for name, seconds in self.spans.items()},
+            "total": round(total * 1000, 2),
+        }
+
+
+def get_current_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def mark() -> Optional[Tuple[float, float]]:
+    """
+    계측 중인 요청이면 현재 시간과 누적 DB 시간을 반환합니다
+    record와 함께 메소드 경계를 넘는 구간을 기록할 때 사용합니다
+    """
+    timing = _current.get()
+    if timing is None:
+        return None
+    return perf_counter(), timing.db
+
+
+def record(name: str, started: Optional[Tuple[float, float]], exclude_db=False):
+    timing = _current.get()
+    if timing is None or started is None:
+        return
+    started_at, db = started
+    seconds = perf_counter() - started_at
+    if exclude_db:
+        seconds -= timing.db - db
+    timing.add(name, seconds)
+
+
+@contextmanager
+def span(name: str, exclude_db=False):
+    started = mark()
+    try:
+        yield
+    finally:
+        record(name, started, exclude_db)
+
+
+def format_server_timing(timing: dict) -> str:
+    """
+    ex) db;dur=1.2;desc="2 queries", auth;dur=0.3, view;dur=0.8, total;dur=3.1
+    """
+    metrics = ['db;dur=%s;desc="%d queries"' % (timing["db"], timing["queries"])]
+    metrics += [
+        "%s;dur=%s" % (name, value)
+        for name, value in timing.items()
+        if name not in ("db", "queries")
+    ]
+    return ", ".join(metrics)
+
+
+class RequestTimingMiddleware:
+    """
+    MIDDLEWARE의 처음에 두어야 다른 middleware의 쿼리까지 포함합니다
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        with count_queries() as counter:
+            timing = RequestTiming(counter)
+            token = _current.set(timing)
+            try:
+                response = self.get_response(request)
+            finally:
+                _current.reset(token)
+
+        result = timing.as_dict()
+        if settings.REQUEST_TIMING_HEADER:
+            response["Server-Timing"] = format_server_timing(result)
+        logger.info(
+            "%s %s %d %s",
+            request.method,
+            request.path,
+            response.status_code,
+            " ".join("%s=%s" % item for item in result.items()),
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "timing": result,
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        drf Response는 middleware의 process_template_response 이후에 렌더링 됩니다
+        """
+        started = mark()
+        if started is not None:
+            response.add_post_render_callback(lambda _: record("render", started))
+        return response
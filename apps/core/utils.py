@@ -1,20 +1,112 @@
-from jamo import hangul_to_jamo, jamo_to_hcj
+from typing import List
+
+from jamo import jamo_to_hcj
+
+"""
+한글 음절(U+AC00 ~ U+D7A3)은 초성, 중성, 종성 순서로 배치되어 있습니다
+    code = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+"""
+HANGUL_FIRST = 0xAC00
+HANGUL_LAST = 0xD7A3
+JUNGSUNG_COUNT = 21
+JONGSUNG_COUNT = 28
+CHOSUNG_PERIOD = JUNGSUNG_COUNT * JONGSUNG_COUNT
+
+CHOSUNGS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNGS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNGS = ("",) + tuple("ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+
+"""
+겹자음, 이중모음을 키보드로 입력하는 순서대로 분리하기 위한 테이블
+"""
+COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+}
+
+
+def _split_compound(s: str):
+    return "".join(COMPOUND_JAMO.get(c, c) for c in s)
+
+
+def _build_tables():
+    """
+    str.translate에 사용할 code point -> 문자열 테이블
+    모듈 로드시 한번만 만듭니다
+
+    조합형 자모(U+11xx)는 호환 자모(U+31xx)로 바꿉니다
+    """
+    chosung_table = {}
+    jamo_table = {}
+
+    for code in range(0x1100, 0x1200):
+        hcj = "".join(jamo_to_hcj(chr(code)))
+        if hcj != chr(code):
+            chosung_table[code] = hcj
+            jamo_table[code] = _split_compound(hcj)
+
+    for compound, jamo in COMPOUND_JAMO.items():
+        jamo_table[ord(compound)] = jamo
+
+    for code in range(HANGUL_FIRST, HANGUL_LAST + 1):
+        index = code - HANGUL_FIRST
+        chosung = CHOSUNGS[index // CHOSUNG_PERIOD]
+        jungsung = JUNGSUNGS[index % CHOSUNG_PERIOD // JONGSUNG_COUNT]
+        jongsung = JONGSUNGS[index % JONGSUNG_COUNT]
+
+        chosung_table[code] = chosung
+        jamo_table[code] = chosung + _split_compound(jungsung + jongsung)
+
+    return chosung_table, jamo_table
+
+
+CHOSUNG_TABLE, JAMO_TABLE = _build_tables()
 
 
 def convert_to_chosung(s: str):
-    result = ""
-    for c in s:
-        """
-        초성, 중성, 종성으로 분리
-        """
-        jamo = hangul_to_jamo(c)
-
-        """
-        U+11xx -> U+3xxx
-        """
-        hcj = jamo_to_hcj(jamo)
-
-        chosung = next(hcj)
-        result += chosung
-
-    return result
+    """
+    ex) "슈크림 라떼" -> "ㅅㅋㄹ ㄹㄸ"
+    """
+    return s.translate(CHOSUNG_TABLE)
+
+
+def convert_to_chosung_batch(strings: List[str]) -> List[str]:
+    """
+    bulk 생성시 여러 이름을 한번에 변환합니다
+    """
+    table = CHOSUNG_TABLE
+    return [s.translate(table) for s in strings]
+
+
+def convert_to_jamo(s: str):
+    """
+    s를 입력 순서대로의 자모로 분리합니다
+    ex)
+        "닭" -> "ㄷㅏㄹㄱ"
+        "슠" -> "ㅅㅠㅋ"
+    """
+    return s.translate(JAMO_TABLE)
+
+
+def convert_to_jamo_batch(strings: List[str]) -> List[str]:
+    """
+    bulk 생성시 여러 이름을 한번에 변환합니다
+    """
+    table = JAMO_TABLE
+    return [s.translate(table) for s in strings]
@@ -1,8 +1,33 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from core.renderers import ORJSONRenderer, dumps
+from core.timing import mark, record, span
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import md5
+from django.utils.http import http_date
 from rest_framework import status
-from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class TimedViewMixin:
+    """
+    계측 중인 요청(core.timing)의 auth, view 시간을 기록합니다
+    view는 initial 이후부터 finalize_response까지에서 DB 시간을 뺀 시간 입니다
+    """
 
+    def initial(self, request, *args, **kwargs):
+        with span("auth"):
+            super().initial(request, *args, **kwargs)
+        self._view_started = mark()
 
-class WrappedResponseDataMixin:
+    def finalize_response(self, request, response, *args, **kwargs):
+        record("view", getattr(self, "_view_started", None), exclude_db=True)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class WrappedResponseDataMixin(TimedViewMixin):
     """
     response data를 아래와 같은 포맷으로 wrapping 합니다
     {
@@ -12,13 +37,22 @@ class WrappedResponseDataMixin:
         },
         "data": data,
     }
+
+    prerender_envelope가 True이면 성공 응답(204 제외)은 data만 렌더링하여
+    미리 인코딩한 envelope에 끼워 넣습니다 (ORJSONRenderer가 선택된 경우)
+    이때 response.data는 wrapping 되지 않은 data 입니다
+
+    모든 view가 사용하므로 요청 계측(TimedViewMixin)도 함께 적용합니다
     """
 
+    prerender_envelope = True
+
     def get_response_message(self, code, data):
         if status.is_success(code):
             return "ok"
         if status.is_client_error(code):
-            return JSONRenderer().render(data)
+            # bytes로 두면 응답을 렌더링할 때 encoder의 default에서 다시 decode 되므로 str로 반환합니다
+            return dumps(data).decode()
         if status.is_server_error(code):
             return "server error"
 
@@ -42,6 +76,110 @@ class WrappedResponseDataMixin:
             "data": self.get_response_data(code, data),
         }
 
+    def can_prerender(self, response) -> bool:
+        code = response.status_code
+        return (
+            self.prerender_envelope
+            and status.is_success(code)
+            and code != status.HTTP_204_NO_CONTENT
+            and response.data is not None
+            and type(response.accepted_renderer) is ORJSONRenderer
+        )
+
+    def prerender(self, response):
+        """
+        response를 렌더링된 상태로 만들어 renderer를 거치지 않도록 합니다
+        """
+        renderer = response.accepted_renderer
+        data = renderer.render(
+            response.data, response.accepted_media_type, response.renderer_context
+        )
+        response["Content-Type"] = response.content_type or renderer.media_type
+        response.content = _envelope_prefix(response.status_code) + data + b"}"
+
     def finalize_response(self, request, response, *args, **kwargs):
-        response.data = self.wrap_data(response)
-        return super().finalize_response(request, response, *args, **kwargs)
+        """
+        StreamingHttpResponse 등 drf Response가 아닌 응답은 그대로 반환합니다
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response):
+            if self.can_prerender(response):
+                with span("render"):
+                    self.prerender(response)
+            else:
+                response.data = self.wrap_data(response)
+        return response
+
+
+@lru_cache
+def _envelope_prefix(code: int) -> bytes:
+    return b'{"meta":{"code":%d,"message":"ok"},"data":' % code
+
+
+class ConditionalGetMixin(ABC):
+    """
+    GET 응답에 ETag, Last-Modified를 추가합니다
+    요청의 If-None-Match, If-Modified-Since와 일치하면 serialize 하지 않고 304를 응답합니다
+    """
+
+    @abstractmethod
+    def get_validators(self):
+        """
+        (etag, last_modified)를 반환합니다, last_modified는 None일 수 있습니다
+        """
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """
+    object의 updated_at으로 validator를 만듭니다
+    get_validators에서 조회한 object를 retrieve에서 다시 조회하지 않습니다
+    """
+
+    def get_last_modified(self, instance):
+        return instance.updated_at
+
+    def get_validators(self):
+        self.object = self.get_object()
+        last_modified = self.get_last_modified(self.object)
+        return 'W/"%s-%s"' % (self.object.pk, last_modified.timestamp()), last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self.object).data)
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """
+    queryset의 MAX(updated_at)과 row 수로 ETag를 만듭니다 ((fk, updated_at) index 범위 조회)
+    row 수는 삭제를 확인하기 위함이며, 삭제는 MAX(updated_at)을 바꾸지 않으므로 Last-Modified는 응답하지 않습니다
+    페이지, 검색어마다 응답이 다르므로 query string도 ETag에 포함합니다
+
+    응답이 다른 model의 값을 포함하면 get_extra_validators()에서 추가합니다
+    join 하지 않도록 해당 model의 index로 따로 조회합니다
+    """
+
+    def get_extra_validators(self) -> dict:
+        return {}
+
+    def get_validators(self):
+        stats = (
+            self.get_queryset()
+            .order_by()
+            .aggregate(last_modified=Max("updated_at"), count=Count("pk"))
+        )
+        stats.update(self.get_extra_validators())
+        value = "%s|%s" % (sorted(stats.items()), self.request.get_full_path())
+        return 'W/"%s"' % md5(value.encode(), usedforsecurity=False).hexdigest(), None
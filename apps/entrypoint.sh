@@ -1,5 +1,9 @@
 export DJANGO_SETTINGS_MODULE=config.settings.product
 
+# worker들의 metrics를 합치기 위한 디렉토리, 이전 실행의 값은 지웁니다
+export PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus
+rm -rf $PROMETHEUS_MULTIPROC_DIR && mkdir -p $PROMETHEUS_MULTIPROC_DIR
+
 python manage.py migrate && \
 echo yes | python manage.py collectstatic && \
 gunicorn --log-level=DEBUG --bind 0.0.0.0:8000 config.wsgi.product:application
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+gunicorn 실행 디렉토리(apps)의 설정 파일로 자동으로 적용됩니다
+"""
+
+import os
+
+
+def child_exit(server, worker):
+    """
+    종료된 worker의 metrics 파일을 정리합니다 (core.metrics)
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
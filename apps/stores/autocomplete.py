@@ -0,0 +1,85 @@
+from bisect import bisect_left
+from typing import List
+
+from core.caches import LRUCache
+from core.metrics import register_cache_stats
+from core.utils import convert_to_jamo
+from django.conf import settings
+from stores.models import Product
+from stores.versions import get_store_version
+
+
+def _keys(s: str):
+    """
+    s와 s의 각 단어로 시작하는 부분 문자열
+    ex) "ㅅㅋㄹ ㄹㄸ" -> "ㅅㅋㄹ ㄹㄸ", "ㄹㄸ"
+    """
+    s = s.lower()
+    keys = {s}
+    keys.update(s[i + 1 :] for i, c in enumerate(s) if c == " ")
+    return keys
+
+
+class PrefixIndex:
+    """
+    매장 상품의 jamo, chosung을 정렬된 배열로 가지는 prefix 색인
+    이진 탐색으로 prefix의 시작 위치를 찾아 O(log n + limit)으로 조회합니다
+
+    jamo는 상품 이름보다 2~3배 길기 때문에 노드마다 dict를 가지는 trie 대신
+    정렬된 배열을 사용하여 메모리를 줄였습니다
+    """
+
+    def __init__(self, products):
+        self.products = []
+        entries = []
+        for ref, (id, name, chosung, jamo) in enumerate(products):
+            self.products.append({"id": id, "name": name})
+            entries.extend((key, ref) for key in _keys(jamo) | _keys(chosung))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.refs = [ref for _, ref in entries]
+
+    def _lookup(self, prefix: str):
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix):
+            yield self.refs[i]
+            i += 1
+
+    def suggest(self, search: str, limit: int) -> List[dict]:
+        """
+        자모로 분리한 검색어와 jamo를, 검색어 그대로 chosung과 비교합니다
+        """
+        if not search:
+            return []
+
+        refs = {}
+        for prefix in (convert_to_jamo(search).lower(), search.lower()):
+            for ref in self._lookup(prefix):
+                refs.setdefault(ref)
+                if len(refs) >= limit:
+                    return [self.products[ref] for ref in refs]
+        return [self.products[ref] for ref in refs]
+
+
+"""
+worker마다 최근 사용된 매장의 색인만 유지합니다
+"""
+_indexes = LRUCache(maxsize=settings.AUTOCOMPLETE_CACHE_SIZE)
+register_cache_stats("autocomplete_index", _indexes.get_stats)
+
+
+def get_prefix_index(store_id: int) -> PrefixIndex:
+    """
+    매장 버전이 바뀌었으면 색인을 다시 만듭니다
+    """
+    version = get_store_version(store_id)
+    cached = _indexes.get(store_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    products = Product.objects.filter(store_id=store_id).values_list(
+        "id", "name", "chosung", "jamo"
+    )
+    index = PrefixIndex(products)
+    _indexes.set(store_id, (version, index))
+    return index
@@ -0,0 +1,71 @@
+"""
+바코드로 상품 조회
+
+POS에서 가장 자주 호출되므로 worker 메모리에 매장별 바코드 -> 상품(응답 dict) 캐시를 둡니다
+매장 버전이 바뀌면(상품 변경) 매장의 캐시 전체를 버립니다
+없는 바코드도 빈 목록으로 캐시합니다
+
+바코드는 매장 내에서 unique하지 않으므로 바코드마다 상품 목록을 반환합니다
+"""
+
+from typing import Dict, Iterable, List
+
+from core.caches import LRUCache
+from core.metrics import register_cache_stats
+from django.conf import settings
+from stores.models import Product
+from stores.serializers import ProductValuesSerializer
+from stores.versions import get_store_version
+
+"""
+store id -> (version, LRUCache(barcode -> products))
+"""
+_stores = LRUCache(maxsize=settings.BARCODE_CACHE_STORE_SIZE)
+register_cache_stats("barcode_store", _stores.get_stats)
+
+
+def _get_store_cache(store_id: int) -> LRUCache:
+    """
+    매장 버전은 상품을 조회하기 전에 가져와야 합니다
+    """
+    version = get_store_version(store_id)
+    cached = _stores.get(store_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    barcodes = LRUCache(maxsize=settings.BARCODE_CACHE_SIZE)
+    _stores.set(store_id, (version, barcodes))
+    return barcodes
+
+
+def find_products_by_barcodes(
+    store_id: int, barcodes: Iterable[str]
+) -> Dict[str, List[dict]]:
+    """
+    캐시에 없는 바코드들은 (store, barcode) index로 한번에 조회합니다
+    """
+    cache = _get_store_cache(store_id)
+    found = {}
+    missing = []
+    for barcode in barcodes:
+        products = cache.get(barcode)
+        if products is None:
+            missing.append(barcode)
+        else:
+            found[barcode] = products
+
+    if missing:
+        fetched = {barcode: [] for barcode in missing}
+        rows = ProductValuesSerializer.get_values_queryset(
+            Product.objects.filter(store_id=store_id, barcode__in=missing)
+        ).order_by("id")
+        for product in ProductValuesSerializer(rows).data:
+            fetched[product["barcode"]].append(product)
+        for barcode, products in fetched.items():
+            cache.set(barcode, products)
+        found.update(fetched)
+    return found
+
+
+def find_products_by_barcode(store_id: int, barcode: str) -> List[dict]:
+    return find_products_by_barcodes(store_id, [barcode])[barcode]
@@ -0,0 +1,232 @@
+"""
+상품 batch 변경
+
+여러 상품의 생성, 수정, 삭제를 한번에 검증하고 하나의 transaction으로 적용합니다
+대상 상품, 카테고리, 이름 중복은 operation 수와 관계없이 한번씩만 조회합니다
+하나라도 실패하면 아무것도 적용하지 않고 operation별 에러를 응답합니다
+
+적용 순서는 삭제, 수정, 생성 입니다
+"""
+
+from typing import List
+
+from core.utils import convert_to_chosung_batch, convert_to_jamo_batch
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from stores.models import Category, Product
+from stores.search import bulk_create_products, reindex_products, unindex_products
+from stores.serializers import (
+    ProductBatchUpdateRowSerializer,
+    ProductImportRowSerializer,
+    ProductSerializer,
+)
+from stores.sync import log_deletions
+from stores.versions import bump_store_version
+
+
+def _error(message: str) -> dict:
+    return {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+
+class ProductBatch:
+    def __init__(self, store_id: int, operations: List[dict]):
+        self.store_id = store_id
+        self.operations = operations
+        self.errors = [{} for _ in operations]
+
+        self.create_serializer = ProductImportRowSerializer()
+        self.update_serializer = ProductBatchUpdateRowSerializer(partial=True)
+
+    def run(self) -> List[dict]:
+        """
+        검증에 실패하면 ValidationError({"operations": [operation별 에러]})
+        """
+        self.validate()
+        if any(self.errors):
+            raise serializers.ValidationError({"operations": self.errors})
+        try:
+            return self.apply()
+        except IntegrityError:
+            # db collation에서만 같은 이름 (ex. 대소문자)
+            raise serializers.ValidationError(_error("이미 존재하는 이름입니다"))
+
+    def validate(self):
+        ids = {op["id"] for op in self.operations if "id" in op}
+        self.products = {
+            product.id: product
+            for product in Product.objects.filter(
+                store_id=self.store_id, id__in=ids
+            ).select_related("category")
+        }
+
+        seen_ids = set()
+        for i, op in enumerate(self.operations):
+            if op["op"] == "create":
+                continue
+            if op["id"] not in self.products:
+                self.errors[i] = {"id": ["존재하지 않는 상품입니다"]}
+            elif op["id"] in seen_ids:
+                self.errors[i] = _error("같은 상품을 여러번 변경할 수 없습니다")
+            seen_ids.add(op["id"])
+
+        for i, op in enumerate(self.operations):
+            if self.errors[i] or op["op"] == "delete":
+                continue
+            serializer = (
+                self.create_serializer
+                if op["op"] == "create"
+                else self.update_serializer
+            )
+            try:
+                op["data"] = serializer.run_validation(op["data"])
+            except serializers.ValidationError as e:
+                self.errors[i] = {"data": e.detail}
+
+        self.validate_categories()
+        self.validate_names()
+
+    def _valid_data(self):
+        for i, op in enumerate(self.operations):
+            if not self.errors[i] and op["op"] != "delete":
+                yield i, op["data"]
+
+    def validate_categories(self):
+        category_ids = {
+            data["category"] for _, data in self._valid_data() if "category" in data
+        }
+        self.categories = {
+            category.id: category
+            for category in Category.objects.filter(
+                store_id=self.store_id, id__in=category_ids
+            )
+        }
+        for i, data in list(self._valid_data()):
+            if "category" in data and data["category"] not in self.categories:
+                self.errors[i] = {"data": {"category": ["존재하지 않는 카테고리입니다"]}}
+
+    def validate_names(self):
+        """
+        batch 안에서 같은 이름이 되거나,
+        삭제되지 않는 다른 상품(batch에서 이름이 바뀌는 상품 포함)과 이름이 같으면 에러
+
+        앞의 operation에서 이름을 바꾼 상품의 이전 이름은 뒤의 생성에서 사용할 수 있습니다
+        (생성은 수정 후에 적용, 수정은 하나의 UPDATE 문이라 row 순서를 보장할 수 없음)
+        """
+        names = {data["name"] for _, data in self._valid_data() if "name" in data}
+        deleted_ids = {op["id"] for op in self.operations if op["op"] == "delete"}
+        taken = {
+            name: id
+            for id, name in Product.objects.filter(
+                store_id=self.store_id, name__in=names
+            ).values_list("id", "name")
+            if id not in deleted_ids
+        }
+
+        freed = set()
+        for i, data in list(self._valid_data()):
+            name = data.get("name")
+            if name is None:
+                continue
+            # 생성할 상품은 id가 없으므로 operation 순서로 구분합니다
+            op = self.operations[i]
+            owner = op["id"] if op["op"] == "update" else ("create", i)
+            if taken.get(name, owner) != owner and not (
+                op["op"] == "create" and name in freed
+            ):
+                self.errors[i] = {"data": {"name": ["이미 존재하는 이름입니다"]}}
+                continue
+            taken[name] = owner
+            freed.discard(name)
+            if op["op"] == "update" and self.products[op["id"]].name != name:
+                freed.add(self.products[op["id"]].name)
+
+    @transaction.atomic
+    def apply(self) -> List[dict]:
+        deleted = [op["id"] for op in self.operations if op["op"] == "delete"]
+        if deleted:
+            log_deletions(self.store_id, product=deleted)
+            unindex_products(self.store_id, product_id__in=deleted)
+            Product.objects.filter(id__in=deleted).delete()
+
+        updated = self.apply_updates()
+        created = self.apply_creates()
+        bump_store_version(self.store_id)
+
+        results = []
+        created = iter(created)
+        for op in self.operations:
+            if op["op"] == "delete":
+                results.append({"op": "delete", "id": op["id"], "product": None})
+                continue
+            product = updated[op["id"]] if op["op"] == "update" else next(created)
+            results.append(
+                {
+                    "op": op["op"],
+                    "id": product.id,
+                    "product": ProductSerializer(product).data,
+                }
+            )
+        return results
+
+    def apply_updates(self) -> dict:
+        """
+        bulk_update는 auto_now를 적용하지 않으므로 updated_at을 직접 설정합니다 (동기화에서 사용)
+        """
+        now = timezone.now()
+        products = {}
+        fields = {"updated_at"}
+        renamed = []
+        for op in self.operations:
+            if op["op"] != "update":
+                continue
+            product = self.products[op["id"]]
+            data = dict(op["data"])
+            if "category" in data:
+                product.category = self.categories[data.pop("category")]
+                fields.add("category")
+            if "name" in data and data["name"] != product.name:
+                renamed.append(product)
+                fields.update(("chosung", "jamo"))
+            for field, value in data.items():
+                setattr(product, field, value)
+            fields.update(data)
+            product.updated_at = now
+            products[product.id] = product
+
+        if not products:
+            return products
+
+        names = [product.name for product in renamed]
+        for product, chosung, jamo in zip(
+            renamed, convert_to_chosung_batch(names), convert_to_jamo_batch(names)
+        ):
+            product.chosung = chosung
+            product.jamo = jamo
+
+        Product.objects.bulk_update(products.values(), fields=sorted(fields))
+        if renamed:
+            reindex_products(renamed)
+        return products
+
+    def apply_creates(self) -> List[Product]:
+        products = []
+        for op in self.operations:
+            if op["op"] != "create":
+                continue
+            data = dict(op["data"])
+            category = self.categories[data.pop("category")]
+            products.append(Product(store_id=self.store_id, category=category, **data))
+
+        if not products:
+            return products
+
+        names = [product.name for product in products]
+        for product, chosung, jamo in zip(
+            products, convert_to_chosung_batch(names), convert_to_jamo_batch(names)
+        ):
+            product.chosung = chosung
+            product.jamo = jamo
+
+        return bulk_create_products(self.store_id, products)
@@ -0,0 +1,83 @@
+"""
+상품 export
+
+매장의 모든 상품을 chunk_size개씩 조회하여 한 줄씩 내보냅니다
+응답 크기와 상관없이 메모리에는 한 chunk만 유지합니다
+"""
+
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import F
+from stores.models import Product
+
+"""
+import 파일과 같은 column에 id, category_name을 더했습니다
+export한 csv를 그대로 import 할 수 있습니다
+"""
+EXPORT_FIELDS = (
+    "id",
+    "category",
+    "category_name",
+    "price",
+    "cost",
+    "name",
+    "description",
+    "barcode",
+    "sell_by_days",
+    "size",
+)
+
+
+def iter_products(store_id: int, chunk_size: int = None) -> Iterator[dict]:
+    """
+    id 기준 keyset으로 chunk를 조회합니다
+    mysql은 iterator()를 사용해도 결과 전체를 client 메모리에 읽으므로,
+    chunk마다 (store_id, id) index 범위를 조회하는 방식을 사용합니다
+
+    chunk마다 별개의 쿼리이므로 export 도중 변경된 상품은 반영되지 않을 수 있습니다
+    """
+    chunk_size = chunk_size or settings.PRODUCT_EXPORT_CHUNK_SIZE
+    fields = [field for field in EXPORT_FIELDS if field != "category_name"]
+    queryset = (
+        Product.objects.filter(store_id=store_id)
+        .order_by("id")
+        .values(*fields, category_name=F("category__name"))
+    )
+
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            break
+        last_id = chunk[-1]["id"]
+
+
+class _Echo:
+    """
+    csv.writer가 쓴 한 줄을 그대로 반환합니다
+    """
+
+    def write(self, value):
+        return value
+
+
+def to_csv(rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def to_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+RENDERERS = {
+    "csv": (to_csv, "text/csv; charset=utf-8"),
+    "ndjson": (to_ndjson, "application/x-ndjson; charset=utf-8"),
+}
@@ -0,0 +1,180 @@
+"""
+상품 bulk import
+
+업로드 파일을 한 줄씩 읽어 batch_size개씩 처리합니다
+batch마다 카테고리, 이름 중복을 한번의 쿼리로 확인하고 bulk_create 합니다
+
+batch마다 commit 하므로 csv를 끝까지 읽을 수 없으면(utf-8이 아니거나 잘못된 csv)
+그 위치의 row를 에러로 응답하고 이전 row들은 유지합니다
+"""
+
+import csv
+import json
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+
+from core.utils import convert_to_chosung_batch, convert_to_jamo_batch
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from stores.models import Category, Product
+from stores.search import bulk_create_products
+from stores.serializers import ProductImportRowSerializer
+from stores.versions import bump_store_version
+
+
+"""
+더 읽을 수 없는 위치의 csv row, 이후 row는 읽지 않습니다
+"""
+UNREADABLE = object()
+
+
+def _decode_lines(file) -> Iterator[str]:
+    """
+    줄 단위로 decode 하여 utf-8이 아닌 줄에서 UnicodeDecodeError가 발생합니다
+    """
+    for line in file:
+        yield line.decode("utf-8-sig")
+
+
+def parse_csv(file) -> Iterator[dict]:
+    """
+    첫 줄은 header 입니다
+    """
+    try:
+        yield from csv.DictReader(_decode_lines(file))
+    except (UnicodeDecodeError, csv.Error):
+        yield UNREADABLE
+
+
+def parse_ndjson(file) -> Iterator[dict]:
+    """
+    한 줄에 하나의 json object, 빈 줄은 무시합니다
+    json이나 utf-8이 아닌 줄은 None 입니다
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line.decode("utf-8-sig"))
+        except ValueError:
+            yield None
+
+
+PARSERS = {
+    "csv": parse_csv,
+    "ndjson": parse_ndjson,
+}
+
+
+def _error(message: str) -> dict:
+    return {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+
+
+class ProductImporter:
+    """
+    rows를 검증하여 유효한 row만 생성하고, 실패한 row의 번호와 에러를 모읍니다
+    row 번호는 데이터 기준 1부터 시작합니다 (csv header 제외)
+    """
+
+    def __init__(self, store_id: int, batch_size: int = None):
+        self.store_id = store_id
+        self.batch_size = batch_size or settings.PRODUCT_IMPORT_BATCH_SIZE
+        self.row_serializer = ProductImportRowSerializer()
+        self.names = set()
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows: Iterable[dict]) -> dict:
+        """
+        중간에 실패해도 commit된 batch가 보이도록 매장 버전을 올립니다
+        """
+        rows = enumerate(rows, start=1)
+        try:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self.import_batch(batch)
+        finally:
+            if self.created:
+                bump_store_version(self.store_id)
+        return {"created": self.created, "errors": self.errors}
+
+    def validate_row(self, row) -> dict:
+        """
+        serializer를 row마다 만들지 않고 하나를 재사용합니다
+        """
+        if row is UNREADABLE:
+            raise serializers.ValidationError(
+                _error("파일을 읽을 수 없습니다 (utf-8이 아니거나 잘못된 csv), 이후 row는 처리하지 않습니다")
+            )
+        if row is None:
+            raise serializers.ValidationError(_error("잘못된 형식입니다"))
+        return self.row_serializer.run_validation(row)
+
+    def get_existing_names(self, names) -> set:
+        return set(
+            Product.objects.filter(store_id=self.store_id, name__in=names).values_list(
+                "name", flat=True
+            )
+        )
+
+    def import_batch(self, batch: List[Tuple[int, dict]]):
+        valid = []
+        for row_no, row in batch:
+            try:
+                valid.append((row_no, self.validate_row(row)))
+            except serializers.ValidationError as e:
+                self.errors.append({"row": row_no, "errors": e.detail})
+
+        category_ids = set(
+            Category.objects.filter(
+                store_id=self.store_id, id__in={data["category"] for _, data in valid}
+            ).values_list("id", flat=True)
+        )
+        existing_names = self.get_existing_names({data["name"] for _, data in valid})
+
+        products = []
+        for row_no, data in valid:
+            errors = {}
+            if data["category"] not in category_ids:
+                errors["category"] = ["존재하지 않는 카테고리입니다"]
+            if data["name"] in existing_names or data["name"] in self.names:
+                errors["name"] = ["이미 존재하는 이름입니다"]
+            if errors:
+                self.errors.append({"row": row_no, "errors": errors})
+                continue
+
+            self.names.add(data["name"])
+            data["category_id"] = data.pop("category")
+            products.append((row_no, Product(store_id=self.store_id, **data)))
+
+        if not products:
+            return
+
+        names = [product.name for _, product in products]
+        chosungs = convert_to_chosung_batch(names)
+        jamos = convert_to_jamo_batch(names)
+        for (_, product), chosung, jamo in zip(products, chosungs, jamos):
+            product.chosung = chosung
+            product.jamo = jamo
+
+        try:
+            self.create_products([product for _, product in products])
+        except IntegrityError:
+            # db collation에서만 같은 이름 (ex. 대소문자), 실패한 row를 찾기 위해 하나씩 생성합니다
+            for row_no, product in products:
+                product.pk = None
+                try:
+                    self.create_products([product])
+                except IntegrityError:
+                    self.errors.append(
+                        {"row": row_no, "errors": {"name": ["이미 존재하는 이름입니다"]}}
+                    )
+
+    def create_products(self, products: List[Product]):
+        with transaction.atomic():
+            bulk_create_products(self.store_id, products)
+        self.created += len(products)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from stores.models import DeletionLog
+from stores.sync import get_min_since
+
+
+class Command(BaseCommand):
+    help = "보관 기간(SYNC_DELETION_LOG_RETENTION_DAYS)이 지난 삭제 기록을 삭제합니다"
+
+    def handle(self, *args, **options):
+        deleted, _ = DeletionLog.objects.filter(deleted_at__lt=get_min_since()).delete()
+        self.stdout.write("%d개의 삭제 기록을 삭제했습니다" % deleted)
@@ -0,0 +1,79 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _tokenize(s):
+    s = s.lower()
+    return {s[i : i + n] for n in (1, 2) for i in range(len(s) - n + 1)}
+
+
+def index_products(apps, schema_editor):
+    """
+    기존 상품들의 검색 토큰 생성
+    """
+    Product = apps.get_model("stores", "Product")
+    ProductSearchToken = apps.get_model("stores", "ProductSearchToken")
+
+    products = Product.objects.only("id", "store_id", "name", "chosung")
+    for product in products.iterator(chunk_size=1000):
+        ProductSearchToken.objects.bulk_create(
+            ProductSearchToken(store_id=product.store_id, product=product, token=token)
+            for token in _tokenize(product.name) | _tokenize(product.chosung)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0004_product_product_unique_name_in_store"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=2, verbose_name="토큰")),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="stores.product",
+                        verbose_name="상품",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="stores.store",
+                        verbose_name="매장",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="productsearchtoken",
+            index=models.Index(
+                fields=["store", "token", "product"], name="search_token_posting_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="productsearchtoken",
+            constraint=models.UniqueConstraint(
+                fields=("product", "token"), name="unique_token_in_product"
+            ),
+        ),
+        migrations.RunPython(index_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from core.utils import convert_to_jamo
+from django.db import migrations, models
+
+
+def _tokenize(s):
+    s = s.lower()
+    return {s[i : i + n] for n in (1, 2) for i in range(len(s) - n + 1)}
+
+
+def fill_jamo(apps, schema_editor):
+    """
+    기존 상품들의 jamo를 채우고, name 대신 jamo로 검색 토큰을 다시 생성
+    """
+    Product = apps.get_model("stores", "Product")
+    ProductSearchToken = apps.get_model("stores", "ProductSearchToken")
+
+    ProductSearchToken.objects.all().delete()
+    products = Product.objects.only("id", "store_id", "name", "chosung")
+    for product in products.iterator(chunk_size=1000):
+        product.jamo = convert_to_jamo(product.name)
+        product.save(update_fields=["jamo"])
+        ProductSearchToken.objects.bulk_create(
+            ProductSearchToken(store_id=product.store_id, product=product, token=token)
+            for token in _tokenize(product.jamo) | _tokenize(product.chosung)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0005_productsearchtoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="jamo",
+            field=models.CharField(default="", max_length=160, verbose_name="자모"),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_jamo, migrations.RunPython.noop),
+    ]
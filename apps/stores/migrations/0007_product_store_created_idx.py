@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0006_product_jamo"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["store", "created_at", "id"], name="product_store_created_idx"
+            ),
+        ),
+    ]
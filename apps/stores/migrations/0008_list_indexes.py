@@ -0,0 +1,24 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0007_product_store_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["store", "created_at", "id"], name="category_store_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="store",
+            index=models.Index(
+                fields=["owner", "created_at", "id"], name="store_owner_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0008_list_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletionLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        choices=[("category", "category"), ("product", "product")],
+                        max_length=16,
+                        verbose_name="모델",
+                    ),
+                ),
+                ("object_id", models.IntegerField(verbose_name="삭제된 id")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="삭제 시간"),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["store", "updated_at"], name="category_store_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["store", "updated_at"], name="product_store_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="deletionlog",
+            name="store",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="stores.store",
+                verbose_name="매장",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deletionlog",
+            index=models.Index(
+                fields=["store", "deleted_at"], name="deletion_log_store_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0009_deletionlog_sync_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["store", "barcode"], name="product_store_barcode_idx"
+            ),
+        ),
+    ]
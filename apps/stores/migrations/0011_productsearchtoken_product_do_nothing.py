@@ -0,0 +1,24 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0010_product_store_barcode_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="productsearchtoken",
+            name="product",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="search_tokens",
+                to="stores.product",
+                verbose_name="상품",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stores", "0011_productsearchtoken_product_do_nothing"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="deletionlog",
+            name="object_id",
+            field=models.BigIntegerField(verbose_name="삭제된 id"),
+        ),
+    ]
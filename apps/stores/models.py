@@ -16,6 +16,15 @@ class Store(BaseModel):
         validators=[MinLengthValidator(3)],
     )
 
+    class Meta(BaseModel.Meta):
+        abstract = False
+        indexes = [
+            models.Index(
+                fields=["owner", "created_at", "id"],
+                name="store_owner_created_idx",
+            ),
+        ]
+
 
 class Category(BaseModel):
     store = models.ForeignKey(
@@ -29,6 +38,19 @@ class Category(BaseModel):
         max_length=16,
     )
 
+    class Meta(BaseModel.Meta):
+        abstract = False
+        indexes = [
+            models.Index(
+                fields=["store", "created_at", "id"],
+                name="category_store_created_idx",
+            ),
+            models.Index(
+                fields=["store", "updated_at"],
+                name="category_store_updated_idx",
+            ),
+        ]
+
 
 class Product(BaseModel):
     store = models.ForeignKey(
@@ -59,6 +81,10 @@ class Product(BaseModel):
         verbose_name="초성",
         max_length=32,
     )
+    jamo = models.CharField(
+        verbose_name="자모",
+        max_length=160,
+    )
     description = models.TextField(
         verbose_name="설명",
     )
@@ -87,3 +113,95 @@ class Product(BaseModel):
                 name="unique_name_in_store",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["store", "created_at", "id"],
+                name="product_store_created_idx",
+            ),
+            models.Index(
+                fields=["store", "updated_at"],
+                name="product_store_updated_idx",
+            ),
+            models.Index(
+                fields=["store", "barcode"],
+                name="product_store_barcode_idx",
+            ),
+        ]
+
+
+class ProductSearchToken(models.Model):
+    """
+    상품 검색을 위한 n-gram 역색인
+    (store, token)으로 posting list를 조회합니다
+    """
+
+    store = models.ForeignKey(
+        to=Store,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="매장",
+    )
+    # 상품을 삭제할 때 상품 row를 조회하지 않도록 토큰은 직접 삭제합니다 (stores.search.unindex_products)
+    # 매장 삭제시에는 store로 함께 삭제되며, 삭제 순서와 관계없도록 db constraint는 두지 않습니다
+    product = models.ForeignKey(
+        to=Product,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="search_tokens",
+        verbose_name="상품",
+    )
+    token = models.CharField(
+        verbose_name="토큰",
+        max_length=2,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "token"],
+                name="unique_token_in_product",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["store", "token", "product"],
+                name="search_token_posting_idx",
+            ),
+        ]
+
+
+class DeletionLog(models.Model):
+    """
+    삭제된 카테고리, 상품의 기록 (tombstone)
+    POS 동기화시 삭제된 row를 알려주기 위해 사용합니다
+    """
+
+    store = models.ForeignKey(
+        to=Store,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="매장",
+    )
+    model = models.CharField(
+        verbose_name="모델",
+        max_length=16,
+        choices=[
+            ("category", "category"),
+            ("product", "product"),
+        ],
+    )
+    object_id = models.BigIntegerField(
+        verbose_name="삭제된 id",
+    )
+    deleted_at = models.DateTimeField(
+        verbose_name="삭제 시간",
+        auto_now_add=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["store", "deleted_at"],
+                name="deletion_log_store_idx",
+            ),
+        ]
@@ -0,0 +1,71 @@
+"""
+매장 id -> owner id 캐시
+
+거의 모든 요청이 매장의 owner를 확인하지만, owner는 매장이 삭제될 때까지 바뀌지 않습니다
+worker 메모리(LRU)에 두고, 설정하면 django cache를 2차 캐시로 사용합니다
+
+Store의 post_save, post_delete signal로 갱신하지만 signal은 해당 worker에서만 실행되므로,
+다른 worker의 메모리 캐시는 STORE_OWNER_CACHE_TTL초 동안 이전 값을 가질 수 있습니다
+"""
+
+from typing import Optional
+
+from core.caches import LRUCache
+from core.metrics import register_cache_stats
+from django.conf import settings
+from django.core.cache import caches
+from stores.models import Store
+
+_owners = LRUCache(
+    maxsize=settings.STORE_OWNER_CACHE_SIZE, ttl=settings.STORE_OWNER_CACHE_TTL
+)
+register_cache_stats("store_owner", _owners.get_stats)
+
+
+def _shared_cache():
+    alias = settings.STORE_OWNER_SHARED_CACHE
+    return caches[alias] if alias else None
+
+
+def _key(store_id: int):
+    return "store_owner:%d" % store_id
+
+
+def get_store_owner_id(store_id: int) -> Optional[int]:
+    """
+    매장이 없으면 None
+    없는 매장은 캐시하지 않습니다 (이후 생성될 수 있음)
+    """
+    owner_id = _owners.get(store_id)
+    if owner_id is not None:
+        return owner_id
+
+    shared = _shared_cache()
+    if shared is not None:
+        owner_id = shared.get(_key(store_id))
+
+    if owner_id is None:
+        owner_id = (
+            Store.objects.filter(id=store_id).values_list("owner_id", flat=True).first()
+        )
+        if owner_id is None:
+            return None
+        if shared is not None:
+            shared.set(_key(store_id), owner_id, timeout=None)
+
+    _owners.set(store_id, owner_id)
+    return owner_id
+
+
+def set_store_owner_id(store_id: int, owner_id: int):
+    _owners.set(store_id, owner_id)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.set(_key(store_id), owner_id, timeout=None)
+
+
+def forget_store_owner_id(store_id: int):
+    _owners.delete(store_id)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_key(store_id))
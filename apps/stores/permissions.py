@@ -1,7 +1,20 @@
-from functools import partial
+from django.http import Http404
+from rest_framework.permissions import BasePermission
+from stores.owners import get_store_owner_id
 
-from core.permissions import IsOwner
 
-IsStoreOwner = partial(IsOwner, owner_id_field="owner_id")
-IsCategoryOwner = partial(IsOwner, owner_id_field="store.owner_id")
-IsProductOwner = partial(IsOwner, owner_id_field="store.owner_id")
+class IsStoreOwner(BasePermission):
+    """
+    url의 store_id 매장의 owner인지 확인합니다
+    카테고리, 상품 url도 store_id를 가지고 queryset을 store_id로 제한하므로 같이 사용합니다
+
+    owner는 캐시되어 있으므로 대부분 쿼리 없이 확인합니다
+    """
+
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        owner_id = get_store_owner_id(view.kwargs["store_id"])
+        if owner_id is None:
+            raise Http404()
+        return owner_id == request.user.id
@@ -0,0 +1,62 @@
+"""
+상품 가격(원가) 일괄 조정
+
+대상 상품을 조회하지 않고 하나의 UPDATE 문으로 적용합니다
+    percent: UPDATE ... SET price = ROUND(price * (1 + percent / 100))
+    amount: UPDATE ... SET price = price + amount
+
+MinValueValidator(0)는 SQL에서 GREATEST(..., 0)로 지킵니다
+INT column(mysql)을 넘지 않도록 LEAST(..., MAX_VALUE)로 제한합니다
+update()는 auto_now를 적용하지 않으므로 updated_at을 직접 바꿉니다 (동기화, ETag)
+"""
+
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db.models import DecimalField, F, IntegerField, Value
+from django.db.models.functions import Cast, Greatest, Least, Round
+from django.utils import timezone
+from stores.models import Product
+from stores.versions import bump_store_version
+
+# price, cost(IntegerField)의 최대값 (signed INT)
+MAX_VALUE = 2147483647
+
+
+def adjust_prices(
+    store_id: int,
+    field: str = "price",
+    *,
+    percent: Optional[Decimal] = None,
+    amount: Optional[int] = None,
+    category_id: Optional[int] = None,
+    ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    percent, amount 중 하나만 주어야 합니다
+    category_id, ids가 없으면 매장의 모든 상품이 대상입니다
+    ex) adjust_prices(store_id, "price", percent=Decimal(5), category_id=1)
+
+    조정된 상품 수를 반환합니다
+    """
+    if (percent is None) == (amount is None):
+        raise ValueError("percent, amount 중 하나만 주어야 합니다")
+
+    if percent is not None:
+        factor = Value(1 + Decimal(percent) / 100, output_field=DecimalField())
+        value = Round(F(field) * factor)
+    else:
+        value = F(field) + amount
+    # 정수로 바꾸기 전에 범위를 제한합니다
+    value = Cast(Greatest(Least(value, Value(MAX_VALUE)), Value(0)), IntegerField())
+
+    products = Product.objects.filter(store_id=store_id)
+    if category_id is not None:
+        products = products.filter(category_id=category_id)
+    if ids is not None:
+        products = products.filter(id__in=ids)
+
+    updated = products.update(**{field: value}, updated_at=timezone.now())
+    if updated:
+        bump_store_version(store_id)
+    return updated
@@ -0,0 +1,92 @@
+"""
+매장별 목록 응답 캐시
+
+key는 (view, 매장, 매장 버전, url)이며, 매장의 상품, 카테고리가 변경되면 버전이 바뀌므로
+이전 버전의 응답은 다시 사용되지 않고 TIMEOUT 또는 MAX_ENTRIES에 의해 제거됩니다
+
+렌더링된 응답(bytes)과 ETag를 저장하여, 적중하면 조회, 렌더링 없이 응답합니다
+"""
+
+from collections import Counter
+from threading import Lock
+from typing import Optional
+
+from core.metrics import register_cache_stats
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.crypto import md5
+from stores.versions import get_store_version
+
+_stats = Counter()
+_stats_lock = Lock()
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_response_cache_key(prefix: str, store_id: int, request) -> str:
+    """
+    매장 버전은 데이터를 조회하기 전에 가져와야 하므로 응답을 만들기 전에 호출합니다
+    next, previous url이 host를 포함하므로 host도 key에 포함합니다
+    """
+    url = "%s%s?%s" % (
+        request.get_host(),
+        request.path,
+        sorted(request.GET.lists()),
+    )
+    return "response:%s:%d:%s:%s" % (
+        prefix,
+        store_id,
+        get_store_version(store_id),
+        md5(url.encode(), usedforsecurity=False).hexdigest(),
+    )
+
+
+def get_cached_response(key: str) -> Optional[HttpResponse]:
+    cached = _cache().get(key)
+    if cached is None:
+        _count("misses")
+        return None
+
+    _count("hits")
+    content, content_type, etag = cached
+    response = HttpResponse(content, content_type=content_type)
+    if etag:
+        response["ETag"] = etag
+    return response
+
+
+def cache_response(key: str, response):
+    """
+    렌더링된 응답만 저장합니다
+    """
+    if len(response.content) > settings.RESPONSE_CACHE_MAX_BYTES:
+        _count("too_large")
+        return
+    _cache().set(
+        key, (response.content, response["Content-Type"], response.get("ETag"))
+    )
+
+
+def get_response_cache_stats() -> dict:
+    with _stats_lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "too_large": _stats["too_large"],
+        }
+
+
+def clear_response_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+register_cache_stats("response", get_response_cache_stats)
@@ -0,0 +1,126 @@
+from typing import Iterable, List, Set
+
+from core.utils import convert_to_jamo
+from django.db.models import Count, Q, QuerySet
+from stores.models import Product, ProductSearchToken
+
+NGRAM_SIZES = (1, 2)
+
+
+def tokenize(s: str) -> Set[str]:
+    """
+    s의 모든 1-gram, 2-gram을 반환합니다
+    대소문자 구분 없이 검색되도록 소문자로 변환합니다
+    """
+    s = s.lower()
+    tokens = set()
+    for n in NGRAM_SIZES:
+        tokens.update(s[i : i + n] for i in range(len(s) - n + 1))
+    return tokens
+
+
+def query_tokens(search: str) -> Set[str]:
+    """
+    검색어를 포함하는 상품이 반드시 가지는 토큰들
+    2-gram이 모두 일치하면 1-gram도 일치하므로, 가장 긴 n-gram만 사용합니다
+    """
+    search = search.lower()
+    n = min(len(search), NGRAM_SIZES[-1])
+    return {search[i : i + n] for i in range(len(search) - n + 1)}
+
+
+def product_tokens(product: Product) -> Set[str]:
+    """
+    name에 포함되는 검색어는 jamo에도 포함되므로, name 대신 jamo를 색인합니다
+    """
+    return tokenize(product.jamo) | tokenize(product.chosung)
+
+
+def index_products(products: Iterable[Product]):
+    """
+    새로 생성된 상품들의 토큰을 저장합니다
+    """
+    ProductSearchToken.objects.bulk_create(
+        ProductSearchToken(store_id=product.store_id, product=product, token=token)
+        for product in products
+        for token in product_tokens(product)
+    )
+
+
+def bulk_create_products(store_id: int, products: List[Product]) -> List[Product]:
+    """
+    매장의 상품들을 한번에 생성하고 토큰을 저장합니다
+    생성된 상품들은 pk가 설정되어 있습니다
+    """
+    products = Product.objects.bulk_create(products)
+    if products and products[0].pk is None:
+        # pk를 반환하지 않는 db (mysql), 이름은 매장에서 unique 합니다
+        ids = dict(
+            Product.objects.filter(
+                store_id=store_id, name__in=[product.name for product in products]
+            ).values_list("name", "id")
+        )
+        for product in products:
+            product.pk = ids[product.name]
+    index_products(products)
+    return products
+
+
+def reindex_products(products: Iterable[Product]):
+    """
+    이름이 수정된 상품들의 토큰을 다시 저장합니다
+    """
+    products = list(products)
+    ProductSearchToken.objects.filter(product__in=products).delete()
+    index_products(products)
+
+
+def unindex_products(store_id: int, **lookup):
+    """
+    삭제할 상품들의 토큰을 삭제합니다, 상품을 삭제하는 transaction에서 호출해야 합니다
+    ex) unindex_products(store_id, product__category_id=1)
+    """
+    ProductSearchToken.objects.filter(store_id=store_id, **lookup).delete()
+
+
+def _candidates(store_id: int, tokens: Set[str]) -> QuerySet:
+    """
+    tokens의 posting list를 교집합합니다
+    (모든 토큰을 가진 상품만 남도록 group by, having count)
+    """
+    return (
+        ProductSearchToken.objects.filter(store_id=store_id, token__in=tokens)
+        .values("product_id")
+        .annotate(matched=Count("token"))
+        .filter(matched=len(tokens))
+        .values("product_id")
+    )
+
+
+def search_products(queryset: QuerySet, store_id: int, search: str) -> QuerySet:
+    """
+    jamo 또는 chosung에 search를 포함하는 상품을 검색합니다
+    입력 중인 글자도 검색되도록 검색어를 자모로 분리해 jamo와 비교합니다
+    ex) "슈ㅋ", "슠" -> "ㅅㅠㅋ" -> "슈크림 라떼"
+
+    1. 검색어의 토큰별 posting list를 교집합하여 후보 상품을 구합니다
+    2. 후보 상품 중 실제로 검색어를 포함하는 상품만 남깁니다
+        (토큰이 모두 있더라도 순서가 다를 수 있음)
+
+    검색 비용이 매장의 상품 수가 아닌, 토큰이 일치하는 상품 수에 비례합니다
+    """
+    jamo_search = convert_to_jamo(search)
+    jamo_tokens = query_tokens(jamo_search)
+    chosung_tokens = query_tokens(search)
+
+    jamo_match = Q(jamo__icontains=jamo_search)
+    chosung_match = Q(chosung__icontains=search)
+    if jamo_tokens == chosung_tokens:
+        # 자모, 영문, 숫자로만 이루어진 검색어
+        candidates = _candidates(store_id, jamo_tokens)
+        return queryset.filter(id__in=candidates).filter(jamo_match | chosung_match)
+
+    return queryset.filter(
+        (Q(id__in=_candidates(store_id, jamo_tokens)) & jamo_match)
+        | (Q(id__in=_candidates(store_id, chosung_tokens)) & chosung_match)
+    )
@@ -1,8 +1,12 @@
-from core.serializers import CreateSerializer, UpdateSerializer
-from core.utils import convert_to_chosung
+from core.serializers import CreateSerializer, UpdateSerializer, ValuesSerializer
+from core.utils import convert_to_chosung, convert_to_jamo
+from django.db import transaction
 from rest_framework import serializers
 
 from stores.models import Category, Product, Store
+from stores.search import index_products, reindex_products
+from stores.sync import get_min_since
+from stores.versions import bump_store_version
 
 
 class StoreSerializer(serializers.ModelSerializer):
@@ -28,7 +32,7 @@ class MyStoreCreateSerializer(CreateSerializer):
         fields = ("name",)
 
     def create(self, validated_data):
-        validated_data["owner"] = self.context["request"].user
+        validated_data["owner_id"] = self.context["request"].user.id
         return super().create(validated_data)
 
 
@@ -59,8 +63,9 @@ class CategoryCreateSerializer(CreateSerializer):
         fields = ("name",)
 
     def create(self, validated_data):
-        validated_data["store"] = self.context["store"]
-        return super().create(validated_data)
+        category = super().create(validated_data)
+        bump_store_version(category.store_id)
+        return category
 
 
 class CategoryUpdateSerializer(UpdateSerializer):
@@ -70,6 +75,14 @@ class CategoryUpdateSerializer(UpdateSerializer):
         model = Category
         fields = ("name",)
 
+    def update(self, instance, validated_data):
+        """
+        상품 목록에 카테고리 이름이 포함됩니다
+        """
+        category = super().update(instance, validated_data)
+        bump_store_version(category.store_id)
+        return category
+
 
 class ProductSerializer(serializers.ModelSerializer):
     category_name = serializers.SerializerMethodField()
@@ -95,6 +108,15 @@ class ProductSerializer(serializers.ModelSerializer):
         return obj.category.name
 
 
+class ProductValuesSerializer(ValuesSerializer):
+    """
+    상품 목록 응답 (ProductSerializer와 같은 응답)
+    """
+
+    representation_serializer_class = ProductSerializer
+    value_fields = {"category_name": "category__name"}
+
+
 class ProductCreateSerializer(CreateSerializer):
     representation_serializer_class = ProductSerializer
 
@@ -112,19 +134,30 @@ class ProductCreateSerializer(CreateSerializer):
         )
 
     def __init__(self, *args, **kwargs):
+        """
+        context
+            - store_id
+            - categories: 선택할 수 있는 카테고리 queryset
+        """
         super().__init__(*args, **kwargs)
-        if "store" in self.context:
-            self.fields["category"].queryset = self.context["store"].categories.all()
+        if "categories" in self.context:
+            self.fields["category"].queryset = self.context["categories"]
 
     def validate_name(self, value):
-        if Product.objects.filter(store=self.context["store"], name=value).exists():
+        store_id = self.context["store_id"]
+        if Product.objects.filter(store_id=store_id, name=value).exists():
             raise serializers.ValidationError("이미 존재하는 이름입니다")
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
-        validated_data["store"] = self.context["store"]
+        validated_data["store_id"] = self.context["store_id"]
         validated_data["chosung"] = convert_to_chosung(validated_data["name"])
-        return super().create(validated_data)
+        validated_data["jamo"] = convert_to_jamo(validated_data["name"])
+        product = super().create(validated_data)
+        index_products([product])
+        bump_store_version(product.store_id)
+        return product
 
 
 class ProductUpdateSerializer(UpdateSerializer):
@@ -146,17 +179,240 @@ class ProductUpdateSerializer(UpdateSerializer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.instance:
-            self.fields["category"].queryset = self.instance.store.categories.all()
+            self.fields["category"].queryset = Category.objects.filter(
+                store_id=self.instance.store_id
+            )
 
     def validate_name(self, value):
         if value == self.instance.name:
             return value
-        if Product.objects.filter(store=self.instance.store, name=value).exists():
+        if Product.objects.filter(store_id=self.instance.store_id, name=value).exists():
             raise serializers.ValidationError("이미 존재하는 이름입니다")
         return value
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         new_name = validated_data.get("name")
-        if new_name and new_name != instance.name:
+        name_changed = new_name and new_name != instance.name
+        if name_changed:
             validated_data["chosung"] = convert_to_chosung(new_name)
-        return super().update(instance, validated_data)
+            validated_data["jamo"] = convert_to_jamo(new_name)
+        product = super().update(instance, validated_data)
+        if name_changed:
+            reindex_products([product])
+        bump_store_version(product.store_id)
+        return product
+
+
+class ProductSuggestionSerializer(serializers.ModelSerializer):
+    """
+    for swagger
+    """
+
+    class Meta:
+        model = Product
+        fields = (
+            "id",
+            "name",
+        )
+        read_only_fields = fields
+
+
+class ProductAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(default="", allow_blank=True, trim_whitespace=False)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=50)
+
+
+BARCODE_MAX_LENGTH = Product._meta.get_field("barcode").max_length
+
+
+class ProductBarcodeSerializer(serializers.Serializer):
+    """
+    url의 바코드, 상품의 바코드보다 길면 조회, 캐시하지 않습니다
+    """
+
+    barcode = serializers.CharField(max_length=BARCODE_MAX_LENGTH)
+
+
+class ProductBarcodesSerializer(serializers.Serializer):
+    barcodes = serializers.ListField(
+        child=serializers.CharField(max_length=BARCODE_MAX_LENGTH),
+        allow_empty=False,
+        max_length=100,
+    )
+
+
+class ProductImportRowSerializer(ProductCreateSerializer):
+    """
+    import 파일의 한 row
+    category, name 중복은 batch 단위로 한번에 확인하므로 여기서는 조회하지 않습니다
+    """
+
+    category = serializers.IntegerField()
+
+    def validate_name(self, value):
+        return value
+
+
+class ProductBatchUpdateRowSerializer(ProductUpdateSerializer):
+    """
+    batch의 수정 operation
+    category, name 중복은 batch 전체를 한번에 확인하므로 여기서는 조회하지 않습니다
+    """
+
+    category = serializers.IntegerField(required=False)
+
+    def validate_name(self, value):
+        return value
+
+
+class ProductBatchOperationSerializer(serializers.Serializer):
+    """
+    data는 create면 상품 생성, update면 상품 수정과 같은 필드입니다
+    """
+
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        required = []
+        if attrs["op"] != "create":
+            required.append("id")
+        if attrs["op"] != "delete":
+            required.append("data")
+
+        errors = {
+            field: [self.fields[field].error_messages["required"]]
+            for field in required
+            if field not in attrs
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class ProductBatchSerializer(serializers.Serializer):
+    operations = ProductBatchOperationSerializer(
+        many=True, allow_empty=False, max_length=500
+    )
+
+
+class ProductBatchResultSerializer(serializers.Serializer):
+    """
+    for swagger
+    operations와 같은 순서, delete는 product가 null 입니다
+    """
+
+    op = serializers.CharField()
+    id = serializers.IntegerField()
+    product = ProductSerializer(allow_null=True)
+
+
+class ProductPriceAdjustmentSerializer(serializers.Serializer):
+    """
+    percent(%) 또는 amount(원) 중 하나만 주어야 합니다
+    category, ids가 없으면 매장의 모든 상품이 대상입니다
+    """
+
+    field = serializers.ChoiceField(choices=["price", "cost"], default="price")
+    percent = serializers.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        min_value=-100,
+        max_value=1000,
+        required=False,
+    )
+    amount = serializers.IntegerField(
+        min_value=-1000000, max_value=1000000, required=False
+    )
+    category = serializers.IntegerField(required=False)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=1000,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        if ("percent" in attrs) == ("amount" in attrs):
+            raise serializers.ValidationError("percent, amount 중 하나만 입력해주세요")
+        return attrs
+
+
+class ProductPriceAdjustmentResultSerializer(serializers.Serializer):
+    """
+    for swagger
+    """
+
+    updated = serializers.IntegerField()
+
+
+class ProductImportSerializer(serializers.Serializer):
+    """
+    format이 없으면 파일 확장자로 판단합니다
+    """
+
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=["csv", "ndjson"], required=False)
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            extension = attrs["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in ("csv", "ndjson", "jsonl"):
+                raise serializers.ValidationError({"format": "파일 형식을 알 수 없습니다"})
+            attrs["format"] = "csv" if extension == "csv" else "ndjson"
+        return attrs
+
+
+class ProductImportErrorSerializer(serializers.Serializer):
+    """
+    for swagger
+    """
+
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class ProductImportResultSerializer(serializers.Serializer):
+    """
+    for swagger
+    """
+
+    created = serializers.IntegerField()
+    errors = ProductImportErrorSerializer(many=True)
+
+
+class ProductExportQuerySerializer(serializers.Serializer):
+    """
+    format은 drf의 renderer 선택 query param과 겹치므로 file_format을 사용합니다
+    """
+
+    file_format = serializers.ChoiceField(choices=["ndjson", "csv"], default="ndjson")
+
+
+class StoreChangesQuerySerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+
+    def validate_since(self, value):
+        if value < get_min_since():
+            raise serializers.ValidationError("since가 너무 오래되었습니다, 전체 동기화가 필요합니다")
+        return value
+
+
+class DeletedIdsSerializer(serializers.Serializer):
+    categories = serializers.ListField(child=serializers.IntegerField())
+    products = serializers.ListField(child=serializers.IntegerField())
+
+
+class StoreChangesSerializer(serializers.Serializer):
+    """
+    since 이후 변경된 매장, 카테고리, 상품과 삭제된 id
+    store는 변경되지 않았으면 null 입니다
+    """
+
+    watermark = serializers.DateTimeField()
+    store = StoreSerializer(allow_null=True)
+    categories = CategorySerializer(many=True)
+    products = ProductSerializer(many=True)
+    deleted = DeletedIdsSerializer()
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from stores.models import Store
+from stores.owners import forget_store_owner_id, set_store_owner_id
+
+
+@receiver(post_save, sender=Store)
+def cache_store_owner(sender, instance, **kwargs):
+    """
+    생성한 worker에서는 첫 요청부터 조회하지 않도록 미리 저장합니다
+    """
+    set_store_owner_id(instance.id, instance.owner_id)
+
+
+@receiver(post_delete, sender=Store)
+def forget_store_owner(sender, instance, **kwargs):
+    forget_store_owner_id(instance.id)
@@ -0,0 +1,70 @@
+"""
+POS 단말기의 증분 동기화
+
+단말기는 이전 응답의 watermark를 since로 보내고,
+since 이후 수정된 row와 삭제된 row의 id만 받습니다
+
+watermark는 조회 시작 시간보다 SYNC_WATERMARK_LAG_SECONDS 만큼 이전입니다
+조회 시점에 아직 commit 되지 않은 transaction의 row는 updated_at이 조회 시작 시간보다 이전일 수 있으므로,
+다음 동기화에서 다시 조회되도록 합니다 (lag보다 오래 걸린 transaction은 누락될 수 있습니다)
+같은 row가 두번 전달될 수 있으므로 단말기는 id 기준으로 덮어써야 합니다
+
+상품은 category_name을 포함하므로, 카테고리가 수정되면 그 카테고리의 상품도 다시 전달합니다
+"""
+
+from datetime import timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from stores.models import DeletionLog, Store
+
+
+def log_deletions(store_id: int, **ids: Iterable[int]):
+    """
+    삭제 전, 같은 transaction에서 호출해야 합니다
+    ex) log_deletions(store_id, category=[1], product=[1, 2])
+    """
+    DeletionLog.objects.bulk_create(
+        DeletionLog(store_id=store_id, model=model, object_id=id)
+        for model, model_ids in ids.items()
+        for id in model_ids
+    )
+
+
+def get_min_since():
+    """
+    삭제 기록은 SYNC_DELETION_LOG_RETENTION_DAYS 동안만 보관하므로,
+    그보다 오래된 since로는 증분 동기화를 할 수 없습니다
+    """
+    return timezone.now() - timedelta(days=settings.SYNC_DELETION_LOG_RETENTION_DAYS)
+
+
+def get_changes(store: Store, since: Optional[timezone.datetime]) -> dict:
+    """
+    since가 없으면 전체 동기화 입니다 (삭제 기록 제외)
+    """
+    watermark = timezone.now() - timedelta(seconds=settings.SYNC_WATERMARK_LAG_SECONDS)
+
+    categories = store.categories.all()
+    products = store.products.select_related("category")
+    deletions = DeletionLog.objects.none()
+    if since is not None:
+        categories = categories.filter(updated_at__gt=since)
+        products = products.filter(
+            Q(updated_at__gt=since) | Q(category__updated_at__gt=since)
+        )
+        deletions = DeletionLog.objects.filter(store=store, deleted_at__gt=since)
+
+    deleted = {"categories": [], "products": []}
+    for model, object_id in deletions.values_list("model", "object_id"):
+        deleted["categories" if model == "category" else "products"].append(object_id)
+
+    return {
+        "watermark": watermark,
+        "store": store if since is None or store.updated_at > since else None,
+        "categories": categories,
+        "products": products,
+        "deleted": deleted,
+    }
@@ -1,7 +1,11 @@
 from core.schemas import *
 from core.tests import BaseTestCase
+from core.utils import convert_to_chosung, convert_to_jamo
+from django.conf import settings
+from django.core.cache import caches
 from django.urls import reverse
-from stores.models import Category, Store
+from stores.models import Category, Product, ProductSearchToken, Store
+from stores.search import index_products
 
 
 class CategoryCreateAPITestCase(BaseTestCase):
@@ -18,17 +22,15 @@ class CategoryCreateAPITestCase(BaseTestCase):
         """
         정상 생성
 
-        queries 3개:
-            1. get user (request user),
-            2. get store (permission check를 위해)
-            3. insert category
+        queries 1개:
+            1. insert category
         """
         self.generic_test(
             self.path,
             "post",
             201,
             res201_schema(category_schema),
-            expected_query_count=3,
+            expected_query_count=1,
             auth_user=self.user,
             name="category",
         )
@@ -78,6 +80,8 @@ class CategoryCreateAPITestCase(BaseTestCase):
 
 
 class CategoryListAPITestCase(BaseTestCase):
+    success_schema = res200_schema(cursor_pagination_schema(category_schema))
+
     @classmethod
     def setUpTestData(cls):
         cls.user = cls.create_user()
@@ -95,20 +99,68 @@ class CategoryListAPITestCase(BaseTestCase):
         """
         정상 조회
 
-        queries 3개:
-            1. get user (request user),
-            2. get store (permission check를 위해)
-            3. get categories
+        queries 2개:
+            1. get max updated_at, count (ETag)
+            2. get categories
+        """
+        res = self.generic_test(
+            self.path,
+            "get",
+            200,
+            self.success_schema,
+            expected_query_count=2,
+            auth_user=self.user,
+        )
+        self.assertEqual(3, len(res["data"]["results"]))
+
+    def test_not_modified(self):
+        """
+        ETag가 같으면 304, 카테고리가 삭제되면 200
+        (ORM으로 삭제하여 매장 버전이 바뀌지 않으므로 응답 캐시를 비우고 확인)
+        """
+        headers = self.get_auth_header(self.user)
+        etag = self.client.get(self.path, **headers)["ETag"]
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(304, res.status_code)
+
+        Category.objects.filter(store=self.store).first().delete()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(200, res.status_code)
+
+    def test_page_size(self):
+        """
+        page_size로 페이지 크기 지정
+        """
+        res = self.generic_test(
+            self.path, "get", 200, self.success_schema, auth_user=self.user, page_size=2
+        )
+        self.assertEqual(2, len(res["data"]["results"]))
+
+        res = self.generic_test(
+            res["data"]["next"], "get", 200, self.success_schema, auth_user=self.user
+        )
+        self.assertEqual(1, len(res["data"]["results"]))
+        self.assertTrue(None == res["data"]["next"])
+
+    def test_max_page_size(self):
         """
+        max_page_size를 넘을 수 없음
+        """
+        Category.objects.bulk_create(
+            Category(store=self.store, name="more%d" % i) for i in range(100)
+        )
         res = self.generic_test(
             self.path,
             "get",
             200,
-            res200_schema(Schema([category_schema])),
-            expected_query_count=3,
+            self.success_schema,
             auth_user=self.user,
+            page_size=1000,
         )
-        self.assertEqual(3, len(res["data"]))
+        self.assertEqual(100, len(res["data"]["results"]))
+        self.assertTrue(None != res["data"]["next"])
 
     def test_no_auth(self):
         """
@@ -161,16 +213,15 @@ class CategoryRetrieveAPITestCase(BaseTestCase):
         """
         정상 조회
 
-        queries 2개:
-            1. get user (request user)
-            2. get category with store
+        queries 1개:
+            1. get category
         """
         self.generic_test(
             self.path,
             "get",
             200,
             res200_schema(category_schema),
-            expected_query_count=2,
+            expected_query_count=1,
             auth_user=self.user,
         )
 
@@ -227,10 +278,9 @@ class CategoryUpdateAPITestCase(BaseTestCase):
         """
         정상 수정
 
-        queries 3개:
-            1. get user (request user)
-            2. get category with store
-            3. update category
+        queries 2개:
+            1. get category
+            2. update category
         """
         self.generic_test(
             self.path,
@@ -238,7 +288,7 @@ class CategoryUpdateAPITestCase(BaseTestCase):
             200,
             res200_schema(category_schema),
             auth_user=self.user,
-            expected_query_count=3,
+            expected_query_count=2,
             name="updated_name",
         )
         category = Category.objects.get(id=self.category.id)
@@ -287,21 +337,66 @@ class CategoryDeleteAPITestCase(BaseTestCase):
         """
         정상 삭제
 
-        queries 4개:
-            1. get user (request user)
-            2. get category with store
-            3. delete products (cascade)
-            4. delete category
+        queries 8개:
+            1. get category
+            2. savepoint
+            3. get products (삭제 기록)
+            4. insert deletion logs
+            5. delete search tokens
+            6. delete products (cascade)
+            7. delete category
+            8. release savepoint
         """
         self.generic_test(
             self.path,
             "delete",
             204,
             expected_schema=None,
-            expected_query_count=4,
+            expected_query_count=8,
             auth_user=self.user,
         )
 
+    def test_with_products(self):
+        """
+        상품과 검색 토큰도 삭제되며, 상품을 조회하지 않으므로 쿼리 수는 같음
+        """
+        other = Category.objects.create(store=self.store, name="other")
+        products = Product.objects.bulk_create(
+            Product(
+                store=self.store,
+                category=category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="",
+                barcode="",
+                sell_by_days=3,
+                size="small",
+            )
+            for category, name in (
+                (self.category, "슈크림 라떼"),
+                (self.category, "아이스티"),
+                (other, "아메리카노"),
+            )
+        )
+        index_products(products)
+
+        self.generic_test(
+            self.path,
+            "delete",
+            204,
+            expected_schema=None,
+            expected_query_count=8,
+            auth_user=self.user,
+        )
+        self.assertEqual(["아메리카노"], [p.name for p in Product.objects.all()])
+        self.assertEqual(
+            {products[2].id},
+            set(ProductSearchToken.objects.values_list("product_id", flat=True)),
+        )
+
     def test_no_auth(self):
         """
         인증 없이
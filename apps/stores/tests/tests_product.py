@@ -1,8 +1,36 @@
+import csv
+import io
+import json
+from base64 import b64encode
+from contextlib import nullcontext
+from urllib.parse import urlencode
+
 from core.schemas import *
 from core.tests import BaseTestCase
-from core.utils import convert_to_chosung
+from core.utils import convert_to_chosung, convert_to_jamo
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import override_settings
+from django.test.client import MULTIPART_CONTENT
 from django.urls import reverse
-from stores.models import Category, Product, Store
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from stores.batch import ProductBatch
+from stores.imports import PARSERS, ProductImporter
+from stores.models import (
+    Category,
+    DeletionLog,
+    Product,
+    ProductSearchToken,
+    Store,
+)
+from stores.pricing import MAX_VALUE
+from stores.responses import clear_response_cache_stats, get_response_cache_stats
+from stores.search import index_products
+from stores.serializers import ProductSerializer, ProductValuesSerializer
+from stores.versions import get_store_version
 
 
 class ProductCreateAPITestCase(BaseTestCase):
@@ -14,6 +42,7 @@ class ProductCreateAPITestCase(BaseTestCase):
         cls.path = reverse("stores:list_product", args=[cls.store.id])
 
     def setUp(self):
+        super().setUp()
         self.data = {
             "category": self.category.id,
             "price": 5000,
@@ -32,19 +61,20 @@ class ProductCreateAPITestCase(BaseTestCase):
         """
         정상 생성
 
-        queries 5개:
-            1. get user (request user)
-            2. get store (permission check)
-            3. check category (validation check)
-            4. check unique name (validation check)
-            5. insert product
+        queries 6개:
+            1. check category
+            2. check unique name (validation check)
+            3. savepoint
+            4. insert product
+            5. insert search tokens
+            6. release savepoint
         """
         self.generic_test(
             self.path,
             "post",
             201,
             res201_schema(product_schema),
-            expected_query_count=5,
+            expected_query_count=6,
             auth_user=self.user,
             **self.data,
         )
@@ -182,7 +212,7 @@ class ProductListAPITestCase(BaseTestCase):
             "슈크림 라떼",
             "슈쿠류 로또",
         ] + dummy_names
-        Product.objects.bulk_create(
+        products = Product.objects.bulk_create(
             Product(
                 store=cls.store,
                 category=cls.category,
@@ -190,6 +220,7 @@ class ProductListAPITestCase(BaseTestCase):
                 cost=3000,
                 name=name,
                 chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
                 description="맛있는 %s" % name,
                 barcode="1234567890",
                 sell_by_days=3,
@@ -197,6 +228,7 @@ class ProductListAPITestCase(BaseTestCase):
             )
             for name in names
         )
+        index_products(products)
         cls.path = reverse("stores:list_product", args=[cls.store.id])
 
     def test_success(self):
@@ -204,9 +236,9 @@ class ProductListAPITestCase(BaseTestCase):
         정상 조회
 
         queries 3개:
-            1. get user (request user)
-            2. get store (permission check)
-            3. ger products
+            1. get max updated_at, count (ETag)
+            2. get categories max updated_at (ETag)
+            3. get products
         """
         res = self.generic_test(
             self.path,
@@ -218,6 +250,46 @@ class ProductListAPITestCase(BaseTestCase):
         )
         self.assertEqual(10, len(res["data"]["results"]))
 
+    def test_same_as_product_serializer(self):
+        """
+        values()로 만든 응답이 ProductSerializer의 응답과 같아야 함
+        """
+        products = Product.objects.order_by("id")
+        rows = ProductValuesSerializer.get_values_queryset(products).order_by("id")
+        self.assertEqual(
+            json.dumps(ProductSerializer(products, many=True).data),
+            json.dumps(ProductValuesSerializer(rows).data),
+        )
+
+    def test_empty_store(self):
+        """
+        생성한 매장은 owner가 캐시되어 있음
+
+        queries 3개:
+            1. get max updated_at, count (ETag)
+            2. get categories max updated_at (ETag)
+            3. get products
+        """
+        store = Store.objects.create(owner=self.user, name="empty")
+        res = self.generic_test(
+            reverse("stores:list_product", args=[store.id]),
+            "get",
+            200,
+            self.success_schema,
+            expected_query_count=3,
+            auth_user=self.user,
+        )
+        self.assertEqual([], res["data"]["results"])
+
+    def test_not_found_store(self):
+        self.generic_test(
+            reverse("stores:list_product", args=[self.store.id + 100]),
+            "get",
+            404,
+            res404_schema,
+            auth_user=self.user,
+        )
+
     def test_pagination(self):
         def _test(path):
             return self.generic_test(
@@ -234,6 +306,48 @@ class ProductListAPITestCase(BaseTestCase):
         self.assertTrue(None != next_page["data"]["previous"])
         self.assertTrue(None == next_page["data"]["next"])
 
+    def test_pagination_same_created_at(self):
+        """
+        created_at이 같은 상품들도 건너뛰거나 중복되지 않아야함
+        """
+        Product.objects.filter(store=self.store).update(created_at=timezone.now())
+
+        def _test(path):
+            return self.generic_test(
+                path, "get", 200, self.success_schema, auth_user=self.user
+            )["data"]
+
+        ids = []
+        page = _test(self.path)
+        ids += [product["id"] for product in page["results"]]
+        while page["next"]:
+            page = _test(page["next"])
+            ids += [product["id"] for product in page["results"]]
+
+        expected_ids = list(
+            Product.objects.filter(store=self.store)
+            .order_by("-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(expected_ids, ids)
+
+        previous_page = _test(page["previous"])
+        self.assertEqual(
+            expected_ids[:10], [product["id"] for product in previous_page["results"]]
+        )
+
+    def test_invalid_cursor(self):
+        for position in ["invalid", "[]", '["2023-01-01 00:00:00+00:00"]']:
+            cursor = b64encode(urlencode({"p": position}).encode()).decode()
+            self.generic_test(
+                self.path,
+                "get",
+                404,
+                res404_schema,
+                auth_user=self.user,
+                cursor=cursor,
+            )
+
     def test_filter_by_store(self):
         """
         해당 store의 product만 검색되야함
@@ -273,6 +387,12 @@ class ProductListAPITestCase(BaseTestCase):
             "ㅅㅋㄹ": 2,
             "ㅅㅋㄹ ㄹㄸ": 2,
             "ㄹㄸ": 2,
+            "슈ㅋ": 2,
+            "슠": 2,
+            "슈크": 1,
+            "슈크ㄹ": 1,
+            "라ㄸ": 1,
+            "크림 라ㄸ": 1,
         }
         for search, expected_len in expected_result_len_list.items():
             res = self.generic_test(
@@ -284,6 +404,195 @@ class ProductListAPITestCase(BaseTestCase):
             )
             self.assertEqual(expected_len, len(res["data"]["results"]))
 
+    def test_search_query_count(self):
+        """
+        검색
+
+        queries 3개:
+            1. get max updated_at, count (ETag, 검색 조건 없이 매장 전체)
+            2. get categories max updated_at (ETag)
+            3. get products (search token posting list를 subquery로 교집합)
+        """
+        res = self.generic_test(
+            self.path + "?search=슈크림",
+            "get",
+            200,
+            self.success_schema,
+            expected_query_count=3,
+            auth_user=self.user,
+        )
+        self.assertEqual(1, len(res["data"]["results"]))
+
+    def test_not_modified(self):
+        """
+        ETag가 같으면 상품을 조회하지 않고 304
+        상품, 카테고리가 수정되거나 페이지가 다르면 ETag가 바뀌어야 함
+        (ORM으로 수정하여 매장 버전이 바뀌지 않으므로 응답 캐시를 비우고 확인)
+
+        304 queries 2개:
+            1. get max updated_at, count (ETag)
+            2. get categories max updated_at (ETag)
+        """
+        response_cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        headers = self.get_auth_header(self.user)
+        etag = self.client.get(self.path, **headers)["ETag"]
+
+        response_cache.clear()
+        with self.assertNumQueries(2):
+            res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(304, res.status_code)
+        self.assertEqual(etag, res["ETag"])
+        self.assertEqual(b"", res.content)
+
+        res = self.client.get(
+            self.path, {"page_size": 5}, HTTP_IF_NONE_MATCH=etag, **headers
+        )
+        self.assertEqual(200, res.status_code)
+
+        for instance in (Product.objects.first(), self.category):
+            instance.save()
+            response_cache.clear()
+            res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+            self.assertEqual(200, res.status_code)
+            self.assertNotEqual(etag, res["ETag"])
+            etag = res["ETag"]
+
+    def test_not_modified_after_delete(self):
+        """
+        삭제는 updated_at을 바꾸지 않으므로 상품 수로 확인
+        """
+        headers = self.get_auth_header(self.user)
+        etag = self.client.get(self.path, **headers)["ETag"]
+        Product.objects.filter(name="슈크림 라떼").delete()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(200, res.status_code)
+
+    def test_response_cache(self):
+        """
+        같은 url은 매장 버전이 바뀌기 전까지 조회 없이 캐시된 응답
+        상품, 카테고리가 수정되면 매장 버전이 바뀌어 다시 조회
+
+        캐시된 응답 queries 0개
+        """
+        clear_response_cache_stats()
+        headers = self.get_auth_header(self.user)
+        res = self.client.get(self.path, **headers)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.path, **headers)
+        self.assertEqual(res.content, cached.content)
+        self.assertEqual(res["Content-Type"], cached["Content-Type"])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(
+                self.path, HTTP_IF_NONE_MATCH=res["ETag"], **headers
+            )
+        self.assertEqual(304, cached.status_code)
+        self.assertEqual(res["ETag"], cached["ETag"])
+
+        self.generic_test(
+            reverse("stores:detail_category", args=[self.store.id, self.category.id]),
+            "patch",
+            200,
+            res200_schema(category_schema),
+            auth_user=self.user,
+            name="음료",
+        )
+        res = self.generic_test(
+            self.path,
+            "get",
+            200,
+            self.success_schema,
+            expected_query_count=3,
+            auth_user=self.user,
+        )
+        self.assertEqual("음료", res["data"]["results"][0]["category_name"])
+        self.assertEqual(
+            {"hits": 2, "misses": 2, "too_large": 0}, get_response_cache_stats()
+        )
+
+    @override_settings(RESPONSE_CACHE_MAX_BYTES=10)
+    def test_response_too_large(self):
+        """
+        RESPONSE_CACHE_MAX_BYTES보다 큰 응답은 캐시하지 않음
+        """
+        clear_response_cache_stats()
+        for _ in range(2):
+            self.generic_test(
+                self.path,
+                "get",
+                200,
+                self.success_schema,
+                expected_query_count=3,
+                auth_user=self.user,
+            )
+        self.assertEqual(2, get_response_cache_stats()["too_large"])
+
+    def test_search_token_order(self):
+        """
+        토큰이 모두 있더라도 순서가 다르면 검색되지 않아야함
+        """
+        res = self.generic_test(
+            self.path + "?search=떼라",
+            "get",
+            200,
+            self.success_schema,
+            auth_user=self.user,
+        )
+        self.assertEqual(0, len(res["data"]["results"]))
+
+    def test_search_after_write(self):
+        """
+        생성, 수정, 삭제된 상품이 검색에 반영되야함
+        """
+
+        def _search(search):
+            res = self.generic_test(
+                self.path + "?search=%s" % search,
+                "get",
+                200,
+                self.success_schema,
+                auth_user=self.user,
+            )
+            return res["data"]["results"]
+
+        product = self.generic_test(
+            self.path,
+            "post",
+            201,
+            res201_schema(product_schema),
+            auth_user=self.user,
+            category=self.category.id,
+            price=4500,
+            cost=2000,
+            name="Iced Americano",
+            description="시원한 아메리카노",
+            barcode="1234567890",
+            sell_by_days=1,
+            size="large",
+        )["data"]
+        self.assertEqual(1, len(_search("iced")))
+
+        detail_path = reverse(
+            "stores:detail_product", args=[self.store.id, product["id"]]
+        )
+        self.generic_test(
+            detail_path,
+            "patch",
+            200,
+            res200_schema(product_schema),
+            auth_user=self.user,
+            name="Hot Americano",
+        )
+        self.assertEqual(0, len(_search("iced")))
+        self.assertEqual(1, len(_search("hot")))
+
+        self.generic_test(
+            detail_path, "delete", 204, expected_schema=None, auth_user=self.user
+        )
+        self.assertEqual(0, len(_search("hot")))
+
     def test_no_auth(self):
         """
         인증 없이
@@ -309,47 +618,153 @@ class ProductListAPITestCase(BaseTestCase):
         )
 
 
-class ProductRetrieveAPITestCase(BaseTestCase):
+class ProductAutocompleteAPITestCase(BaseTestCase):
+    suggestion_schema = Schema({"id": int, "name": str})
+    success_schema = res200_schema([suggestion_schema])
+
     @classmethod
     def setUpTestData(cls):
         cls.user = cls.create_user()
         cls.store = Store.objects.create(owner=cls.user, name="store")
         cls.category = Category.objects.create(store=cls.store, name="category")
-        cls.product = Product.objects.create(
-            store=cls.store,
-            category=cls.category,
-            price=5000,
-            cost=3000,
-            name="슈크림 라떼",
-            chosung=convert_to_chosung("슈크림 라떼"),
-            description="맛있는 슈크림 라떼",
-            barcode="1234567890",
-            sell_by_days=3,
-            size="small",
+        names = ["슈크림 라떼", "슈쿠류 로또", "아이스 아메리카노"]
+        Product.objects.bulk_create(
+            Product(
+                store=cls.store,
+                category=cls.category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="맛있는 %s" % name,
+                barcode="1234567890",
+                sell_by_days=3,
+                size="small",
+            )
+            for name in names
         )
-        cls.path = reverse("stores:detail_product", args=[cls.store.id, cls.product.id])
+        cls.path = reverse("stores:autocomplete_product", args=[cls.store.id])
 
-    def test_url(self):
-        self.assertEqual(
-            "/stores/%d/products/%d/" % (self.store.id, self.product.id), self.path
+    def suggest(self, q, **params):
+        res = self.generic_test(
+            self.path,
+            "get",
+            200,
+            self.success_schema,
+            auth_user=self.user,
+            q=q,
+            **params,
         )
+        return [suggestion["name"] for suggestion in res["data"]]
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/products/autocomplete/" % self.store.id, self.path)
 
     def test_success(self):
         """
         정상 조회
 
-        queries 2개:
-            1. get user (request user)
-            2. get product with store, category
+        첫 요청 queries 1개:
+            1. get products (색인 생성)
+
+        이후 요청 queries 0개
+        """
+        for expected_query_count in (1, 0):
+            self.generic_test(
+                self.path + "?q=슈",
+                "get",
+                200,
+                self.success_schema,
+                expected_query_count=expected_query_count,
+                auth_user=self.user,
+            )
+
+    def test_suggest(self):
+        """
+        이름, 초성, 입력 중인 글자, 단어 시작으로 조회
+        """
+        expected_names = {
+            "": [],
+            "슈": ["슈쿠류 로또", "슈크림 라떼"],
+            "슈ㅋ": ["슈쿠류 로또", "슈크림 라떼"],
+            "슈크": ["슈크림 라떼"],
+            "ㅅㅋㄹ": ["슈쿠류 로또", "슈크림 라떼"],
+            "라ㄸ": ["슈크림 라떼"],
+            "ㅇㅁ": ["아이스 아메리카노"],
+            "아메": ["아이스 아메리카노"],
+            "메리": [],
+        }
+        for q, names in expected_names.items():
+            self.assertEqual(names, sorted(self.suggest(q)))
+
+    def test_limit(self):
+        self.assertEqual(1, len(self.suggest("슈", limit=1)))
+        for limit in (0, 51, "a"):
+            self.generic_test(
+                self.path,
+                "get",
+                400,
+                res400_schema,
+                auth_user=self.user,
+                q="슈",
+                limit=limit,
+            )
+
+    def test_invalidation(self):
+        """
+        상품 생성, 수정, 삭제 후 색인이 다시 만들어져야함
         """
+        self.assertEqual([], self.suggest("카페"))
+
+        product = self.generic_test(
+            reverse("stores:list_product", args=[self.store.id]),
+            "post",
+            201,
+            res201_schema(product_schema),
+            auth_user=self.user,
+            category=self.category.id,
+            price=5000,
+            cost=3000,
+            name="카페 모카",
+            description="맛있는 카페 모카",
+            barcode="1234567890",
+            sell_by_days=3,
+            size="small",
+        )["data"]
+        self.assertEqual(["카페 모카"], self.suggest("카페"))
+
+        detail_path = reverse(
+            "stores:detail_product", args=[self.store.id, product["id"]]
+        )
         self.generic_test(
-            self.path,
-            "get",
+            detail_path,
+            "patch",
             200,
             res200_schema(product_schema),
-            expected_query_count=2,
+            auth_user=self.user,
+            name="카페 라떼",
+        )
+        self.assertEqual(["카페 라떼"], self.suggest("카페"))
+
+        self.generic_test(
+            detail_path, "delete", 204, expected_schema=None, auth_user=self.user
+        )
+        self.assertEqual([], self.suggest("카페"))
+
+    def test_category_delete(self):
+        """
+        카테고리 삭제시 함께 삭제된 상품도 조회되지 않아야함
+        """
+        self.assertEqual(2, len(self.suggest("슈")))
+        self.generic_test(
+            reverse("stores:detail_category", args=[self.store.id, self.category.id]),
+            "delete",
+            204,
+            expected_schema=None,
             auth_user=self.user,
         )
+        self.assertEqual([], self.suggest("슈"))
 
     def test_no_auth(self):
         """
@@ -376,41 +791,1131 @@ class ProductRetrieveAPITestCase(BaseTestCase):
         )
 
 
-class ProductUpdateAPITestCase(BaseTestCase):
+class ProductBarcodeAPITestCase(BaseTestCase):
+    success_schema = res200_schema([product_schema])
+
     @classmethod
     def setUpTestData(cls):
         cls.user = cls.create_user()
         cls.store = Store.objects.create(owner=cls.user, name="store")
         cls.category = Category.objects.create(store=cls.store, name="category")
-        cls.product = Product.objects.create(
-            store=cls.store,
-            category=cls.category,
-            price=5000,
-            cost=3000,
-            name="슈크림 라떼",
-            chosung=convert_to_chosung("슈크림 라떼"),
-            description="맛있는 슈크림 라떼",
-            barcode="1234567890",
-            sell_by_days=3,
-            size="small",
+        barcodes = {"슈크림 라떼": "8801", "아이스 아메리카노": "8802", "아이스티": "8802"}
+        Product.objects.bulk_create(
+            Product(
+                store=cls.store,
+                category=cls.category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="맛있는 %s" % name,
+                barcode=barcode,
+                sell_by_days=3,
+                size="small",
+            )
+            for name, barcode in barcodes.items()
         )
-        cls.path = reverse("stores:detail_product", args=[cls.store.id, cls.product.id])
+        cls.path = reverse("stores:barcode_product", args=[cls.store.id, "8801"])
+        cls.bulk_path = reverse("stores:barcodes_product", args=[cls.store.id])
 
     def test_url(self):
         self.assertEqual(
-            "/stores/%d/products/%d/" % (self.store.id, self.product.id), self.path
+            "/stores/%d/products/by-barcode/8801/" % self.store.id, self.path
+        )
+        self.assertEqual(
+            "/stores/%d/products/by-barcode/" % self.store.id, self.bulk_path
         )
 
     def test_success(self):
         """
-        정상 수정
+        정상 조회
 
-        queries 4개:
-            1. get user (request user)
-            2. get store (permission check)
-            3. check unique name (validation check)
+        첫 요청 queries 1개:
+            1. get products (barcode index)
+
+        이후 요청 queries 0개
+        """
+        for expected_query_count in (1, 0):
+            res = self.generic_test(
+                self.path,
+                "get",
+                200,
+                self.success_schema,
+                expected_query_count=expected_query_count,
+                auth_user=self.user,
+            )
+            self.assertEqual(["슈크림 라떼"], [p["name"] for p in res["data"]])
+
+    def test_not_found(self):
+        """
+        없는 바코드도 캐시
+
+        queries 0개 (두번째 요청)
+        """
+        path = reverse("stores:barcode_product", args=[self.store.id, "0000"])
+        for expected_query_count in (1, 0):
+            self.generic_test(
+                path,
+                "get",
+                404,
+                res404_schema,
+                expected_query_count=expected_query_count,
+                auth_user=self.user,
+            )
+
+    def test_too_long(self):
+        """
+        상품의 바코드보다 긴 바코드는 조회, 캐시하지 않음
+        """
+        path = reverse("stores:barcode_product", args=[self.store.id, "1" * 17])
+        self.generic_test(
+            path,
+            "get",
+            400,
+            res400_schema,
+            expected_query_count=0,
+            auth_user=self.user,
+        )
+
+    def test_bulk(self):
+        """
+        캐시에 없는 바코드만 한번에 조회
+
+        queries 1개:
+            1. get products (barcode in)
+        """
+        self.generic_test(
+            self.path, "get", 200, self.success_schema, auth_user=self.user
+        )
+        res = self.generic_test(
+            self.bulk_path,
+            "post",
+            200,
+            res200_schema({str: [product_schema]}),
+            expected_query_count=1,
+            auth_user=self.user,
+            barcodes=["8801", "8802", "0000"],
+        )
+        self.assertEqual(
+            {
+                "8801": ["슈크림 라떼"],
+                "8802": ["아이스 아메리카노", "아이스티"],
+                "0000": [],
+            },
+            {
+                barcode: [p["name"] for p in products]
+                for barcode, products in res["data"].items()
+            },
+        )
+
+    def test_bulk_invalid(self):
+        for barcodes in ([], ["1" * 17], ["1"] * 101):
+            self.generic_test(
+                self.bulk_path,
+                "post",
+                400,
+                res400_schema,
+                auth_user=self.user,
+                barcodes=barcodes,
+            )
+
+    def test_invalidation(self):
+        """
+        상품이 수정되면 매장의 바코드 캐시를 버림
+        """
+        product = Product.objects.get(barcode="8801")
+        self.generic_test(
+            self.path, "get", 200, self.success_schema, auth_user=self.user
+        )
+        self.generic_test(
+            reverse("stores:detail_product", args=[self.store.id, product.id]),
+            "patch",
+            200,
+            res200_schema(product_schema),
+            auth_user=self.user,
+            barcode="8803",
+        )
+        self.generic_test(self.path, "get", 404, res404_schema, auth_user=self.user)
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(self.path, "get", 401, res401_schema)
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(self.path, "get", 403, res403_schema, auth_user=new_user)
+
+
+class ProductBatchAPITestCase(BaseTestCase):
+    success_schema = res200_schema(
+        [{"op": str, "id": int, "product": Or(product_schema, None)}]
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="커피")
+        cls.category2 = Category.objects.create(store=cls.store, name="음료")
+        names = ["슈크림 라떼", "아이스 아메리카노", "아이스티"]
+        products = Product.objects.bulk_create(
+            Product(
+                store=cls.store,
+                category=cls.category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="맛있는 %s" % name,
+                barcode="1234567890",
+                sell_by_days=3,
+                size="small",
+            )
+            for name in names
+        )
+        index_products(products)
+        cls.products = {product.name: product for product in products}
+        cls.path = reverse("stores:batch_product", args=[cls.store.id])
+
+    def create_data(self, name):
+        return {
+            "category": self.category.id,
+            "price": 4000,
+            "cost": 2000,
+            "name": name,
+            "description": "맛있는 %s" % name,
+            "barcode": "1234567890",
+            "sell_by_days": 3,
+            "size": "large",
+        }
+
+    def batch(self, operations, status=200, expected_query_count=None):
+        return self.generic_test(
+            self.path,
+            "post",
+            status,
+            self.success_schema if status == 200 else res400_schema,
+            expected_query_count=expected_query_count,
+            auth_user=self.user,
+            operations=operations,
+        )
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/products/batch/" % self.store.id, self.path)
+
+    def test_success(self):
+        """
+        operation 수와 관계없이 쿼리 수가 같아야함
+
+        queries 13개:
+            1. get products (대상 상품)
+            2. get categories
+            3. get products (이름 중복)
+            4. savepoint
+            5. insert deletion logs
+            6. delete search tokens (삭제)
+            7. delete products
+            8. bulk update products
+            9. delete search tokens (이름 수정)
+            10. insert search tokens (이름 수정)
+            11. insert products
+            12. insert search tokens (생성)
+            13. release savepoint
+        """
+        latte = self.products["슈크림 라떼"]
+        americano = self.products["아이스 아메리카노"]
+        tea = self.products["아이스티"]
+        res = self.batch(
+            [
+                {"op": "update", "id": latte.id, "data": {"price": 5500}},
+                {
+                    "op": "update",
+                    "id": americano.id,
+                    "data": {"name": "아이스티", "category": self.category2.id},
+                },
+                {"op": "delete", "id": tea.id},
+                {"op": "create", "data": self.create_data("카페 라떼")},
+            ],
+            expected_query_count=13,
+        )
+        self.assertEqual(
+            ["update", "update", "delete", "create"],
+            [result["op"] for result in res["data"]],
+        )
+        self.assertEqual(None, res["data"][2]["product"])
+        self.assertEqual("음료", res["data"][1]["product"]["category_name"])
+
+        latte.refresh_from_db()
+        self.assertEqual(5500, latte.price)
+        self.assertGreater(latte.updated_at, latte.created_at)
+        self.assertEqual(
+            ["슈크림 라떼", "아이스티", "카페 라떼"],
+            sorted(Product.objects.values_list("name", flat=True)),
+        )
+        self.assertEqual(
+            [tea.id],
+            list(
+                DeletionLog.objects.filter(model="product").values_list(
+                    "object_id", flat=True
+                )
+            ),
+        )
+
+        res = self.generic_test(
+            reverse("stores:list_product", args=[self.store.id]),
+            "get",
+            200,
+            res200_schema(cursor_pagination_schema(product_schema)),
+            auth_user=self.user,
+            search="ㅇㅇㅅㅌ",
+        )
+        self.assertEqual([americano.id], [p["id"] for p in res["data"]["results"]])
+
+    def test_rollback(self):
+        """
+        하나라도 실패하면 아무것도 적용하지 않고 operation 순서대로 에러
+        """
+        latte = self.products["슈크림 라떼"]
+        res = self.batch(
+            [
+                {"op": "update", "id": latte.id, "data": {"price": 5500}},
+                {"op": "update", "id": 0, "data": {"price": 5500}},
+                {"op": "create", "data": {**self.create_data("카페 라떼"), "price": -1}},
+                {"op": "create", "data": {**self.create_data("모카"), "category": 0}},
+            ],
+            status=400,
+        )
+        errors = json.loads(res["meta"]["message"])["operations"]
+        self.assertEqual({}, errors[0])
+        self.assertEqual(["id"], list(errors[1]))
+        self.assertEqual(["price"], list(errors[2]["data"]))
+        self.assertEqual(["category"], list(errors[3]["data"]))
+
+        latte.refresh_from_db()
+        self.assertEqual(5000, latte.price)
+        self.assertEqual(3, Product.objects.count())
+
+    def test_name_conflicts(self):
+        """
+        삭제되지 않는 상품 또는 batch 안의 다른 상품과 이름이 같으면 에러
+        같은 batch에서 삭제되는 상품의 이름은 사용할 수 있음
+        """
+        res = self.batch(
+            [
+                {"op": "create", "data": self.create_data("슈크림 라떼")},
+                {"op": "create", "data": self.create_data("카페 라떼")},
+                {"op": "create", "data": self.create_data("카페 라떼")},
+                {
+                    "op": "update",
+                    "id": self.products["아이스 아메리카노"].id,
+                    "data": {"name": "아이스 아메리카노"},
+                },
+            ],
+            status=400,
+        )
+        errors = json.loads(res["meta"]["message"])["operations"]
+        self.assertEqual(
+            [["name"], [], ["name"], []],
+            [list(error.get("data", {})) for error in errors],
+        )
+
+        tea = self.products["아이스티"]
+        self.batch(
+            [
+                {"op": "delete", "id": tea.id},
+                {"op": "create", "data": self.create_data("아이스티")},
+            ]
+        )
+        self.assertEqual(
+            3, Product.objects.filter(name__in=self.products.keys()).count()
+        )
+
+    def test_reuse_renamed(self):
+        """
+        앞에서 이름을 바꾼 상품의 이전 이름으로 생성할 수 있음
+        """
+        tea = self.products["아이스티"]
+        res = self.batch(
+            [
+                {"op": "update", "id": tea.id, "data": {"name": "복숭아 아이스티"}},
+                {"op": "create", "data": self.create_data("아이스티")},
+                {"op": "create", "data": self.create_data("복숭아 아이스티")},
+            ],
+            status=400,
+        )
+        errors = json.loads(res["meta"]["message"])["operations"]
+        self.assertEqual([[], [], ["name"]], [list(e.get("data", {})) for e in errors])
+
+        res = self.batch(
+            [
+                {"op": "update", "id": tea.id, "data": {"name": "복숭아 아이스티"}},
+                {"op": "create", "data": self.create_data("아이스티")},
+            ]
+        )
+        self.assertEqual(
+            {tea.id: "복숭아 아이스티", res["data"][1]["id"]: "아이스티"},
+            dict(
+                Product.objects.filter(name__in=["아이스티", "복숭아 아이스티"]).values_list(
+                    "id", "name"
+                )
+            ),
+        )
+
+    def test_integrity_error(self):
+        """
+        db에서만 같은 이름(collation, ex. 대소문자)이라 적용에 실패하면 400
+        """
+
+        class Batch(ProductBatch):
+            def validate_names(self):
+                pass
+
+        batch = Batch(
+            self.store.id,
+            [{"op": "create", "data": self.create_data("슈크림 라떼")}],
+        )
+        with self.assertRaises(ValidationError):
+            batch.run()
+        self.assertEqual(1, Product.objects.filter(name="슈크림 라떼").count())
+
+    def test_invalid_operations(self):
+        latte = self.products["슈크림 라떼"]
+        for operations in (
+            [],
+            [{"op": "update", "data": {}}],
+            [{"op": "create"}],
+            [{"op": "merge", "id": latte.id}],
+            [{"op": "delete", "id": latte.id}] * 2,
+            [{"op": "delete", "id": latte.id}] * 501,
+        ):
+            self.batch(operations, status=400)
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(self.path, "post", 401, res401_schema, operations=[])
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(
+            self.path,
+            "post",
+            403,
+            res403_schema,
+            auth_user=new_user,
+            operations=[{"op": "delete", "id": self.products["아이스티"].id}],
+        )
+        self.assertEqual(3, Product.objects.count())
+
+
+class ProductPriceAdjustmentAPITestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.coffee = Category.objects.create(store=cls.store, name="커피")
+        cls.drink = Category.objects.create(store=cls.store, name="음료")
+        cls.products = {}
+        for category, name, price in (
+            (cls.coffee, "아메리카노", 4500),
+            (cls.coffee, "카페 라떼", 5000),
+            (cls.drink, "아이스티", 3000),
+            (cls.drink, "레몬에이드", 990),
+        ):
+            cls.products[name] = Product.objects.create(
+                store=cls.store,
+                category=category,
+                price=price,
+                cost=price // 2,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="맛있는 %s" % name,
+                barcode="1234567890",
+                sell_by_days=3,
+                size="small",
+            )
+        cls.path = reverse("stores:adjust_price_product", args=[cls.store.id])
+
+    def adjust(self, status=200, expected_query_count=None, **data):
+        return self.generic_test(
+            self.path,
+            "post",
+            status,
+            res200_schema({"updated": int}) if status == 200 else res400_schema,
+            expected_query_count=expected_query_count,
+            auth_user=self.user,
+            **data,
+        )
+
+    def prices(self, field="price"):
+        return dict(Product.objects.values_list("name", field))
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/products/adjust-price/" % self.store.id, self.path)
+
+    def test_percent(self):
+        """
+        상품 수와 관계없이 하나의 UPDATE 문
+
+        queries 1개:
+            1. update products
+        """
+        res = self.adjust(expected_query_count=1, percent="5", category=self.drink.id)
+        self.assertEqual(2, res["data"]["updated"])
+        self.assertEqual(
+            {"아메리카노": 4500, "카페 라떼": 5000, "아이스티": 3150, "레몬에이드": 1040},
+            self.prices(),
+        )
+
+        tea = Product.objects.get(id=self.products["아이스티"].id)
+        self.assertGreater(tea.updated_at, self.products["아이스티"].updated_at)
+
+    def test_amount(self):
+        res = self.adjust(
+            field="cost",
+            amount=-1000,
+            ids=[self.products["아메리카노"].id, self.products["레몬에이드"].id],
+        )
+        self.assertEqual(2, res["data"]["updated"])
+        self.assertEqual(
+            {"아메리카노": 1250, "카페 라떼": 2500, "아이스티": 1500, "레몬에이드": 0},
+            self.prices("cost"),
+        )
+        self.assertEqual(4500, self.products["아메리카노"].price)
+
+    def test_not_negative(self):
+        """
+        0보다 작아지는 값은 0
+        """
+        res = self.adjust(percent="-100")
+        self.assertEqual(4, res["data"]["updated"])
+        self.assertEqual({0}, set(self.prices().values()))
+
+    def test_max_value(self):
+        """
+        INT 최대값보다 커지는 값은 최대값
+        """
+        Product.objects.update(price=MAX_VALUE - 1000)
+        self.adjust(percent="1000")
+        self.assertEqual({MAX_VALUE}, set(self.prices().values()))
+
+        Product.objects.update(price=MAX_VALUE - 1000)
+        self.adjust(amount=1000000)
+        self.assertEqual({MAX_VALUE}, set(self.prices().values()))
+
+    def test_invalidates_cache(self):
+        path = reverse("stores:list_product", args=[self.store.id])
+        schema = res200_schema(cursor_pagination_schema(product_schema))
+        self.generic_test(path, "get", 200, schema, auth_user=self.user)
+
+        self.adjust(amount=100)
+        res = self.generic_test(path, "get", 200, schema, auth_user=self.user)
+        self.assertEqual(
+            {4600, 5100, 3100, 1090},
+            {product["price"] for product in res["data"]["results"]},
+        )
+
+    def test_invalid(self):
+        for data in (
+            {},
+            {"percent": "5", "amount": 100},
+            {"percent": "-101"},
+            {"field": "name", "amount": 100},
+            {"amount": 100, "ids": []},
+        ):
+            self.adjust(status=400, **data)
+        self.assertEqual(4500, Product.objects.get(name="아메리카노").price)
+
+    def test_other_store(self):
+        """
+        다른 매장의 카테고리, 상품은 조정되지 않음
+        """
+        new_user = self.create_user(phone="01098765432")
+        store = Store.objects.create(owner=new_user, name="store")
+        self.generic_test(
+            reverse("stores:adjust_price_product", args=[store.id]),
+            "post",
+            200,
+            res200_schema({"updated": 0}),
+            auth_user=new_user,
+            amount=100,
+            ids=[product.id for product in self.products.values()],
+        )
+        self.assertEqual(4500, Product.objects.get(name="아메리카노").price)
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(self.path, "post", 401, res401_schema, amount=100)
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(
+            self.path, "post", 403, res403_schema, auth_user=new_user, amount=100
+        )
+
+
+class ProductImportAPITestCase(BaseTestCase):
+    error_schema = Schema({"row": int, "errors": dict})
+    success_schema = res200_schema({"created": int, "errors": [error_schema]})
+    header = "category,price,cost,name,description,barcode,sell_by_days,size"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="category")
+        cls.path = reverse("stores:import_product", args=[cls.store.id])
+
+    def csv_file(self, *names, category=None):
+        lines = [self.header] + [
+            "%d,5000,3000,%s,맛있는 %s,1234567890,3,small"
+            % (category or self.category.id, name, name)
+            for name in names
+        ]
+        return SimpleUploadedFile("products.csv", "\n".join(lines).encode())
+
+    def upload(self, file, expected_query_count=None, **data):
+        return self.generic_test(
+            self.path,
+            "post",
+            200,
+            self.success_schema,
+            expected_query_count=expected_query_count,
+            auth_user=self.user,
+            content_type=MULTIPART_CONTENT,
+            file=file,
+            **data,
+        )["data"]
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/products/import/" % self.store.id, self.path)
+
+    def test_csv(self):
+        """
+        queries 6개:
+            1. get categories (batch)
+            2. get products (이름 중복, batch)
+            3. savepoint
+            4. insert products
+            5. insert search tokens
+            6. release savepoint
+        """
+        res = self.upload(self.csv_file("슈크림 라떼", "아이스 아메리카노"), expected_query_count=6)
+        self.assertEqual({"created": 2, "errors": []}, res)
+
+        product = Product.objects.get(store=self.store, name="슈크림 라떼")
+        self.assertEqual("ㅅㅋㄹ ㄹㄸ", product.chosung)
+        self.assertEqual(convert_to_jamo("슈크림 라떼"), product.jamo)
+        self.assertEqual(self.category, product.category)
+        self.assertEqual(5000, product.price)
+
+    def test_ndjson(self):
+        rows = [
+            {
+                "category": self.category.id,
+                "price": 5000,
+                "cost": 3000,
+                "name": name,
+                "description": "맛있는 %s" % name,
+                "barcode": "1234567890",
+                "sell_by_days": 3,
+                "size": "large",
+            }
+            for name in ["슈크림 라떼", "아이스 아메리카노"]
+        ]
+        content = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows)
+        file = SimpleUploadedFile("products.ndjson", (content + "\n\n").encode())
+        res = self.upload(file)
+        self.assertEqual({"created": 2, "errors": []}, res)
+        self.assertEqual(2, Product.objects.filter(size="large").count())
+
+    def test_format(self):
+        """
+        확장자가 아닌 format으로 지정
+        """
+        file = self.csv_file("슈크림 라떼")
+        file.name = "products.txt"
+        self.generic_test(
+            self.path,
+            "post",
+            400,
+            res400_schema,
+            auth_user=self.user,
+            content_type=MULTIPART_CONTENT,
+            file=file,
+        )
+
+        file.seek(0)
+        res = self.upload(file, format="csv")
+        self.assertEqual(1, res["created"])
+
+    def test_row_errors(self):
+        """
+        실패한 row만 제외하고 생성
+        """
+        Product.objects.create(
+            store=self.store,
+            category=self.category,
+            price=5000,
+            cost=3000,
+            name="기존 상품",
+            chosung=convert_to_chosung("기존 상품"),
+            jamo=convert_to_jamo("기존 상품"),
+            description="기존 상품",
+            barcode="1234567890",
+            sell_by_days=3,
+            size="small",
+        )
+        other_store = Store.objects.create(owner=self.user, name="store2")
+        other_category = Category.objects.create(store=other_store, name="category")
+
+        lines = [
+            self.header,
+            "%d,5000,3000,정상,설명,1234567890,3,small" % self.category.id,
+            "%d,-1,3000,가격 오류,설명,1234567890,3,small" % self.category.id,
+            "%d,5000,3000,다른 매장,설명,1234567890,3,small" % other_category.id,
+            "%d,5000,3000,기존 상품,설명,1234567890,3,small" % self.category.id,
+            "%d,5000,3000,정상,설명,1234567890,3,small" % self.category.id,
+            "%d,5000,3000,사이즈 오류,설명,1234567890,3,medium" % self.category.id,
+        ]
+        file = SimpleUploadedFile("products.csv", "\n".join(lines).encode())
+        res = self.upload(file)
+
+        self.assertEqual(1, res["created"])
+        self.assertEqual(
+            {2: ["price"], 3: ["category"], 4: ["name"], 5: ["name"], 6: ["size"]},
+            {error["row"]: list(error["errors"]) for error in res["errors"]},
+        )
+        self.assertTrue(Product.objects.filter(name="정상").exists())
+
+    def test_invalid_json(self):
+        content = '{"name": \n[1, 2]\n'
+        file = SimpleUploadedFile("products.ndjson", content.encode())
+        res = self.upload(file)
+        self.assertEqual(0, res["created"])
+        self.assertEqual([1, 2], [error["row"] for error in res["errors"]])
+
+    def test_not_utf8(self):
+        """
+        csv는 읽을 수 없는 줄부터 처리하지 않음, ndjson은 해당 row만 에러
+        """
+        lines = self.csv_file("정상1", "인코딩", "정상2").read().split(b"\n")
+        lines[2] = lines[2].decode().encode("euc-kr")
+        file = SimpleUploadedFile("products.csv", b"\n".join(lines))
+        res = self.upload(file)
+        self.assertEqual(1, res["created"])
+        self.assertEqual([2], [error["row"] for error in res["errors"]])
+
+        content = b'{"name": 1}\n' + '{"name": "인코딩"}\n'.encode("euc-kr") + b"[1]\n"
+        file = SimpleUploadedFile("products.ndjson", content)
+        res = self.upload(file)
+        self.assertEqual([1, 2, 3], [error["row"] for error in res["errors"]])
+
+    def test_invalid_csv(self):
+        """
+        csv 형식 오류는 500이 아닌 row 에러
+        """
+        lines = [self.header, '"%d,5000' % self.category.id + "x" * 10] + [
+            "a" * (csv.field_size_limit() + 1)
+        ]
+        file = SimpleUploadedFile("products.csv", "\n".join(lines).encode())
+        res = self.upload(file)
+        self.assertEqual(0, res["created"])
+        self.assertEqual([1], [error["row"] for error in res["errors"]])
+
+    def test_integrity_error(self):
+        """
+        db에서만 같은 이름(collation, ex. 대소문자)이라 생성에 실패하면 해당 row만 에러
+        """
+
+        class Importer(ProductImporter):
+            def get_existing_names(self, names):
+                return set()
+
+        self.upload(self.csv_file("기존 상품"))
+        rows = PARSERS["csv"](self.csv_file("상품1", "기존 상품", "상품2"))
+        res = Importer(self.store.id).run(rows)
+
+        self.assertEqual(2, res["created"])
+        self.assertEqual(
+            [{"row": 2, "errors": {"name": ["이미 존재하는 이름입니다"]}}], res["errors"]
+        )
+        self.assertEqual(3, Product.objects.filter(store=self.store).count())
+        self.assertTrue(ProductSearchToken.objects.filter(product__name="상품2").exists())
+
+    def test_version_after_error(self):
+        """
+        이후 batch가 실패해도 commit된 batch의 상품이 보이도록 매장 버전을 올림
+        """
+
+        class Importer(ProductImporter):
+            def import_batch(self, batch):
+                if self.created:
+                    raise IntegrityError()
+                super().import_batch(batch)
+
+        version = get_store_version(self.store.id)
+        rows = PARSERS["csv"](self.csv_file("상품1", "상품2"))
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(IntegrityError):
+                Importer(self.store.id, batch_size=1).run(rows)
+        self.assertNotEqual(version, get_store_version(self.store.id))
+
+    @override_settings(PRODUCT_IMPORT_BATCH_SIZE=2)
+    def test_batches(self):
+        """
+        batch마다 카테고리, 이름 중복 확인 쿼리가 한번씩
+        batch를 넘어서 중복된 이름도 확인되어야함
+
+        queries 6 * 3 = 18개
+        """
+        names = ["상품%d" % i for i in range(5)] + ["상품0"]
+        res = self.upload(self.csv_file(*names), expected_query_count=18)
+        self.assertEqual(5, res["created"])
+        self.assertEqual([6], [error["row"] for error in res["errors"]])
+
+    def test_search_after_import(self):
+        """
+        import된 상품도 검색, 자동완성 되어야함
+        """
+        self.upload(self.csv_file("슈크림 라떼", "아이스 아메리카노"))
+
+        res = self.generic_test(
+            reverse("stores:list_product", args=[self.store.id]),
+            "get",
+            200,
+            res200_schema(cursor_pagination_schema(product_schema)),
+            auth_user=self.user,
+            search="ㅅㅋㄹ",
+        )
+        self.assertEqual(["슈크림 라떼"], [p["name"] for p in res["data"]["results"]])
+
+        res = self.generic_test(
+            reverse("stores:autocomplete_product", args=[self.store.id]),
+            "get",
+            200,
+            res200_schema(list),
+            auth_user=self.user,
+            q="아이",
+        )
+        self.assertEqual(["아이스 아메리카노"], [p["name"] for p in res["data"]])
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(
+            self.path,
+            "post",
+            401,
+            res401_schema,
+            content_type=MULTIPART_CONTENT,
+            file=self.csv_file("슈크림 라떼"),
+        )
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(
+            self.path,
+            "post",
+            403,
+            res403_schema,
+            auth_user=new_user,
+            content_type=MULTIPART_CONTENT,
+            file=self.csv_file("슈크림 라떼"),
+        )
+        self.assertFalse(Product.objects.exists())
+
+
+class ProductExportAPITestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="category")
+        cls.names = ["슈크림 라떼", "아이스 아메리카노", "상품, 쉼표", "상품3", "상품4"]
+        cls.products = Product.objects.bulk_create(
+            Product(
+                store=cls.store,
+                category=cls.category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="맛있는 %s" % name,
+                barcode="1234567890",
+                sell_by_days=3,
+                size="small",
+            )
+            for name in cls.names
+        )
+        cls.path = reverse("stores:export_product", args=[cls.store.id])
+
+    def export(self, expected_query_count=None, **params):
+        """
+        streaming 응답은 generic_test를 사용할 수 없어 직접 요청합니다
+        query 수는 응답을 모두 읽을 때까지 셉니다
+        """
+        header = self.get_auth_header(self.user)
+        with self.assertNumQueries(
+            expected_query_count
+        ) if expected_query_count else nullcontext():
+            res = self.client.get(self.path, params, **header)
+            content = b"".join(res.streaming_content).decode()
+        self.assertEqual(200, res.status_code)
+        self.assertTrue(res.streaming)
+        return res, content
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/products/export/" % self.store.id, self.path)
+
+    def test_ndjson(self):
+        res, content = self.export()
+        self.assertTrue(res["Content-Type"].startswith("application/x-ndjson"))
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(self.names, [row["name"] for row in rows])
+        self.assertEqual(
+            {
+                "id": self.products[0].id,
+                "category": self.category.id,
+                "category_name": "category",
+                "price": 5000,
+                "cost": 3000,
+                "name": "슈크림 라떼",
+                "description": "맛있는 슈크림 라떼",
+                "barcode": "1234567890",
+                "sell_by_days": 3,
+                "size": "small",
+            },
+            rows[0],
+        )
+
+    def test_csv(self):
+        res, content = self.export(file_format="csv")
+        self.assertTrue(res["Content-Type"].startswith("text/csv"))
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(self.names, [row["name"] for row in rows])
+        self.assertEqual("category", rows[0]["category_name"])
+
+    def test_reimport(self):
+        """
+        export한 csv를 그대로 import 할 수 있어야함
+        """
+        _, content = self.export(file_format="csv")
+        Product.objects.all().delete()
+
+        res = self.generic_test(
+            reverse("stores:import_product", args=[self.store.id]),
+            "post",
+            200,
+            res200_schema({"created": int, "errors": []}),
+            auth_user=self.user,
+            content_type=MULTIPART_CONTENT,
+            file=SimpleUploadedFile("products.csv", content.encode()),
+        )
+        self.assertEqual(len(self.names), res["data"]["created"])
+
+    @override_settings(PRODUCT_EXPORT_CHUNK_SIZE=2)
+    def test_chunks(self):
+        """
+        queries 3개:
+            1~3. get products (2개씩 3번)
+        """
+        _, content = self.export(expected_query_count=3)
+        self.assertEqual(len(self.names), len(content.splitlines()))
+
+    def test_filter_by_store(self):
+        store = Store.objects.create(owner=self.user, name="store2")
+        category = Category.objects.create(store=store, name="category")
+        Product.objects.create(
+            store=store,
+            category=category,
+            price=5000,
+            cost=3000,
+            name="다른 매장",
+            chosung="ㄷㄹ ㅁㅈ",
+            jamo=convert_to_jamo("다른 매장"),
+            description="",
+            barcode="",
+            sell_by_days=3,
+            size="small",
+        )
+        _, content = self.export()
+        self.assertEqual(len(self.names), len(content.splitlines()))
+
+    def test_invalid_format(self):
+        self.generic_test(
+            self.path, "get", 400, res400_schema, auth_user=self.user, file_format="xls"
+        )
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(self.path, "get", 401, res401_schema)
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(self.path, "get", 403, res403_schema, auth_user=new_user)
+
+
+class ProductRetrieveAPITestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="category")
+        cls.product = Product.objects.create(
+            store=cls.store,
+            category=cls.category,
+            price=5000,
+            cost=3000,
+            name="슈크림 라떼",
+            chosung=convert_to_chosung("슈크림 라떼"),
+            description="맛있는 슈크림 라떼",
+            barcode="1234567890",
+            sell_by_days=3,
+            size="small",
+        )
+        cls.path = reverse("stores:detail_product", args=[cls.store.id, cls.product.id])
+
+    def test_url(self):
+        self.assertEqual(
+            "/stores/%d/products/%d/" % (self.store.id, self.product.id), self.path
+        )
+
+    def test_success(self):
+        """
+        정상 조회
+
+        queries 1개:
+            1. get product with category
+        """
+        self.generic_test(
+            self.path,
+            "get",
+            200,
+            res200_schema(product_schema),
+            expected_query_count=1,
+            auth_user=self.user,
+        )
+
+    def test_not_modified(self):
+        """
+        ETag 또는 Last-Modified가 같으면 serialize 하지 않고 304
+        카테고리 이름도 응답에 포함되므로 카테고리 수정시 200
+        """
+        headers = self.get_auth_header(self.user)
+        res = self.client.get(self.path, **headers)
+        etag, last_modified = res["ETag"], res["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(304, res.status_code)
+        res = self.client.get(
+            self.path, HTTP_IF_MODIFIED_SINCE=last_modified, **headers
+        )
+        self.assertEqual(304, res.status_code)
+
+        Category.objects.filter(id=self.category.id).update(
+            updated_at=timezone.now() + timezone.timedelta(seconds=1)
+        )
+        for condition in (
+            {"HTTP_IF_NONE_MATCH": etag},
+            {"HTTP_IF_MODIFIED_SINCE": last_modified},
+        ):
+            res = self.client.get(self.path, **condition, **headers)
+            self.assertEqual(200, res.status_code)
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(
+            self.path,
+            "get",
+            401,
+            res401_schema,
+        )
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(
+            self.path,
+            "get",
+            403,
+            res403_schema,
+            auth_user=new_user,
+        )
+
+
+class ProductUpdateAPITestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="category")
+        cls.product = Product.objects.create(
+            store=cls.store,
+            category=cls.category,
+            price=5000,
+            cost=3000,
+            name="슈크림 라떼",
+            chosung=convert_to_chosung("슈크림 라떼"),
+            description="맛있는 슈크림 라떼",
+            barcode="1234567890",
+            sell_by_days=3,
+            size="small",
+        )
+        cls.path = reverse("stores:detail_product", args=[cls.store.id, cls.product.id])
+
+    def test_url(self):
+        self.assertEqual(
+            "/stores/%d/products/%d/" % (self.store.id, self.product.id), self.path
+        )
+
+    def test_success(self):
+        """
+        정상 수정
+
+        queries 7개:
+            1. get product with category
+            2. check unique name (validation check)
+            3. savepoint
             4. update product
-            # 5. check category (validation check) 카테고리 입력시
+            5. delete search tokens (이름 수정시)
+            6. insert search tokens (이름 수정시)
+            7. release savepoint
+            # 8. check category (validation check) 카테고리 입력시
         """
         self.generic_test(
             self.path,
@@ -418,7 +1923,7 @@ class ProductUpdateAPITestCase(BaseTestCase):
             200,
             res200_schema(product_schema),
             auth_user=self.user,
-            expected_query_count=4,
+            expected_query_count=7,
             name="new 슈크림 라떼",
         )
         product = Product.objects.get(id=self.product.id)
@@ -545,17 +2050,20 @@ class ProductDeleteAPITestCase(BaseTestCase):
         """
         정상 삭제
 
-        queries 3개:
-            1. get user (request user)
-            2. get product with store
-            3. delete product
+        queries 6개:
+            1. get product
+            2. savepoint
+            3. insert deletion log
+            4. delete search tokens
+            5. delete product
+            6. release savepoint
         """
         self.generic_test(
             self.path,
             "delete",
             204,
             expected_schema=None,
-            expected_query_count=3,
+            expected_query_count=6,
             auth_user=self.user,
         )
 
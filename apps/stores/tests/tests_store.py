@@ -1,7 +1,19 @@
+import io
+from datetime import timedelta
+
 from core.schemas import *
 from core.tests import BaseTestCase
+from core.utils import convert_to_chosung, convert_to_jamo
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse, reverse_lazy
-from stores.models import Store
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from freezegun import freeze_time
+from stores.models import Category, DeletionLog, Product, Store
+from stores.owners import _owners, get_store_owner_id
+from stores.sync import log_deletions
 
 
 class StoreCreateAPITestCase(BaseTestCase):
@@ -18,16 +30,15 @@ class StoreCreateAPITestCase(BaseTestCase):
         """
         정상 생성
 
-        queries 2개:
-            1. get user (request user)
-            2. insert store
+        queries 1개:
+            1. insert store
         """
         self.generic_test(
             self.path,
             "post",
             201,
             res201_schema(store_schema),
-            expected_query_count=2,
+            expected_query_count=1,
             auth_user=self.user,
             name="store",
         )
@@ -65,6 +76,7 @@ class StoreCreateAPITestCase(BaseTestCase):
 
 class StoreListAPITestCase(BaseTestCase):
     path = reverse_lazy("my_stores:list")
+    success_schema = res200_schema(cursor_pagination_schema(store_schema))
 
     @classmethod
     def setUpTestData(cls):
@@ -80,18 +92,37 @@ class StoreListAPITestCase(BaseTestCase):
         정상 조회
 
         queries 2개:
-            1. get user (request user)
+            1. get max updated_at, count (ETag)
             2. get stores
         """
         res = self.generic_test(
             self.path,
             "get",
             200,
-            res200_schema(Schema([store_schema])),
+            self.success_schema,
             expected_query_count=2,
             auth_user=self.user,
         )
-        self.assertEqual(3, len(res["data"]))
+        self.assertEqual(3, len(res["data"]["results"]))
+
+    def test_page_size(self):
+        """
+        page_size로 페이지 크기 지정
+        """
+        res = self.generic_test(
+            self.path, "get", 200, self.success_schema, auth_user=self.user, page_size=2
+        )
+        self.assertEqual(
+            [store.id for store in reversed(self.stores)][:2],
+            [store["id"] for store in res["data"]["results"]],
+        )
+
+        res = self.generic_test(
+            res["data"]["next"], "get", 200, self.success_schema, auth_user=self.user
+        )
+        self.assertEqual(
+            [self.stores[0].id], [store["id"] for store in res["data"]["results"]]
+        )
 
     def test_no_auth(self):
         """
@@ -113,10 +144,10 @@ class StoreListAPITestCase(BaseTestCase):
             self.path,
             "get",
             200,
-            res200_schema(Schema([store_schema])),
+            self.success_schema,
             auth_user=new_user,
         )
-        self.assertEqual(0, len(res["data"]))
+        self.assertEqual(0, len(res["data"]["results"]))
 
 
 class StoreRetrieveAPITestCase(BaseTestCase):
@@ -133,19 +164,38 @@ class StoreRetrieveAPITestCase(BaseTestCase):
         """
         정상 조회
 
-        queries 2개:
-            1. get user (request user)
-            2. get store
+        queries 1개:
+            1. get store
         """
         self.generic_test(
             self.path,
             "get",
             200,
             res200_schema(store_schema),
-            expected_query_count=2,
+            expected_query_count=1,
             auth_user=self.user,
         )
 
+    def test_not_modified(self):
+        """
+        ETag가 같으면 304, 수정되면 200
+        owner가 아니면 ETag가 같아도 403
+        """
+        headers = self.get_auth_header(self.user)
+        etag = self.client.get(self.path, **headers)["ETag"]
+        res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(304, res.status_code)
+
+        new_user = self.create_user(phone="01098765432")
+        res = self.client.get(
+            self.path, HTTP_IF_NONE_MATCH=etag, **self.get_auth_header(new_user)
+        )
+        self.assertEqual(403, res.status_code)
+
+        self.store.save()
+        res = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag, **headers)
+        self.assertEqual(200, res.status_code)
+
     def test_no_auth(self):
         """
         인증 없이
@@ -185,10 +235,9 @@ class StoreUpdateAPITestCase(BaseTestCase):
         """
         정상 수정
 
-        queries 3개:
-            1. get user (request user)
-            2. get store
-            3. update store
+        queries 2개:
+            1. get store
+            2. update store
         """
         new_name = "updated name"
         self.generic_test(
@@ -196,7 +245,7 @@ class StoreUpdateAPITestCase(BaseTestCase):
             "patch",
             200,
             res200_schema(store_schema),
-            expected_query_count=3,
+            expected_query_count=2,
             auth_user=self.user,
             name=new_name,
         )
@@ -242,19 +291,20 @@ class StoreDeleteAPITestCase(BaseTestCase):
         """
         정상 삭제
 
-        queries 5개:
-            1. get user (request user)
-            2. get store
+        queries 6개:
+            1. get store
+            2. get categories (cascade)
             3. delete products (cascade)
-            4. delete categories (cascade)
-            5. delete store
+            4. delete search tokens (cascade)
+            5. delete deletion logs (cascade)
+            6. delete store
         """
         self.generic_test(
             self.path,
             "delete",
             204,
             expected_schema=None,
-            expected_query_count=5,
+            expected_query_count=6,
             auth_user=self.user,
         )
         self.assertFalse(Store.objects.filter(id=self.store.id).exists())
@@ -282,3 +332,282 @@ class StoreDeleteAPITestCase(BaseTestCase):
             res403_schema,
             auth_user=new_user,
         )
+
+
+class StoreChangesAPITestCase(BaseTestCase):
+    changes_schema = Schema(
+        {
+            "watermark": str,
+            "store": Or(store_schema, None),
+            "categories": [category_schema],
+            "products": [product_schema],
+            "deleted": {"categories": [int], "products": [int]},
+        }
+    )
+    success_schema = res200_schema(changes_schema)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.category = Category.objects.create(store=cls.store, name="category")
+        cls.products = [
+            Product.objects.create(
+                store=cls.store,
+                category=cls.category,
+                price=5000,
+                cost=3000,
+                name=name,
+                chosung=convert_to_chosung(name),
+                jamo=convert_to_jamo(name),
+                description="",
+                barcode="",
+                sell_by_days=3,
+                size="small",
+            )
+            for name in ["상품1", "상품2"]
+        ]
+        cls.path = reverse("stores:changes", args=[cls.store.id])
+
+        # 이전 동기화 이후 변경이 없던 상태
+        cls.since = timezone.now()
+        for model in (Store, Category, Product):
+            model.objects.update(updated_at=cls.since - timedelta(minutes=1))
+
+    def changes(self, expected_query_count=None, **params):
+        return self.generic_test(
+            self.path,
+            "get",
+            200,
+            self.success_schema,
+            expected_query_count=expected_query_count,
+            auth_user=self.user,
+            **params,
+        )["data"]
+
+    def test_url(self):
+        self.assertEqual("/stores/%d/changes/" % self.store.id, self.path)
+
+    def test_full(self):
+        """
+        since 없이 전체 조회
+
+        queries 3개:
+            1. get store
+            2. get categories
+            3. get products with category
+        """
+        data = self.changes(expected_query_count=3)
+        self.assertEqual(self.store.id, data["store"]["id"])
+        self.assertEqual([self.category.id], [c["id"] for c in data["categories"]])
+        self.assertEqual(2, len(data["products"]))
+        self.assertEqual({"categories": [], "products": []}, data["deleted"])
+
+    def test_no_changes(self):
+        """
+        queries 4개:
+            1. get store
+            2. get categories
+            3. get products with category
+            4. get deletion logs
+        """
+        data = self.changes(expected_query_count=4, since=self.since.isoformat())
+        self.assertEqual(None, data["store"])
+        self.assertEqual([], data["categories"])
+        self.assertEqual([], data["products"])
+        self.assertEqual({"categories": [], "products": []}, data["deleted"])
+
+    def test_changes(self):
+        """
+        수정, 삭제된 row만 조회
+        """
+        product = self.products[0]
+        self.generic_test(
+            reverse("stores:detail_product", args=[self.store.id, product.id]),
+            "patch",
+            200,
+            res200_schema(product_schema),
+            auth_user=self.user,
+            price=6000,
+        )
+        self.generic_test(
+            reverse("stores:detail_product", args=[self.store.id, self.products[1].id]),
+            "delete",
+            204,
+            None,
+            auth_user=self.user,
+        )
+
+        data = self.changes(since=self.since.isoformat())
+        self.assertEqual(None, data["store"])
+        self.assertEqual([], data["categories"])
+        self.assertEqual(
+            [(product.id, 6000)], [(p["id"], p["price"]) for p in data["products"]]
+        )
+        self.assertEqual([self.products[1].id], data["deleted"]["products"])
+
+    def test_category_delete(self):
+        """
+        카테고리와 함께 삭제된 상품도 삭제 기록이 있어야함
+        """
+        self.generic_test(
+            reverse("stores:detail_category", args=[self.store.id, self.category.id]),
+            "delete",
+            204,
+            None,
+            auth_user=self.user,
+        )
+
+        data = self.changes(since=self.since.isoformat())
+        self.assertEqual([self.category.id], data["deleted"]["categories"])
+        self.assertEqual(
+            sorted(product.id for product in self.products),
+            sorted(data["deleted"]["products"]),
+        )
+
+    def test_category_rename(self):
+        """
+        카테고리 이름이 바뀌면 상품의 category_name도 다시 받아야함
+        """
+        self.generic_test(
+            reverse("stores:detail_category", args=[self.store.id, self.category.id]),
+            "patch",
+            200,
+            res200_schema(category_schema),
+            auth_user=self.user,
+            name="new category",
+        )
+
+        data = self.changes(since=self.since.isoformat())
+        self.assertEqual([self.category.id], [c["id"] for c in data["categories"]])
+        self.assertEqual(
+            sorted((product.id, "new category") for product in self.products),
+            sorted((p["id"], p["category_name"]) for p in data["products"]),
+        )
+
+    def test_store_update(self):
+        self.generic_test(
+            reverse("stores:detail", args=[self.store.id]),
+            "patch",
+            200,
+            res200_schema(store_schema),
+            auth_user=self.user,
+            name="new name",
+        )
+        data = self.changes(since=self.since.isoformat())
+        self.assertEqual("new name", data["store"]["name"])
+
+    def test_watermark(self):
+        """
+        watermark는 lag만큼 이전
+        """
+        now = timezone.now()
+        with freeze_time(now):
+            data = self.changes()
+        watermark = now - timedelta(seconds=settings.SYNC_WATERMARK_LAG_SECONDS)
+        self.assertEqual(watermark, parse_datetime(data["watermark"]))
+
+    def test_too_old_since(self):
+        since = timezone.now() - timedelta(
+            days=settings.SYNC_DELETION_LOG_RETENTION_DAYS + 1
+        )
+        self.generic_test(
+            self.path,
+            "get",
+            400,
+            res400_schema,
+            auth_user=self.user,
+            since=since.isoformat(),
+        )
+
+    def test_no_auth(self):
+        """
+        인증 없이
+        """
+        self.generic_test(self.path, "get", 401, res401_schema)
+
+    def test_not_owner(self):
+        """
+        owner가 아닌
+        """
+        new_user = self.create_user(phone="01098765432")
+        self.generic_test(self.path, "get", 403, res403_schema, auth_user=new_user)
+
+    def test_prune_deletion_logs(self):
+        """
+        보관 기간이 지난 삭제 기록만 삭제
+        """
+        log_deletions(self.store.id, product=[1, 2])
+        DeletionLog.objects.filter(object_id=1).update(
+            deleted_at=timezone.now()
+            - timedelta(days=settings.SYNC_DELETION_LOG_RETENTION_DAYS + 1)
+        )
+        call_command("prune_deletion_logs", stdout=io.StringIO())
+        self.assertEqual(
+            [2], list(DeletionLog.objects.values_list("object_id", flat=True))
+        )
+
+
+class StoreOwnerCacheTestCase(BaseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user()
+        cls.store = Store.objects.create(owner=cls.user, name="store")
+        cls.path = reverse("stores:list_category", args=[cls.store.id])
+
+    def test_miss(self):
+        """
+        다른 worker에서 생성된 매장처럼 캐시에 없을 때
+
+        첫 요청 queries 2개:
+            1. get store owner
+            2. get category
+
+        이후 요청 queries 1개:
+            1. get category
+        """
+        _owners.clear()
+        category = Category.objects.create(store=self.store, name="category")
+        for expected_query_count in (2, 1):
+            self.generic_test(
+                reverse("stores:detail_category", args=[self.store.id, category.id]),
+                "get",
+                200,
+                res200_schema(category_schema),
+                expected_query_count=expected_query_count,
+                auth_user=self.user,
+            )
+        self.assertEqual({"size": 1, "hits": 1, "misses": 1}, _owners.get_stats())
+
+    def test_not_found_store(self):
+        """
+        없는 매장은 캐시하지 않음
+        """
+        _owners.clear()
+        self.assertIsNone(get_store_owner_id(self.store.id + 1))
+        self.assertEqual(0, _owners.get_stats()["size"])
+
+    def test_delete_store(self):
+        """
+        삭제한 매장은 캐시에서도 삭제
+        """
+        self.generic_test(
+            reverse("stores:detail", args=[self.store.id]),
+            "delete",
+            204,
+            expected_schema=None,
+            auth_user=self.user,
+        )
+        self.assertEqual(0, _owners.get_stats()["size"])
+        self.generic_test(self.path, "get", 404, res404_schema, auth_user=self.user)
+
+    @override_settings(STORE_OWNER_SHARED_CACHE="default")
+    def test_shared_cache(self):
+        """
+        worker 캐시에 없으면 django cache에서 조회
+        """
+        _owners.clear()
+        get_store_owner_id(self.store.id)
+        _owners.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.user.id, get_store_owner_id(self.store.id))
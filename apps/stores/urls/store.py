@@ -1,12 +1,23 @@
 from django.urls import path
-from stores.views import StoreDetailAPIView
+from stores.views import StoreChangesAPIView, StoreDetailAPIView
 from stores.views.category import CategoryDetailAPIView, CategoryListCreateAPIView
-from stores.views.product import ProductDetailAPIView, ProductListCreateAPIView
+from stores.views.product import (
+    ProductAutocompleteAPIView,
+    ProductBarcodeAPIView,
+    ProductBarcodesAPIView,
+    ProductBatchAPIView,
+    ProductDetailAPIView,
+    ProductExportAPIView,
+    ProductImportAPIView,
+    ProductListCreateAPIView,
+    ProductPriceAdjustmentAPIView,
+)
 
 app_name = "stores"
 
 urlpatterns = [
     path("<int:store_id>/", StoreDetailAPIView.as_view(), name="detail"),
+    path("<int:store_id>/changes/", StoreChangesAPIView.as_view(), name="changes"),
     path(
         "<int:store_id>/categories/",
         CategoryListCreateAPIView.as_view(),
@@ -22,6 +33,41 @@ urlpatterns = [
         ProductListCreateAPIView.as_view(),
         name="list_product",
     ),
+    path(
+        "<int:store_id>/products/autocomplete/",
+        ProductAutocompleteAPIView.as_view(),
+        name="autocomplete_product",
+    ),
+    path(
+        "<int:store_id>/products/by-barcode/",
+        ProductBarcodesAPIView.as_view(),
+        name="barcodes_product",
+    ),
+    path(
+        "<int:store_id>/products/by-barcode/<str:barcode>/",
+        ProductBarcodeAPIView.as_view(),
+        name="barcode_product",
+    ),
+    path(
+        "<int:store_id>/products/batch/",
+        ProductBatchAPIView.as_view(),
+        name="batch_product",
+    ),
+    path(
+        "<int:store_id>/products/adjust-price/",
+        ProductPriceAdjustmentAPIView.as_view(),
+        name="adjust_price_product",
+    ),
+    path(
+        "<int:store_id>/products/import/",
+        ProductImportAPIView.as_view(),
+        name="import_product",
+    ),
+    path(
+        "<int:store_id>/products/export/",
+        ProductExportAPIView.as_view(),
+        name="export_product",
+    ),
     path(
         "<int:store_id>/products/<int:product_id>/",
         ProductDetailAPIView.as_view(),
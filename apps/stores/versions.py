@@ -0,0 +1,39 @@
+"""
+매장 데이터의 버전
+상품, 카테고리가 변경될 때마다 새로운 값으로 바뀝니다
+worker마다 가진 메모리 캐시는 버전이 바뀌었는지 비교하여 무효화합니다
+
+증가하는 숫자 대신 매번 새로운 임의의 값을 사용합니다
+    - cache backend에서 key가 제거되어도 이전 버전으로 돌아가지 않음
+    - incr가 atomic하지 않은 backend에서 동시에 변경되어도 버전이 겹치지 않음
+"""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _key(store_id: int):
+    return "store_version:%d" % store_id
+
+
+def get_store_version(store_id: int) -> str:
+    """
+    데이터를 조회하기 전에 가져와야 합니다
+    조회 도중 변경되면, 다음 요청에서 버전이 달라 다시 조회하게 됩니다
+    """
+    key = _key(store_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_store_version(store_id: int):
+    """
+    변경이 commit된 후 버전을 바꿉니다
+    commit 전에 바꾸면 다른 worker가 commit 전 데이터로 캐시를 만들 수 있습니다
+    """
+    transaction.on_commit(lambda: cache.set(_key(store_id), uuid4().hex, timeout=None))
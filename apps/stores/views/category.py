@@ -1,18 +1,25 @@
-from functools import cached_property
-
-from core.views import WrappedResponseDataMixin
+from core.paginations import DefaultCursorPagination
+from core.views import (
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    WrappedResponseDataMixin,
+)
 from core.yasg.response import *
 from core.yasg.utils import connect_swagger, to_partial_serializer
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from stores.models import Category, Store
-from stores.permissions import IsCategoryOwner, IsStoreOwner
+from stores.models import Category
+from stores.permissions import IsStoreOwner
+from stores.search import unindex_products
 from stores.serializers import (
     CategoryCreateSerializer,
     CategorySerializer,
     CategoryUpdateSerializer,
 )
+from stores.sync import log_deletions
+from stores.versions import bump_store_version
+from stores.views.mixins import StoreResponseCacheMixin
 
 
 @connect_swagger(
@@ -24,7 +31,7 @@ from stores.serializers import (
         security=[{"Bearer": []}],
         request_body=None,
         responses={
-            "200": res200(CategorySerializer(many=True)),
+            "200": res200(cursor_pagaination_schema(CategorySerializer())),
             "401": res401,
             "403": res403,
             "404": res404,
@@ -48,27 +55,25 @@ from stores.serializers import (
         },
     ),
 )
-class CategoryListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
+class CategoryListCreateAPIView(
+    StoreResponseCacheMixin,
+    ConditionalListMixin,
+    WrappedResponseDataMixin,
+    ListCreateAPIView,
+):
     permission_classes = [IsStoreOwner]
+    pagination_class = DefaultCursorPagination
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return CategoryCreateSerializer
         return CategorySerializer
 
-    def get_serializer_context(self):
-        ctx = super().get_serializer_context()
-        ctx["store"] = self.store
-        return ctx
-
     def get_queryset(self):
-        return self.store.categories.all()
+        return Category.objects.filter(store_id=self.kwargs["store_id"])
 
-    @cached_property
-    def store(self):
-        obj = get_object_or_404(Store, id=self.kwargs["store_id"])
-        self.check_object_permissions(self.request, obj)
-        return obj
+    def perform_create(self, serializer):
+        serializer.save(store_id=self.kwargs["store_id"])
 
 
 @connect_swagger(
@@ -120,9 +125,11 @@ class CategoryListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
         },
     ),
 )
-class CategoryDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView):
+class CategoryDetailAPIView(
+    ConditionalRetrieveMixin, WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView
+):
     http_method_names = ["get", "patch", "delete"]
-    permission_classes = [IsCategoryOwner]
+    permission_classes = [IsStoreOwner]
     lookup_url_kwarg = "category_id"
 
     def get_serializer_class(self):
@@ -131,7 +138,18 @@ class CategoryDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIVi
         return CategorySerializer
 
     def get_queryset(self):
-        qs = Category.objects.filter(store_id=self.kwargs["store_id"]).select_related(
-            "store"
+        return Category.objects.filter(store_id=self.kwargs["store_id"])
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """
+        카테고리의 상품들도 함께 삭제됩니다
+        """
+        log_deletions(
+            instance.store_id,
+            category=[instance.id],
+            product=instance.products.values_list("id", flat=True),
         )
-        return qs
+        unindex_products(instance.store_id, product__category_id=instance.id)
+        super().perform_destroy(instance)
+        bump_store_version(instance.store_id)
@@ -0,0 +1,37 @@
+from core.renderers import ORJSONRenderer
+from django.utils.cache import get_conditional_response
+from stores.responses import cache_response, get_cached_response, get_response_cache_key
+
+
+class StoreResponseCacheMixin:
+    """
+    url의 store_id 매장의 GET 응답을 매장 버전과 함께 캐시합니다 (stores.responses)
+    json(ORJSONRenderer) 200 응답만 캐시합니다
+
+    적중하면 저장된 ETag로 If-None-Match를 확인하여 304 또는 저장된 응답을 반환합니다
+    """
+
+    response_cache_key = None
+
+    def get(self, request, *args, **kwargs):
+        if type(request.accepted_renderer) is not ORJSONRenderer:
+            return super().get(request, *args, **kwargs)
+
+        key = get_response_cache_key(
+            self.__class__.__name__, self.kwargs["store_id"], request
+        )
+        response = get_cached_response(key)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response.get("ETag"), response=response
+            )
+
+        self.response_cache_key = key
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.response_cache_key and response.status_code == 200:
+            response.render()
+            cache_response(self.response_cache_key, response)
+        return response
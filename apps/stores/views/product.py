@@ -1,21 +1,53 @@
-from functools import cached_property
-
 from core.paginations import DefaultCursorPagination
-from core.views import WrappedResponseDataMixin
+from core.views import (
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    WrappedResponseDataMixin,
+)
 from core.yasg.response import *
 from core.yasg.utils import connect_swagger, to_partial_serializer
-from django.db.models import Q
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import Max
+from django.http import StreamingHttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
-from stores.models import Product, Store
-from stores.permissions import IsProductOwner, IsStoreOwner
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import (
+    GenericAPIView,
+    ListCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+)
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from stores.autocomplete import get_prefix_index
+from stores.barcodes import find_products_by_barcode, find_products_by_barcodes
+from stores.batch import ProductBatch
+from stores.exports import RENDERERS, iter_products
+from stores.imports import PARSERS, ProductImporter
+from stores.models import Category, Product
+from stores.permissions import IsStoreOwner
+from stores.pricing import adjust_prices
+from stores.search import search_products, unindex_products
 from stores.serializers import (
+    ProductAutocompleteQuerySerializer,
+    ProductBarcodeSerializer,
+    ProductBarcodesSerializer,
+    ProductBatchResultSerializer,
+    ProductBatchSerializer,
     ProductCreateSerializer,
+    ProductExportQuerySerializer,
+    ProductImportResultSerializer,
+    ProductImportSerializer,
+    ProductPriceAdjustmentResultSerializer,
+    ProductPriceAdjustmentSerializer,
     ProductSerializer,
+    ProductSuggestionSerializer,
     ProductUpdateSerializer,
+    ProductValuesSerializer,
 )
+from stores.sync import log_deletions
+from stores.versions import bump_store_version
+from stores.views.mixins import StoreResponseCacheMixin
 
 
 @connect_swagger(
@@ -60,7 +92,12 @@ from stores.serializers import (
         },
     ),
 )
-class ProductListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
+class ProductListCreateAPIView(
+    StoreResponseCacheMixin,
+    ConditionalListMixin,
+    WrappedResponseDataMixin,
+    ListCreateAPIView,
+):
     permission_classes = [IsStoreOwner]
     pagination_class = DefaultCursorPagination
 
@@ -71,11 +108,22 @@ class ProductListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
-        ctx["store"] = self.store
+        ctx["store_id"] = self.kwargs["store_id"]
+        ctx["categories"] = Category.objects.filter(store_id=self.kwargs["store_id"])
         return ctx
 
     def get_queryset(self):
-        return self.store.products.select_related("category").all()
+        return Product.objects.filter(store_id=self.kwargs["store_id"]).select_related(
+            "category"
+        )
+
+    def get_extra_validators(self):
+        """
+        카테고리 이름도 응답에 포함됩니다 ((store, updated_at) index)
+        """
+        return Category.objects.filter(store_id=self.kwargs["store_id"]).aggregate(
+            category_last_modified=Max("updated_at")
+        )
 
     def filter_queryset(self, queryset):
         """
@@ -84,13 +132,18 @@ class ProductListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
         search = self.request.GET.get("search")
         if not search:
             return queryset
-        return queryset.filter(Q(name__icontains=search) | Q(chosung__icontains=search))
+        return search_products(queryset, self.kwargs["store_id"], search)
 
-    @cached_property
-    def store(self):
-        obj = get_object_or_404(Store, id=self.kwargs["store_id"])
-        self.check_object_permissions(self.request, obj)
-        return obj
+    def list(self, request, *args, **kwargs):
+        """
+        model instance를 만들지 않고 필요한 필드만 values()로 조회합니다
+        """
+        queryset = ProductValuesSerializer.get_values_queryset(
+            self.filter_queryset(self.get_queryset()),
+            *(order.lstrip("-") for order in self.pagination_class.ordering),
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(ProductValuesSerializer(page).data)
 
 
 @connect_swagger(
@@ -142,9 +195,11 @@ class ProductListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
         },
     ),
 )
-class ProductDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView):
+class ProductDetailAPIView(
+    ConditionalRetrieveMixin, WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView
+):
     http_method_names = ["get", "patch", "delete"]
-    permission_classes = [IsProductOwner]
+    permission_classes = [IsStoreOwner]
     lookup_url_kwarg = "product_id"
 
     def get_serializer_class(self):
@@ -154,5 +209,284 @@ class ProductDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIVie
 
     def get_queryset(self):
         return Product.objects.filter(store_id=self.kwargs["store_id"]).select_related(
-            "category", "store"
+            "category"
+        )
+
+    def get_last_modified(self, instance):
+        """
+        카테고리 이름도 응답에 포함됩니다
+        """
+        return max(instance.updated_at, instance.category.updated_at)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        log_deletions(instance.store_id, product=[instance.id])
+        unindex_products(instance.store_id, product_id=instance.id)
+        super().perform_destroy(instance)
+        bump_store_version(instance.store_id)
+
+
+@connect_swagger(
+    "get",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="상품 자동완성",
+        operation_description="상품의 이름 또는 초성이 검색어로 시작하는 상품을 조회합니다\n"
+        "입력 중인 글자도 검색됩니다 (ex. 슈ㅋ)",
+        security=[{"Bearer": []}],
+        query_serializer=ProductAutocompleteQuerySerializer,
+        responses={
+            "200": res200(ProductSuggestionSerializer(many=True)),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductAutocompleteAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    worker 메모리의 매장별 prefix 색인에서 조회합니다
+    매장 버전이 바뀌었을 때만 DB에서 색인을 다시 만듭니다
+    """
+
+    permission_classes = [IsStoreOwner]
+
+    def get(self, request, *args, **kwargs):
+        query = ProductAutocompleteQuerySerializer(data=request.GET)
+        query.is_valid(raise_exception=True)
+
+        index = get_prefix_index(self.kwargs["store_id"])
+        return Response(
+            index.suggest(query.validated_data["q"], query.validated_data["limit"])
+        )
+
+
+@connect_swagger(
+    "get",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="바코드로 상품 조회",
+        operation_description="바코드가 일치하는 상품들을 조회합니다",
+        security=[{"Bearer": []}],
+        responses={
+            "200": res200(ProductSerializer(many=True)),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductBarcodeAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    바코드별 상품을 worker 메모리에 캐시합니다 (stores.barcodes)
+    상품의 바코드보다 길면 400, 일치하는 상품이 없으면 404
+    """
+
+    permission_classes = [IsStoreOwner]
+
+    def get(self, request, *args, **kwargs):
+        query = ProductBarcodeSerializer(data={"barcode": kwargs["barcode"]})
+        query.is_valid(raise_exception=True)
+        products = find_products_by_barcode(
+            kwargs["store_id"], query.validated_data["barcode"]
+        )
+        if not products:
+            raise NotFound()
+        return Response(products)
+
+
+@connect_swagger(
+    "post",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="바코드로 상품 일괄 조회",
+        operation_description="여러 바코드의 상품들을 한번에 조회합니다\n"
+        "바코드마다 일치하는 상품 목록을 응답합니다 (없으면 빈 목록)",
+        security=[{"Bearer": []}],
+        request_body=ProductBarcodesSerializer,
+        responses={
+            "200": res200(
+                openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    additional_properties=serializer_to_schema(
+                        ProductSerializer(many=True)
+                    ),
+                )
+            ),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductBarcodesAPIView(WrappedResponseDataMixin, GenericAPIView):
+    permission_classes = [IsStoreOwner]
+    serializer_class = ProductBarcodesSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            find_products_by_barcodes(
+                kwargs["store_id"], serializer.validated_data["barcodes"]
+            )
+        )
+
+
+@connect_swagger(
+    "post",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="상품 batch 변경",
+        operation_description="여러 상품의 생성(create), 수정(update), 삭제(delete)를 한번에 적용합니다\n"
+        "하나라도 실패하면 아무것도 적용되지 않으며, operation과 같은 순서로 에러를 응답합니다",
+        security=[{"Bearer": []}],
+        request_body=ProductBatchSerializer,
+        responses={
+            "200": res200(ProductBatchResultSerializer(many=True)),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductBatchAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    매장 owner는 한번만 확인하고, 대상 상품과 카테고리를 한번에 조회합니다 (stores.batch)
+    """
+
+    permission_classes = [IsStoreOwner]
+    serializer_class = ProductBatchSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = ProductBatch(
+            kwargs["store_id"], serializer.validated_data["operations"]
+        )
+        return Response(batch.run())
+
+
+@connect_swagger(
+    "post",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="상품 가격 일괄 조정",
+        operation_description="대상 상품의 가격(price) 또는 원가(cost)를 비율(percent) 또는 금액(amount)만큼 조정합니다\n"
+        "percent는 반올림하며, 0보다 작아지는 값은 0, 2147483647보다 커지는 값은 2147483647이 됩니다",
+        security=[{"Bearer": []}],
+        request_body=ProductPriceAdjustmentSerializer,
+        responses={
+            "200": res200(ProductPriceAdjustmentResultSerializer()),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductPriceAdjustmentAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    상품을 조회하지 않고 하나의 UPDATE 문으로 조정합니다 (stores.pricing)
+    """
+
+    permission_classes = [IsStoreOwner]
+    serializer_class = ProductPriceAdjustmentSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated = adjust_prices(
+            kwargs["store_id"],
+            data["field"],
+            percent=data.get("percent"),
+            amount=data.get("amount"),
+            category_id=data.get("category"),
+            ids=data.get("ids"),
+        )
+        return Response({"updated": updated})
+
+
+@connect_swagger(
+    "post",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="상품 일괄 등록",
+        operation_description="csv 또는 ndjson 파일의 상품들을 매장에 등록합니다\n"
+        "각 row는 상품 생성과 같은 필드를 가지며, 실패한 row는 번호와 에러를 응답합니다",
+        security=[{"Bearer": []}],
+        request_body=ProductImportSerializer,
+        responses={
+            "200": res200(ProductImportResultSerializer()),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductImportAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    파일을 한번에 읽지 않고 batch 단위로 검증, 생성합니다
+    batch마다 같은 쿼리를 실행하므로 N+1 감지에서 제외합니다
+    """
+
+    allow_repeated_queries = True
+    permission_classes = [IsStoreOwner]
+    parser_classes = [MultiPartParser]
+    serializer_class = ProductImportSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        parse = PARSERS[serializer.validated_data["format"]]
+        rows = parse(serializer.validated_data["file"])
+        return Response(ProductImporter(self.kwargs["store_id"]).run(rows))
+
+
+@connect_swagger(
+    "get",
+    swagger_auto_schema(
+        tags=["상품"],
+        operation_id="상품 내보내기",
+        operation_description="매장의 모든 상품을 ndjson 또는 csv 파일로 내보냅니다\n"
+        "응답은 wrapping 되지 않습니다",
+        security=[{"Bearer": []}],
+        query_serializer=ProductExportQuerySerializer,
+        responses={
+            "200": openapi.Response("ndjson 또는 csv 파일"),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class ProductExportAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    상품을 chunk 단위로 조회하며 바로 응답합니다
+    """
+
+    permission_classes = [IsStoreOwner]
+
+    def get(self, request, *args, **kwargs):
+        store_id = self.kwargs["store_id"]
+        query = ProductExportQuerySerializer(data=request.GET)
+        query.is_valid(raise_exception=True)
+        file_format = query.validated_data["file_format"]
+
+        render, content_type = RENDERERS[file_format]
+        response = StreamingHttpResponse(
+            render(iter_products(store_id)), content_type=content_type
+        )
+        response["Content-Disposition"] = 'attachment; filename="products-%d.%s"' % (
+            store_id,
+            file_format,
         )
+        return response
@@ -1,16 +1,30 @@
-from core.views import WrappedResponseDataMixin
+from core.paginations import DefaultCursorPagination
+from core.views import (
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    WrappedResponseDataMixin,
+)
 from core.yasg.response import *
 from core.yasg.utils import connect_swagger, to_partial_serializer
+from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import (
+    GenericAPIView,
+    ListCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+)
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from stores.models import Store
 from stores.permissions import IsStoreOwner
 from stores.serializers import (
     MyStoreCreateSerializer,
+    StoreChangesQuerySerializer,
+    StoreChangesSerializer,
     StoreSerializer,
     StoreUpdateSerializer,
 )
+from stores.sync import get_changes
 
 
 @connect_swagger(
@@ -22,7 +36,7 @@ from stores.serializers import (
         security=[{"Bearer": []}],
         request_body=None,
         responses={
-            "200": res200(StoreSerializer(many=True)),
+            "200": res200(cursor_pagaination_schema(StoreSerializer())),
             "401": res401,
         },
     ),
@@ -42,12 +56,15 @@ from stores.serializers import (
         },
     ),
 )
-class MyStoreListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
+class MyStoreListCreateAPIView(
+    ConditionalListMixin, WrappedResponseDataMixin, ListCreateAPIView
+):
     """
     request user에 대한 store list, create
     """
 
     permission_classes = [IsAuthenticated]
+    pagination_class = DefaultCursorPagination
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -55,7 +72,7 @@ class MyStoreListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
         return StoreSerializer
 
     def get_queryset(self):
-        return Store.objects.filter(owner=self.request.user)
+        return Store.objects.filter(owner_id=self.request.user.id)
 
 
 @connect_swagger(
@@ -107,7 +124,9 @@ class MyStoreListCreateAPIView(WrappedResponseDataMixin, ListCreateAPIView):
         },
     ),
 )
-class StoreDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView):
+class StoreDetailAPIView(
+    ConditionalRetrieveMixin, WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView
+):
     http_method_names = ["get", "patch", "delete"]
     permission_classes = [IsStoreOwner]
 
@@ -118,3 +137,38 @@ class StoreDetailAPIView(WrappedResponseDataMixin, RetrieveUpdateDestroyAPIView)
         if self.request.method == "PATCH":
             return StoreUpdateSerializer
         return StoreSerializer
+
+
+@connect_swagger(
+    "get",
+    swagger_auto_schema(
+        tags=["매장"],
+        operation_id="매장 변경 사항",
+        operation_description="since 이후 변경된 매장, 카테고리, 상품과 삭제된 id를 조회합니다\n"
+        "응답의 watermark를 다음 요청의 since로 사용합니다\n"
+        "since가 없으면 전체를 조회합니다",
+        security=[{"Bearer": []}],
+        query_serializer=StoreChangesQuerySerializer,
+        responses={
+            "200": res200(StoreChangesSerializer()),
+            "400": res400,
+            "401": res401,
+            "403": res403,
+            "404": res404,
+        },
+    ),
+)
+class StoreChangesAPIView(WrappedResponseDataMixin, GenericAPIView):
+    """
+    POS 단말기의 증분 동기화
+    """
+
+    permission_classes = [IsStoreOwner]
+
+    def get(self, request, *args, **kwargs):
+        store = get_object_or_404(Store, id=kwargs["store_id"])
+        query = StoreChangesQuerySerializer(data=request.GET)
+        query.is_valid(raise_exception=True)
+
+        changes = get_changes(store, query.validated_data.get("since"))
+        return Response(StoreChangesSerializer(changes).data)